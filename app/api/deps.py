@@ -2,7 +2,7 @@
 
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.db.session import async_session_factory
 
@@ -16,3 +16,12 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for handlers that manage their own transactions.
+
+    Streaming responses outlive the request-scoped ``get_db`` session, so they
+    open (and commit) sessions themselves.
+    """
+    return async_session_factory
@@ -0,0 +1,20 @@
+"""Response helpers shared by routers."""
+
+from fastapi import Request, Response
+
+from app.core.cache import CachedResponse
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def cached_response(request: Request, cached: CachedResponse) -> Response:
+    """JSON response for a cached body, or 304 if the client already has it."""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
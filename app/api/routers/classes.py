@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
 
-from app.api.deps import get_db
-from app.schemas.class_room import ClassRoomCreate, ClassRoomUpdate, ClassRoomResponse
-from app.schemas.common import EightDigitId, MessageResponse
-from app.services import class_service
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps import get_db, get_session_factory
+from app.api.responses import cached_response
+from app.core.config import settings
+from app.schemas.class_room import (
+    ClassRoomCreate,
+    ClassRoomUpdate,
+    ClassRoomResponse,
+    ClassRoomListItem,
+)
+from app.schemas.common import EightDigitId, MessageResponse, PaginatedResponse
+from app.schemas.attention import AttentionStatsResponse, DailyAttentionPoint
+from app.services import attention_stats_service, class_service, rollup_service
 
 router = APIRouter(prefix="/classes", tags=["Classes"])
 
@@ -14,12 +25,46 @@ async def create_class(data: ClassRoomCreate, db: AsyncSession = Depends(get_db)
     return await class_service.create_class(db, data)
 
 
-@router.get("", response_model=list[ClassRoomResponse])
+@router.get("", response_model=PaginatedResponse[ClassRoomListItem])
 async def list_classes(
     school_id: EightDigitId | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count all matching classes"),
+    with_stats: bool = Query(
+        False, description="Add students_count, reports_count and latest_attention"
+    ),
+    stream: bool = Query(False, description="Stream every matching class as NDJSON (no paging)"),
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
-    return await class_service.get_classes(db, school_id=school_id)
+    if stream:
+        return StreamingResponse(
+            class_service.stream_classes(
+                session_factory,
+                school_id=school_id,
+                with_stats=with_stats,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+            ),
+            media_type="application/x-ndjson",
+        )
+    classes, total, next_cursor = await class_service.get_classes(
+        db,
+        school_id=school_id,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+        with_stats=with_stats,
+    )
+    return PaginatedResponse(
+        items=[ClassRoomListItem.model_validate(c) for c in classes],
+        total=total,
+        limit=limit,
+        offset=0 if cursor else offset,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{class_id}", response_model=ClassRoomResponse)
@@ -38,3 +83,35 @@ async def update_class(
 async def delete_class(class_id: EightDigitId, db: AsyncSession = Depends(get_db)):
     await class_service.delete_class(db, class_id)
     return MessageResponse(detail=f"ClassRoom {class_id} deleted")
+
+
+@router.get("/{class_id}/attention/daily", response_model=list[DailyAttentionPoint])
+async def get_class_daily_attention(
+    class_id: EightDigitId,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    await class_service.get_class(db, class_id)
+    rows = await rollup_service.get_class_daily(db, class_id, date_from, date_to)
+    return [DailyAttentionPoint.from_rollup(row) for row in rows]
+
+
+@router.get("/{class_id}/attention/stats", response_model=AttentionStatsResponse)
+async def get_class_attention_stats(
+    class_id: EightDigitId,
+    request: Request,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    bins: str = Query(
+        "10", description="Bin count over 0-100, or comma-separated edges like 0,40,60,80,100"
+    ),
+    threshold: float = Query(50, ge=0, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """Attention percentiles, histogram, std and share under ``threshold``."""
+    await class_service.get_class(db, class_id)
+    cached = await attention_stats_service.get_attention_stats(
+        db, "class", class_id, date_from, date_to, bins=bins, threshold=threshold
+    )
+    return cached_response(request, cached)
@@ -0,0 +1,90 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps import get_session_factory
+from app.core.config import settings
+from app.schemas.common import EightDigitId
+from app.services import columnar_export, export_service
+from app.services.export_service import ExportFilters
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+def _export_filters(
+    school_id: EightDigitId | None = Query(None),
+    class_id: EightDigitId | None = Query(None),
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+) -> ExportFilters:
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    return ExportFilters(
+        school_id=school_id, class_id=class_id, date_from=date_from, date_to=date_to
+    )
+
+
+def _attachment(filename: str) -> dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+@router.get("/attention.csv", response_class=StreamingResponse)
+async def export_attention_csv(
+    filters: ExportFilters = Depends(_export_filters),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Stream recognized attention entries joined to their report and student as CSV."""
+    return StreamingResponse(
+        export_service.export_attention_csv(
+            session_factory, filters, settings.EXPORT_BATCH_SIZE
+        ),
+        media_type="text/csv",
+        headers=_attachment("attention.csv"),
+    )
+
+
+@router.get("/attention.ndjson", response_class=StreamingResponse)
+async def export_attention_ndjson(
+    filters: ExportFilters = Depends(_export_filters),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Stream the same rows as ``/exports/attention.csv``, one JSON object per line."""
+    return StreamingResponse(
+        export_service.export_attention_ndjson(
+            session_factory, filters, settings.EXPORT_BATCH_SIZE
+        ),
+        media_type="application/x-ndjson",
+        headers=_attachment("attention.ndjson"),
+    )
+
+
+@router.get("/attention.arrow", response_class=StreamingResponse)
+async def export_attention_arrow(
+    filters: ExportFilters = Depends(_export_filters),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Stream the same rows as an Arrow IPC stream, one record batch per cursor batch."""
+    return StreamingResponse(
+        columnar_export.export_attention_columnar(
+            session_factory, filters, settings.EXPORT_BATCH_SIZE, "arrow"
+        ),
+        media_type="application/vnd.apache.arrow.stream",
+        headers=_attachment("attention.arrow"),
+    )
+
+
+@router.get("/attention.parquet", response_class=StreamingResponse)
+async def export_attention_parquet(
+    filters: ExportFilters = Depends(_export_filters),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Stream the same rows as a zstd-compressed Parquet file, one row group per batch."""
+    return StreamingResponse(
+        columnar_export.export_attention_columnar(
+            session_factory, filters, settings.EXPORT_BATCH_SIZE, "parquet"
+        ),
+        media_type="application/vnd.apache.parquet",
+        headers=_attachment("attention.parquet"),
+    )
@@ -1,78 +1,423 @@
+import asyncio
+import mimetypes
+import os
+import stat
 import uuid
+from collections.abc import AsyncIterator
 from datetime import date
+from pathlib import Path
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import FileResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db
-from app.schemas.common import EightDigitId, MessageResponse, PaginatedResponse
+from app.api.deps import get_db, get_session_factory
+from app.api.responses import cached_response, etag_matches
+from app.schemas.common import (
+    EightDigitId,
+    MessageResponse,
+    PaginatedResponse,
+    ValidationErrorDetail,
+)
 from app.schemas.lesson_report import (
+    LessonReportBatchItemResult,
+    LessonReportBatchResponse,
     LessonReportCreate,
+    LessonReportGetManyResponse,
     LessonReportUpdate,
     LessonReportResponse,
+    LessonReportStatusResponse,
     LessonReportSummaryResponse,
-    StudentEntryResponse,
-    UnrecognizedEntryResponse,
 )
-from app.services import lesson_report_service
+from app.services import image_service, lesson_report_service
+from app.services.ingestion_queue import ingestion_queue
+from app.core.cache import CachedResponse
 from app.core.config import settings
+from app.core.logging import logger
+from app.utils.images import blob_path, check_base64_image, run_io
+from app.utils.multipart import ReportUploadParser
 
 router = APIRouter(tags=["Lesson Reports"])
 
 
-def _build_image_url(report_id: uuid.UUID, image_path: str | None) -> str | None:
+def _build_image_url(
+    report_id: uuid.UUID, image_path: str | None, image_sha256: str | None = None
+) -> str | None:
     if not image_path:
         return None
+    if image_sha256:
+        return f"/images/blobs/{image_path}"
     return f"/images/{report_id}/{image_path}"
 
 
-def _report_to_response(report) -> LessonReportResponse:
-    """Convert an ORM LessonReport (with entries loaded) into the response schema."""
-    students = [
-        StudentEntryResponse(
-            id=e.id,
-            student_id=e.student_id,
-            attention=e.attention,
-            inattention=e.inattention,
-            image_url=_build_image_url(report.id, e.image_path),
-            created_at=e.created_at,
-        )
-        for e in report.attention_entries
-    ]
-    unrecognized = [
-        UnrecognizedEntryResponse(
-            id=e.id,
-            attention=e.attention,
-            inattention=e.inattention,
-            image_url=_build_image_url(report.id, e.image_path),
-            created_at=e.created_at,
-        )
-        for e in report.unrecognized_entries
+def _entry_json(report_id: uuid.UUID, entry, with_student_id: bool) -> dict:
+    item = {"id": entry.id}
+    if with_student_id:
+        item["student_id"] = entry.student_id
+    item["attention"] = entry.attention
+    item["inattention"] = entry.inattention
+    item["image_url"] = _build_image_url(report_id, entry.image_path, entry.image_sha256)
+    item["created_at"] = entry.created_at
+    return item
+
+
+def _report_dict(report) -> dict:
+    """A report (ORM or row, with entries loaded) as plain JSON-ready values."""
+    return {
+        "id": report.id,
+        "school_id": report.school_id,
+        "class_id": report.class_id,
+        "class_index": report.class_index,
+        "lesson_date": report.lesson_date,
+        "lesson_time": report.lesson_time,
+        "students_count": report.students_count,
+        "avg_attention": float(report.avg_attention),
+        "avg_inattention": float(report.avg_inattention),
+        "created_at": report.created_at,
+        "students": [
+            _entry_json(report.id, e, with_student_id=True) for e in report.attention_entries
+        ],
+        "unrecognized_students": [
+            _entry_json(report.id, e, with_student_id=False)
+            for e in report.unrecognized_entries
+        ],
+    }
+
+
+def _report_json(report) -> bytes:
+    """Serialize a report to ``LessonReportResponse`` JSON.
+
+    Builds plain dicts in ``LessonReportResponse`` field order and encodes them
+    in one ``pydantic_core.to_json`` pass. That skips building a model per
+    entry and FastAPI re-validating the result against ``response_model``.
+    ``test_report_json_matches_schema`` keeps the output in step with the schema.
+    """
+    return to_json(_report_dict(report))
+
+
+def _report_view_json(report: dict) -> bytes:
+    """Serialize a sparse report view from ``get_lesson_report_view``."""
+    report_id = report["id"]
+    if "students" in report:
+        report["students"] = [
+            _entry_json(report_id, e, with_student_id=True) for e in report["students"]
+        ]
+    if "unrecognized_students" in report:
+        report["unrecognized_students"] = [
+            _entry_json(report_id, e, with_student_id=False)
+            for e in report["unrecognized_students"]
+        ]
+    return to_json(report)
+
+
+def _report_response(report, status_code: int = 200, headers: dict | None = None) -> Response:
+    return Response(
+        content=_report_json(report),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _invalid_result(index: int, exc: ValidationError) -> LessonReportBatchItemResult:
+    errors = [
+        ValidationErrorDetail(loc=list(err["loc"]), msg=err["msg"], type=err["type"])
+        for err in exc.errors(include_url=False)
     ]
-    return LessonReportResponse(
-        id=report.id,
-        school_id=report.school_id,
-        class_id=report.class_id,
-        class_index=report.class_index,
-        lesson_date=report.lesson_date,
-        lesson_time=report.lesson_time,
-        students_count=report.students_count,
-        avg_attention=report.avg_attention,
-        avg_inattention=report.avg_inattention,
-        created_at=report.created_at,
-        students=students,
-        unrecognized_students=unrecognized,
+    return LessonReportBatchItemResult(index=index, status="invalid", errors=errors)
+
+
+def _image_errors(data: LessonReportCreate) -> list[ValidationErrorDetail]:
+    """Size and base64 errors of an item's images, so they fail only that item."""
+    errors: list[ValidationErrorDetail] = []
+    for field in ("students", "unrecognized_students"):
+        for position, entry in enumerate(getattr(data, field)):
+            if not entry.image:
+                continue
+            try:
+                check_base64_image(entry.image)
+            except HTTPException as exc:
+                errors.append(
+                    ValidationErrorDetail(
+                        loc=[field, position, "image"],
+                        msg=exc.detail,
+                        type="image_too_large" if exc.status_code == 413 else "invalid_base64",
+                    )
+                )
+    return errors
+
+
+def _validate_item(index: int, data: LessonReportCreate) -> LessonReportBatchItemResult | None:
+    """The ``invalid`` result of a parsed batch item, or None if it can be stored."""
+    if errors := _image_errors(data):
+        return LessonReportBatchItemResult(index=index, status="invalid", errors=errors)
+    return None
+
+
+async def _store_batch(
+    db: AsyncSession, parsed: list[tuple[int, LessonReportCreate]]
+) -> list[LessonReportBatchItemResult]:
+    """Insert validated payloads, skipping retries of already stored reports."""
+    # Client-generated ids that are already stored (or repeated in this batch) are retries
+    seen = await lesson_report_service.existing_report_ids(
+        db, (data.id for _, data in parsed if data.id is not None)
     )
+    results: list[LessonReportBatchItemResult] = []
+    valid: list[tuple[uuid.UUID, LessonReportCreate]] = []
+    for index, data in parsed:
+        if data.id is not None and data.id in seen:
+            results.append(
+                LessonReportBatchItemResult(index=index, status="duplicate", id=data.id)
+            )
+            continue
+        report_id = data.id or uuid.uuid4()
+        seen.add(report_id)
+        valid.append((report_id, data))
+        results.append(LessonReportBatchItemResult(index=index, status="created", id=report_id))
+
+    await lesson_report_service.create_lesson_reports(db, valid)
+    return results
+
+
+class _RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body iterator is allowed to read the request body.
+
+    The stock implementation calls ``receive()`` concurrently to watch for
+    client disconnects, which would steal body chunks from the iterator. A
+    disconnect surfaces as ``ClientDisconnect`` from ``request.stream()`` instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _encode_result(result: LessonReportBatchItemResult) -> bytes:
+    return result.model_dump_json().encode() + b"\n"
+
+
+async def _ingest_ndjson(
+    request: Request,
+    session_factory: async_sessionmaker[AsyncSession],
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    chunk: list[tuple[int, LessonReportCreate]] = []
+
+    async def flush() -> bytes:
+        async with session_factory() as db:
+            try:
+                results = await _store_batch(db, chunk)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                logger.exception("Failed to store NDJSON chunk of %d reports", len(chunk))
+                results = [
+                    LessonReportBatchItemResult(index=index, status="failed")
+                    for index, _ in chunk
+                ]
+        chunk.clear()
+        return b"".join(_encode_result(r) for r in results)
+
+    def parse(index: int, line: bytearray) -> bytes:
+        """Queue a valid line for the next chunk, or return its error result."""
+        try:
+            data = LessonReportCreate.model_validate_json(line)
+        except ValidationError as exc:
+            return _encode_result(_invalid_result(index, exc))
+        if invalid := _validate_item(index, data):
+            return _encode_result(invalid)
+        chunk.append((index, data))
+        return b""
+
+    index = 0
+    pending = bytearray()
+    async for part in request.stream():
+        start = 0
+        while (newline := part.find(b"\n", start)) != -1:
+            pending += part[start:newline]
+            start = newline + 1
+            if pending.strip():
+                if error := parse(index, pending):
+                    yield error
+                if len(chunk) >= chunk_size:
+                    yield await flush()
+            pending.clear()
+            index += 1
+        pending += part[start:]
+        if len(pending) > settings.NDJSON_MAX_LINE_BYTES:
+            error = ValidationErrorDetail(
+                loc=[], msg="Line exceeds NDJSON_MAX_LINE_BYTES", type="line_too_long"
+            )
+            yield _encode_result(
+                LessonReportBatchItemResult(index=index, status="invalid", errors=[error])
+            )
+            break
+    else:
+        # Last line without a trailing newline
+        if pending.strip() and (error := parse(index, pending)):
+            yield error
+
+    if chunk:
+        yield await flush()
 
 
 # ── Lesson Reports CRUD ────────────────────────────────────────────────────
 @router.post("/lesson-reports", response_model=LessonReportResponse, status_code=201)
 async def create_lesson_report(
-    data: LessonReportCreate, db: AsyncSession = Depends(get_db)
+    data: LessonReportCreate,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db),
+):
+    report, created = await lesson_report_service.create_lesson_report(
+        db, data, idempotency_key=idempotency_key
+    )
+    if not created:
+        return _report_response(report, headers={"Idempotent-Replayed": "true"})
+    return _report_response(report, status_code=201)
+
+
+@router.post("/lesson-reports/batch", response_model=LessonReportBatchResponse)
+async def create_lesson_reports_batch(
+    payloads: Annotated[
+        list[dict[str, Any]], Body(min_length=1, max_length=settings.BATCH_MAX_REPORTS)
+    ],
+    db: AsyncSession = Depends(get_db),
+):
+    """Insert many reports in one transaction.
+
+    Each payload is validated on its own; invalid items are reported back with
+    their errors while the valid ones are still stored.
+    """
+    results: list[LessonReportBatchItemResult] = []
+    parsed: list[tuple[int, LessonReportCreate]] = []
+    for index, payload in enumerate(payloads):
+        try:
+            data = LessonReportCreate.model_validate(payload)
+        except ValidationError as exc:
+            results.append(_invalid_result(index, exc))
+            continue
+        if invalid := _validate_item(index, data):
+            results.append(invalid)
+        else:
+            parsed.append((index, data))
+
+    results.extend(await _store_batch(db, parsed))
+    results.sort(key=lambda r: r.index)
+    return LessonReportBatchResponse(
+        created=sum(r.status == "created" for r in results),
+        failed=sum(r.status == "invalid" for r in results),
+        results=results,
+    )
+
+
+@router.post("/lesson-reports/stream", response_class=StreamingResponse)
+async def stream_lesson_reports(
+    request: Request,
+    chunk_size: int = Query(
+        settings.NDJSON_CHUNK_SIZE, ge=1, le=settings.BATCH_MAX_REPORTS
+    ),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Ingest an ``application/x-ndjson`` upload, one report per line.
+
+    Lines are parsed and validated as the body arrives and committed every
+    ``chunk_size`` reports, so memory stays flat regardless of upload size.
+    The response streams one NDJSON result per input line.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("application/x-ndjson"):
+        raise HTTPException(status_code=415, detail="Expected application/x-ndjson body")
+    return _RequestStreamingResponse(
+        _ingest_ndjson(request, session_factory, chunk_size),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post(
+    "/lesson-reports/async", response_model=LessonReportStatusResponse, status_code=202
+)
+async def enqueue_lesson_report(data: LessonReportCreate):
+    """Validate and queue a report; it is written in the background.
+
+    Poll ``GET /lesson-reports/{id}/status`` to learn when it has been persisted.
+    """
+    if not ingestion_queue.running:
+        raise HTTPException(status_code=503, detail="Asynchronous ingestion is disabled")
+    # A bad image would otherwise fail the whole coalesced batch in the worker
+    if errors := _image_errors(data):
+        raise RequestValidationError(
+            [{"loc": ("body", *e.loc), "msg": e.msg, "type": e.type} for e in errors]
+        )
+    try:
+        report_id = ingestion_queue.submit(data)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Ingestion queue is full, retry later",
+            headers={"Retry-After": "1"},
+        )
+    return LessonReportStatusResponse(id=report_id, status="queued")
+
+
+@router.post("/lesson-reports/multipart", response_model=LessonReportResponse, status_code=201)
+async def create_lesson_report_multipart(
+    request: Request,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db),
 ):
-    report = await lesson_report_service.create_lesson_report(db, data)
-    return _report_to_response(report)
+    """Create a report from a ``multipart/form-data`` upload.
+
+    The ``metadata`` part holds the report JSON, where each entry's ``image``
+    is the name of a binary file part. Files are streamed to disk in chunks.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data body")
+
+    upload = ReportUploadParser(
+        content_type, settings.IMAGES_DIR / image_service.INCOMING_DIR / uuid.uuid4().hex
+    )
+    try:
+        await upload.parse(request.stream())
+        try:
+            data = LessonReportCreate.model_validate_json(upload.metadata)
+        except ValidationError as exc:
+            raise RequestValidationError(exc.errors(include_url=False))
+
+        referenced = [
+            e.image for e in [*data.students, *data.unrecognized_students] if e.image
+        ]
+        unknown = sorted(set(referenced) - upload.images.keys())
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown image parts: {unknown}")
+        if len(referenced) != len(set(referenced)):
+            raise HTTPException(
+                status_code=422, detail="Each image part may only be referenced once"
+            )
+
+        report, created = await lesson_report_service.create_lesson_report(
+            db, data, idempotency_key=idempotency_key, staged_images=upload.images
+        )
+    finally:
+        await upload.cleanup()
+
+    if not created:
+        return _report_response(report, headers={"Idempotent-Replayed": "true"})
+    return _report_response(report, status_code=201)
 
 
 @router.get("/lesson-reports", response_model=PaginatedResponse[LessonReportSummaryResponse])
@@ -83,9 +428,11 @@ async def list_lesson_reports(
     date_to: date | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count all matching reports"),
     db: AsyncSession = Depends(get_db),
 ):
-    reports, total = await lesson_report_service.get_lesson_reports(
+    reports, total, next_cursor = await lesson_report_service.get_lesson_reports(
         db,
         school_id=school_id,
         class_id=class_id,
@@ -93,19 +440,103 @@ async def list_lesson_reports(
         date_to=date_to,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
     )
     return PaginatedResponse(
         items=[LessonReportSummaryResponse.model_validate(r) for r in reports],
         total=total,
         limit=limit,
-        offset=offset,
+        offset=0 if cursor else offset,
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/lesson-reports/get-many", response_model=LessonReportGetManyResponse)
+async def get_many_lesson_reports(
+    report_ids: Annotated[
+        list[uuid.UUID], Body(min_length=1, max_length=settings.GET_MANY_MAX_REPORTS)
+    ],
+    db: AsyncSession = Depends(get_db),
+):
+    """Fetch many reports by id in a constant number of queries.
+
+    ``items`` maps each found id to its full report, in request order; ids with
+    no report are listed in ``missing`` instead of failing the request.
+    """
+    reports, missing = await lesson_report_service.get_lesson_reports_by_ids(db, report_ids)
+    body = to_json(
+        {"items": {str(r.id): _report_dict(r) for r in reports}, "missing": missing}
+    )
+    return Response(content=body, media_type="application/json")
+
+
+_FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated report fields to return (id is always included); "
+    f"any of {', '.join(lesson_report_service.REPORT_FIELDS)}. Default: all.",
+)
+_INCLUDE_QUERY = Query(
+    None,
+    description="Comma-separated entry collections to return: students, unrecognized. "
+    "Default: both; empty for none.",
+)
+
+
+async def _sparse_report_response(
+    request: Request,
+    db: AsyncSession,
+    report_id: uuid.UUID,
+    fields: tuple[str, ...],
+    include: tuple[str, ...],
+) -> Response:
+    # Partial views are not cached: they are cheap, and caching every
+    # combination would multiply the entries each write has to invalidate
+    view = await lesson_report_service.get_lesson_report_view(db, report_id, fields, include)
+    return cached_response(request, CachedResponse.from_body(_report_view_json(view)))
+
+
+def _is_full_view(fields: tuple[str, ...], include: tuple[str, ...]) -> bool:
+    return (
+        fields == lesson_report_service.REPORT_FIELDS
+        and include == lesson_report_service.REPORT_INCLUDES
     )
 
 
 @router.get("/lesson-reports/{report_id}", response_model=LessonReportResponse)
-async def get_lesson_report(report_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    report = await lesson_report_service.get_lesson_report(db, report_id)
-    return _report_to_response(report)
+async def get_lesson_report(
+    report_id: uuid.UUID,
+    request: Request,
+    fields: str | None = _FIELDS_QUERY,
+    include: str | None = _INCLUDE_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a report. ``fields`` and ``include`` narrow both the response and the SQL."""
+    field_names = lesson_report_service.parse_report_fields(fields)
+    collections = lesson_report_service.parse_report_include(include)
+    if not _is_full_view(field_names, collections):
+        return await _sparse_report_response(request, db, report_id, field_names, collections)
+
+    cache = lesson_report_service.report_cache
+    cached = cache.get(report_id)
+    if cached is None:
+        version = cache.version(report_id)
+        report = await lesson_report_service.get_lesson_report(db, report_id)
+        cached = CachedResponse.from_body(_report_json(report))
+        cache.set(report_id, cached, version)
+    return cached_response(request, cached)
+
+
+@router.get("/lesson-reports/{report_id}/status", response_model=LessonReportStatusResponse)
+async def get_lesson_report_status(report_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    if ingestion_queue.is_pending(report_id):
+        return LessonReportStatusResponse(id=report_id, status="queued")
+    if await lesson_report_service.lesson_report_exists(db, report_id):
+        return LessonReportStatusResponse(id=report_id, status="persisted")
+    failure = ingestion_queue.failure(report_id)
+    if failure is not None:
+        return LessonReportStatusResponse(id=report_id, status="failed", detail=failure)
+    raise HTTPException(status_code=404, detail=f"LessonReport {report_id} not found")
 
 
 @router.put("/lesson-reports/{report_id}", response_model=LessonReportResponse)
@@ -115,7 +546,7 @@ async def update_lesson_report(
     db: AsyncSession = Depends(get_db),
 ):
     report = await lesson_report_service.update_lesson_report(db, report_id, data)
-    return _report_to_response(report)
+    return _report_response(report)
 
 
 @router.delete("/lesson-reports/{report_id}", response_model=MessageResponse)
@@ -133,17 +564,74 @@ async def delete_lesson_report(
     tags=["Classes"],
 )
 async def get_latest_report_for_class(
-    class_id: EightDigitId, db: AsyncSession = Depends(get_db)
+    class_id: EightDigitId,
+    request: Request,
+    fields: str | None = _FIELDS_QUERY,
+    include: str | None = _INCLUDE_QUERY,
+    db: AsyncSession = Depends(get_db),
 ):
-    report = await lesson_report_service.get_latest_report_for_class(db, class_id)
-    return _report_to_response(report)
+    field_names = lesson_report_service.parse_report_fields(fields)
+    collections = lesson_report_service.parse_report_include(include)
+    if not _is_full_view(field_names, collections):
+        report_id = await lesson_report_service.get_latest_report_id_for_class(db, class_id)
+        return await _sparse_report_response(request, db, report_id, field_names, collections)
+
+    # Polled by classroom displays: serve from the cache with no DB work when
+    # possible, and 304 when the display already has this version
+    cache = lesson_report_service.latest_report_cache
+    cached = cache.get(class_id)
+    if cached is None:
+        version = cache.version(class_id)
+        report = await lesson_report_service.get_latest_report_for_class(db, class_id)
+        cached = CachedResponse.from_body(_report_json(report))
+        cache.set(class_id, cached, version)
+    return cached_response(request, cached)
 
 
 # ── Image serving ──────────────────────────────────────────────────────────
+async def _image_response(request: Request, filepath: Path, etag: str) -> Response:
+    """Serve an immutable image with validators, 304s and Range support.
+
+    The stat runs in the image I/O pool; FileResponse reuses its result.
+    """
+    try:
+        stat_result = await run_io(os.stat, filepath)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Image not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.IMAGE_CACHE_MAX_AGE}, immutable",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if settings.IMAGE_SENDFILE_HEADER:
+        relative = filepath.relative_to(settings.IMAGES_DIR).as_posix()
+        headers[settings.IMAGE_SENDFILE_HEADER] = settings.IMAGE_SENDFILE_PREFIX + relative
+        media_type = mimetypes.guess_type(filepath.name)[0] or "application/octet-stream"
+        return Response(headers=headers, media_type=media_type)
+    return FileResponse(filepath, headers=headers, stat_result=stat_result)
+
+
+# Declared before /images/{report_id}/{filename} so "blobs" is not parsed as an id
+@router.get("/images/blobs/{filename}", tags=["Images"])
+async def get_blob_image(filename: str, request: Request):
+    match = image_service.BLOB_NAME_RE.match(filename)
+    if not match:
+        raise HTTPException(status_code=404, detail="Image not found")
+    # Blob names are content hashes, so the hash is a strong validator
+    return await _image_response(request, blob_path(filename), f'"{match.group(1)}"')
+
+
 @router.get("/images/{report_id}/{filename}", tags=["Images"])
-async def get_image(report_id: uuid.UUID, filename: str):
-    filepath = settings.IMAGES_DIR / str(report_id) / filename
-    if not filepath.is_file():
-        from fastapi import HTTPException
+async def get_image(report_id: uuid.UUID, filename: str, request: Request):
+    match = image_service.REPORT_IMAGE_NAME_RE.match(filename)
+    if not match:
         raise HTTPException(status_code=404, detail="Image not found")
-    return FileResponse(str(filepath))
+    # Filenames are fresh uuids and files are never rewritten in place
+    filepath = settings.IMAGES_DIR / str(report_id) / filename
+    return await _image_response(request, filepath, f'"{match.group(1)}"')
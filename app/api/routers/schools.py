@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
+from app.api.responses import cached_response
 from app.schemas.school import SchoolCreate, SchoolUpdate, SchoolResponse
 from app.schemas.common import EightDigitId, MessageResponse
-from app.services import school_service
+from app.schemas.attention import AttentionStatsResponse, DailyAttentionPoint
+from app.services import attention_stats_service, school_service, rollup_service
 
 router = APIRouter(prefix="/schools", tags=["Schools"])
 
@@ -35,3 +39,35 @@ async def update_school(
 async def delete_school(school_id: EightDigitId, db: AsyncSession = Depends(get_db)):
     await school_service.delete_school(db, school_id)
     return MessageResponse(detail=f"School {school_id} deleted")
+
+
+@router.get("/{school_id}/attention/daily", response_model=list[DailyAttentionPoint])
+async def get_school_daily_attention(
+    school_id: EightDigitId,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    await school_service.get_school(db, school_id)
+    rows = await rollup_service.get_school_daily(db, school_id, date_from, date_to)
+    return [DailyAttentionPoint.from_rollup(row) for row in rows]
+
+
+@router.get("/{school_id}/attention/stats", response_model=AttentionStatsResponse)
+async def get_school_attention_stats(
+    school_id: EightDigitId,
+    request: Request,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    bins: str = Query(
+        "10", description="Bin count over 0-100, or comma-separated edges like 0,40,60,80,100"
+    ),
+    threshold: float = Query(50, ge=0, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """Attention percentiles, histogram, std and share under ``threshold``."""
+    await school_service.get_school(db, school_id)
+    cached = await attention_stats_service.get_attention_stats(
+        db, "school", school_id, date_from, date_to, bins=bins, threshold=threshold
+    )
+    return cached_response(request, cached)
@@ -1,10 +1,15 @@
+from datetime import date
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import get_db
-from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
-from app.schemas.common import EightDigitId, MessageResponse
-from app.services import student_service
+from app.api.deps import get_db, get_session_factory
+from app.core.config import settings
+from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse, StudentListItem
+from app.schemas.common import EightDigitId, MessageResponse, PaginatedResponse
+from app.schemas.attention import AttentionSeriesResponse, Bucket
+from app.services import attention_service, student_service
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
@@ -14,12 +19,49 @@ async def create_student(data: StudentCreate, db: AsyncSession = Depends(get_db)
     return await student_service.create_student(db, data)
 
 
-@router.get("", response_model=list[StudentResponse])
+@router.get("", response_model=PaginatedResponse[StudentListItem])
 async def list_students(
     class_id: EightDigitId | None = Query(None),
+    school_id: EightDigitId | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count all matching students"),
+    with_stats: bool = Query(False, description="Add reports_count and latest_attention"),
+    stream: bool = Query(
+        False, description="Stream every matching student as NDJSON (no paging)"
+    ),
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
 ):
-    return await student_service.get_students(db, class_id=class_id)
+    if stream:
+        return StreamingResponse(
+            student_service.stream_students(
+                session_factory,
+                class_id=class_id,
+                school_id=school_id,
+                with_stats=with_stats,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+            ),
+            media_type="application/x-ndjson",
+        )
+    students, total, next_cursor = await student_service.get_students(
+        db,
+        class_id=class_id,
+        school_id=school_id,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+        with_stats=with_stats,
+    )
+    return PaginatedResponse(
+        items=[StudentListItem.model_validate(s) for s in students],
+        total=total,
+        limit=limit,
+        offset=0 if cursor else offset,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{student_id}", response_model=StudentResponse)
@@ -27,6 +69,19 @@ async def get_student(student_id: EightDigitId, db: AsyncSession = Depends(get_d
     return await student_service.get_student(db, student_id)
 
 
+@router.get("/{student_id}/attention", response_model=AttentionSeriesResponse)
+async def get_student_attention(
+    student_id: EightDigitId,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    bucket: Bucket = Query("day"),
+    db: AsyncSession = Depends(get_db),
+):
+    return await attention_service.get_student_attention_series(
+        db, student_id, bucket=bucket, date_from=date_from, date_to=date_to
+    )
+
+
 @router.put("/{student_id}", response_model=StudentResponse)
 async def update_student(
     student_id: EightDigitId,
@@ -0,0 +1,122 @@
+"""Maintenance commands.
+
+Usage::
+
+    python -m app.cli gc-images [--grace-seconds N] [--dry-run]
+    python -m app.cli sweep-images [--grace-seconds N] [--dry-run]
+    python -m app.cli rebuild-rollups
+    python -m app.cli export-attention [--format parquet|arrow] [--school-id N]
+                                       [--date-from YYYY-MM-01] [--date-to YYYY-MM-DD]
+                                       [--output DIR]
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import async_session_factory
+from app.services import columnar_export, image_service, rollup_service
+from app.services.export_service import ExportFilters
+
+
+async def _gc_images(args: argparse.Namespace) -> None:
+    async with async_session_factory() as db:
+        await image_service.collect_garbage(
+            db, grace_seconds=args.grace_seconds, dry_run=args.dry_run
+        )
+
+
+async def _sweep_images(args: argparse.Namespace) -> None:
+    async with async_session_factory() as db:
+        await image_service.sweep_report_dirs(
+            db, grace_seconds=args.grace_seconds, dry_run=args.dry_run
+        )
+
+
+async def _rebuild_rollups(args: argparse.Namespace) -> None:
+    async with async_session_factory() as db:
+        await rollup_service.rebuild_rollups(db)
+        await db.commit()
+
+
+async def _export_attention(args: argparse.Namespace) -> None:
+    filters = ExportFilters(
+        school_id=args.school_id,
+        date_from=args.date_from,
+        date_to=args.date_to,
+    )
+    try:
+        await columnar_export.write_attention_partitions(
+            async_session_factory,
+            filters,
+            args.output,
+            settings.EXPORT_BATCH_SIZE,
+            fmt=args.format,
+        )
+    except HTTPException as exc:
+        raise SystemExit(exc.detail)
+
+
+def _add_cleanup_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--grace-seconds",
+        type=int,
+        default=settings.IMAGE_GC_GRACE_SECONDS,
+        help="Skip files modified more recently than this (default: %(default)s)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gc = commands.add_parser(
+        "gc-images", help="Remove content-addressed image blobs no entry references"
+    )
+    _add_cleanup_options(gc)
+    gc.set_defaults(handler=_gc_images)
+
+    sweep = commands.add_parser(
+        "sweep-images", help="Remove image directories of reports that no longer exist"
+    )
+    _add_cleanup_options(sweep)
+    sweep.set_defaults(handler=_sweep_images)
+
+    rebuild = commands.add_parser(
+        "rebuild-rollups", help="Recompute the daily attention rollups from all reports"
+    )
+    rebuild.set_defaults(handler=_rebuild_rollups)
+
+    export = commands.add_parser(
+        "export-attention",
+        help="Write attention entries as Parquet/Arrow files partitioned by school and month",
+    )
+    export.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    export.add_argument("--school-id", type=int)
+    export.add_argument(
+        "--date-from", type=date.fromisoformat, help="First day of the first month to export"
+    )
+    export.add_argument(
+        "--date-to", type=date.fromisoformat, help="Last day of the last month to export"
+    )
+    export.add_argument(
+        "--output",
+        type=Path,
+        default=settings.DATA_DIR / "exports" / "attention",
+        help="Partitioned dataset root (default: %(default)s)",
+    )
+    export.set_defaults(handler=_export_attention)
+
+    args = parser.parse_args(argv)
+    setup_logging("DEBUG" if settings.DEBUG else "INFO")
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
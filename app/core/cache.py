@@ -0,0 +1,122 @@
+"""In-process LRU + TTL cache of serialized responses.
+
+Values are final response bodies plus their ETag, so a hit costs no DB work
+and no serialization. The cache is bounded by the total size of the bodies
+it holds; least recently used entries are evicted first.
+
+Writers invalidate keys after commit. A reader that misses notes the key's
+version first and only stores its result if no invalidation happened
+meanwhile; otherwise a slow reader could put back data that a concurrent
+write had just replaced. ``clear`` also bumps a cache-wide epoch that is part
+of every version token, so reads already in flight for keys that were not
+cached yet cannot store their results either.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import asdict, dataclass
+
+# Rough per-entry overhead (key, tuple, dataclass, ETag) counted towards max_bytes
+_ENTRY_OVERHEAD_BYTES = 256
+# Versions are only needed while a read is in flight; keep a bounded history
+_MAX_TRACKED_VERSIONS = 100_000
+
+
+@dataclass(slots=True, frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedResponse":
+        """Wrap a body with a strong ETag derived from its content."""
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + _ENTRY_OVERHEAD_BYTES
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+
+class ResponseCache:
+    def __init__(self, name: str, max_bytes: int, ttl_seconds: float) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, CachedResponse]] = OrderedDict()
+        self._versions: OrderedDict[Hashable, int] = OrderedDict()
+        self._epoch = 0
+        self._bytes = 0
+        self._stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        item = self._entries.get(key)
+        if item is None:
+            self._stats.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def version(self, key: Hashable) -> tuple[int, int]:
+        """Token to pass to ``set`` for a value computed from a fresh read."""
+        return self._epoch, self._versions.get(key, 0)
+
+    def set(self, key: Hashable, value: CachedResponse, version: tuple[int, int]) -> None:
+        if not self.enabled or value.size > self.max_bytes:
+            return
+        if self.version(key) != version:
+            return  # invalidated or cleared while the value was being computed
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._bytes += value.size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._remove(key)
+            self._versions[key] = self._versions.pop(key, 0) + 1
+            self._stats.invalidations += 1
+        while len(self._versions) > _MAX_TRACKED_VERSIONS:
+            self._versions.popitem(last=False)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self.invalidate(*list(self._entries))
+
+    def stats(self) -> dict[str, int]:
+        self._stats.entries = len(self._entries)
+        self._stats.bytes = self._bytes
+        self._stats.max_bytes = self.max_bytes
+        return asdict(self._stats)
+
+    def _remove(self, key: Hashable) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1].size
@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,6 +21,53 @@ class Settings(BaseSettings):
     IMAGES_DIR: Path = Path("./data/images")
 
     MAX_IMAGE_SIZE_BYTES: int = 2 * 1024 * 1024  # 2 MB
+    # Threads used to decode and write images off the event loop
+    IMAGE_IO_WORKERS: int = 8
+    # "report_dir": IMAGES_DIR/<report_id>/<uuid>.<ext> (one copy per entry)
+    # "content_addressed": IMAGES_DIR/blobs/ab/cd/<sha256>.<ext> (deduplicated)
+    IMAGE_STORAGE: Literal["report_dir", "content_addressed"] = "report_dir"
+    # Blobs touched more recently than this are never garbage-collected
+    IMAGE_GC_GRACE_SECONDS: int = 3600
+    # Stored images never change, so clients may cache them for this long
+    IMAGE_CACHE_MAX_AGE: int = 365 * 24 * 3600
+    # Let a fronting proxy send image bytes: set to "X-Accel-Redirect" (nginx)
+    # or "X-Sendfile" (Apache/lighttpd). The header value is
+    # IMAGE_SENDFILE_PREFIX + the path relative to IMAGES_DIR.
+    IMAGE_SENDFILE_HEADER: str = ""
+    IMAGE_SENDFILE_PREFIX: str = "/protected-images/"
+    # Post-commit removal of deleted images: parallel removals and retries
+    FILE_CLEANUP_CONCURRENCY: int = 4
+    FILE_CLEANUP_RETRIES: int = 3
+    FILE_CLEANUP_RETRY_DELAY_SECONDS: float = 0.5
+
+    # Max number of reports accepted by POST /lesson-reports/batch
+    BATCH_MAX_REPORTS: int = 500
+    # Max number of ids accepted by POST /lesson-reports/get-many
+    GET_MANY_MAX_REPORTS: int = 200
+
+    # POST /lesson-reports/stream: reports per commit, and max bytes per line
+    NDJSON_CHUNK_SIZE: int = 100
+    NDJSON_MAX_LINE_BYTES: int = 128 * 1024 * 1024  # 128 MB
+
+    # GET /exports/* and ?stream=true listings: rows per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 5000
+
+    # In-memory caches of serialized responses (0 bytes disables a cache).
+    # Writes invalidate them on commit; on PostgreSQL other workers are told via
+    # NOTIFY on INVALIDATION_CHANNEL, and the TTL only covers a lost listener.
+    LATEST_REPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LATEST_REPORT_CACHE_TTL_SECONDS: float = 5.0
+    REPORT_CACHE_MAX_BYTES: int = 128 * 1024 * 1024
+    REPORT_CACHE_TTL_SECONDS: float = 300.0
+    ATTENTION_STATS_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    ATTENTION_STATS_CACHE_TTL_SECONDS: float = 300.0
+    INVALIDATION_CHANNEL: str = "behalysis_invalidate"
+
+    # Write-behind ingestion (POST /lesson-reports/async)
+    INGEST_QUEUE_ENABLED: bool = False
+    INGEST_QUEUE_MAX_SIZE: int = 10_000
+    INGEST_BATCH_SIZE: int = 200
+    INGEST_FLUSH_INTERVAL_SECONDS: float = 0.5
 
     @property
     def sync_database_url(self) -> str:
@@ -7,3 +7,6 @@ from app.models.student import Student  # noqa: F401
 from app.models.lesson_report import LessonReport  # noqa: F401
 from app.models.attention_entry import AttentionEntry  # noqa: F401
 from app.models.unrecognized_entry import UnrecognizedEntry  # noqa: F401
+from app.models.class_daily_attention import ClassDailyAttention  # noqa: F401
+from app.models.school_daily_attention import SchoolDailyAttention  # noqa: F401
+from app.models.class_latest_report import ClassLatestReport  # noqa: F401
@@ -0,0 +1,46 @@
+"""Run side effects only once the current transaction has committed.
+
+Work outside the database (removing files, invalidating caches) cannot be
+rolled back, so it must not happen before COMMIT. Callbacks registered with
+``after_commit`` run right after a successful commit and are dropped if the
+transaction rolls back instead.
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.logging import logger
+
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Call ``callback()`` after the session's current transaction commits.
+
+    Callbacks run synchronously on the event loop thread, so they must be
+    quick; schedule a task for anything slow.
+    """
+    session = db.sync_session
+    if not session.in_transaction():
+        # Tie the callback to a transaction so a rollback always discards it
+        session.begin()
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(_CALLBACKS_KEY, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted(session: Session, transaction: SessionTransaction) -> None:
+    # Whatever is left when the outermost transaction ends was rolled back
+    if transaction.parent is None:
+        session.info.pop(_CALLBACKS_KEY, None)
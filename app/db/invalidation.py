@@ -0,0 +1,138 @@
+"""Cross-worker cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Services call ``publish`` inside their transaction. On PostgreSQL this runs
+``pg_notify('behalysis_invalidate', '<entity>:<id>[,<id>...]')``, which the
+server delivers on COMMIT (and drops on rollback) to every worker listening on
+the channel. Each worker keeps one listener connection, started from the app
+``lifespan``, and passes the ids to the handlers subscribed for that entity,
+which evict their local cache entries.
+
+The publishing worker also dispatches locally right after commit, so its own
+caches never wait for the round trip. On SQLite (single process) that local
+dispatch is all there is.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from functools import partial
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.hooks import after_commit
+
+# NOTIFY payloads are limited to 8000 bytes; stay well below
+_MAX_PAYLOAD_BYTES = 7000
+_RECONNECT_DELAY_SECONDS = 1.0
+_MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+class InvalidationBus:
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._flush_handlers: list[Callable[[], None]] = []
+        self._listener: asyncio.Task | None = None
+
+    def subscribe(
+        self,
+        entity: str,
+        handler: Callable[[str], None],
+        flush: Callable[[], None] | None = None,
+    ) -> None:
+        """Call ``handler(id)`` for every invalidated ``entity`` id.
+
+        ``flush`` drops everything; it runs whenever the listener (re)connects,
+        since notifications sent while it was down are lost.
+        """
+        self._handlers.setdefault(entity, []).append(handler)
+        if flush is not None:
+            self._flush_handlers.append(flush)
+
+    async def publish(self, db: AsyncSession, entity: str, *ids: object) -> None:
+        """Invalidate ``entity`` ids everywhere once the transaction commits."""
+        keys = [str(i) for i in dict.fromkeys(ids)]
+        if not keys:
+            return
+        after_commit(db, partial(self._dispatch_keys, entity, keys))
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        for payload in _payloads(entity, keys):
+            await db.execute(select(func.pg_notify(self.channel, payload)))
+
+    # ── Listener ────────────────────────────────────────────────────────────
+    async def start(self, engine: AsyncEngine) -> None:
+        """Start listening for other workers' invalidations (PostgreSQL only)."""
+        if engine.dialect.name != "postgresql" or self._listener is not None:
+            return
+        self._listener = asyncio.create_task(
+            self._listen_forever(engine), name="invalidation-listener"
+        )
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen_forever(self, engine: AsyncEngine) -> None:
+        delay = _RECONNECT_DELAY_SECONDS
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver_conn = raw.driver_connection
+                    lost = asyncio.Event()
+                    driver_conn.add_termination_listener(lambda _: lost.set())
+                    await driver_conn.add_listener(self.channel, self._on_notify)
+                    logger.info("Listening for cache invalidations on %r", self.channel)
+                    # Anything may have changed while we were not listening
+                    self._flush_all()
+                    delay = _RECONNECT_DELAY_SECONDS
+                    await lost.wait()
+                    logger.warning("Invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Invalidation listener failed; retrying in %.0fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _MAX_RECONNECT_DELAY_SECONDS)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        entity, _, keys = payload.partition(":")
+        self._dispatch_keys(entity, keys.split(","))
+
+    def _dispatch_keys(self, entity: str, keys: Iterable[str]) -> None:
+        for handler in self._handlers.get(entity, []):
+            for key in keys:
+                try:
+                    handler(key)
+                except Exception:
+                    logger.exception("Invalidation handler for %s:%s failed", entity, key)
+
+    def _flush_all(self) -> None:
+        for flush in self._flush_handlers:
+            flush()
+
+
+def _payloads(entity: str, keys: list[str]) -> Iterable[str]:
+    """Pack ids into as few ``<entity>:<id>,<id>`` payloads as the size limit allows."""
+    batch: list[str] = []
+    size = len(entity) + 1
+    for key in keys:
+        if batch and size + len(key) + 1 > _MAX_PAYLOAD_BYTES:
+            yield f"{entity}:{','.join(batch)}"
+            batch, size = [], len(entity) + 1
+        batch.append(key)
+        size += len(key) + 1
+    if batch:
+        yield f"{entity}:{','.join(batch)}"
+
+
+invalidation_bus = InvalidationBus(settings.INVALIDATION_CHANNEL)
@@ -0,0 +1,76 @@
+"""Shared plumbing for list endpoints over row projections.
+
+``fetch_page`` returns one newest-first page using keyset pagination on
+``(created_at, key)`` (see ``app.utils.cursor``). ``stream_ndjson`` streams
+every matching row as NDJSON from a server-side cursor.
+"""
+
+from collections.abc import AsyncIterator, Callable
+from typing import Any, TypeVar
+
+from pydantic_core import to_json
+from sqlalchemy import ColumnElement, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.rows import to_rows
+from app.utils.cursor import decode_created_at_cursor, encode_cursor
+
+RowT = TypeVar("RowT")
+
+
+async def count_rows(db: AsyncSession, stmt: Select) -> int:
+    """``count(*)`` of the rows ``stmt`` matches (its ordering and limits are dropped)."""
+    subquery = stmt.order_by(None).limit(None).offset(None).subquery()
+    return (await db.execute(select(func.count()).select_from(subquery))).scalar() or 0
+
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt: Select,
+    row_type: type[RowT],
+    *,
+    created_at: ColumnElement,
+    key: ColumnElement,
+    parse_key: Callable[[str], Any],
+    limit: int,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> tuple[list[RowT], str | None]:
+    """Return a page of ``stmt`` ordered by ``(created_at, key)`` descending.
+
+    With ``cursor`` (the ``next_cursor`` of the previous page) rows are found by
+    keyset and ``offset`` is ignored. ``parse_key`` turns the cursor's key back
+    into a column value and raises HTTPException 400 if it cannot.
+
+    Returns ``(rows, next_cursor)``.
+    """
+    if cursor is not None:
+        last_created_at, last_key = decode_created_at_cursor(cursor)
+        stmt = stmt.where(tuple_(created_at, key) < (last_created_at, parse_key(last_key)))
+    elif offset:
+        stmt = stmt.offset(offset)
+    # One extra row tells whether there is a next page
+    stmt = stmt.order_by(created_at.desc(), key.desc()).limit(limit + 1)
+    rows = to_rows(row_type, await db.execute(stmt))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_at.key), getattr(last, key.key)
+        )
+    return rows, next_cursor
+
+
+async def stream_ndjson(
+    session_factory: async_sessionmaker[AsyncSession],
+    stmt: Select,
+    row_type: type,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """Yield every row of ``stmt`` as NDJSON, one encoded cursor batch at a time."""
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield b"".join(to_json(row) + b"\n" for row in to_rows(row_type, batch))
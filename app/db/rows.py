@@ -0,0 +1,116 @@
+"""Read-only row projections for the hot read paths.
+
+Read endpoints only serialize what they load, so they do not need ORM
+objects. Identity-map entries, instance state and relationship collections
+would be built and thrown away on every request. Instead, these queries select
+exactly the columns a response needs through Core. Each row is mapped into a
+slotted, frozen dataclass whose attribute names match the ORM model, so the
+response schemas (``from_attributes``) and serializers accept either one.
+
+Write paths keep using the ORM.
+"""
+
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, fields
+from datetime import date, datetime, time
+from typing import TypeVar
+
+from sqlalchemy import Select, Table, select
+from sqlalchemy.engine import Result
+
+RowT = TypeVar("RowT")
+
+
+@dataclass(slots=True, frozen=True)
+class StudentRow:
+    id: int
+    class_id: int
+    full_name: str | None
+    created_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class StudentStatsRow(StudentRow):
+    reports_count: int
+    latest_attention: int | None
+
+
+@dataclass(slots=True, frozen=True)
+class ClassRoomRow:
+    id: int
+    school_id: int
+    class_index: str
+    created_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class ClassRoomStatsRow(ClassRoomRow):
+    students_count: int
+    reports_count: int
+    latest_attention: float | None
+
+
+@dataclass(slots=True, frozen=True)
+class LessonReportSummaryRow:
+    id: uuid.UUID
+    school_id: int
+    class_id: int
+    class_index: str
+    lesson_date: date
+    lesson_time: time
+    students_count: int
+    avg_attention: float
+    avg_inattention: float
+    created_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class AttentionEntryRow:
+    id: uuid.UUID
+    report_id: uuid.UUID
+    student_id: int
+    attention: int
+    inattention: int
+    image_path: str | None
+    image_sha256: str | None
+    created_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class UnrecognizedEntryRow:
+    id: uuid.UUID
+    report_id: uuid.UUID
+    attention: int
+    inattention: int
+    image_path: str | None
+    image_sha256: str | None
+    created_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class LessonReportRow:
+    """A report with its entries, shaped like an eagerly loaded ``LessonReport``."""
+
+    id: uuid.UUID
+    school_id: int
+    class_id: int
+    class_index: str
+    lesson_date: date
+    lesson_time: time
+    students_count: int
+    avg_attention: float
+    avg_inattention: float
+    created_at: datetime
+    attention_entries: list[AttentionEntryRow]
+    unrecognized_entries: list[UnrecognizedEntryRow]
+
+
+def project(row_type: type, table: Table) -> Select:
+    """``SELECT`` the columns of ``table`` named by ``row_type``'s fields, in order."""
+    return select(*(table.c[f.name] for f in fields(row_type) if f.name in table.c))
+
+
+def to_rows(row_type: type[RowT], result: Result | Iterable) -> list[RowT]:
+    """Map positional rows of a ``project(row_type, ...)`` query to ``row_type``."""
+    return [row_type(*row) for row in result]
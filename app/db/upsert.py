@@ -0,0 +1,53 @@
+"""Dialect-aware bulk INSERT helpers shared by the services."""
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(db: AsyncSession, target: Any):
+    """``INSERT`` construct with ``ON CONFLICT`` support for the session's dialect."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(target)
+    if dialect == "sqlite":
+        return sqlite.insert(target)
+    raise NotImplementedError(f"ON CONFLICT is not supported for dialect {dialect!r}")
+
+
+async def insert_on_conflict_do_nothing(
+    db: AsyncSession, model: type, rows: list[dict[str, Any]]
+) -> None:
+    """Multi-row ``INSERT ... ON CONFLICT DO NOTHING`` for PostgreSQL and SQLite.
+
+    Rows that already exist (or are inserted concurrently by another
+    transaction) are skipped instead of raising ``IntegrityError``.
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db, model).on_conflict_do_nothing()
+    await db.execute(stmt, rows)
+
+
+async def insert_on_conflict_increment(
+    db: AsyncSession, model: type, rows: list[dict[str, Any]], key: Sequence[str]
+) -> None:
+    """Multi-row upsert that adds each row's counters onto an existing row.
+
+    ``key`` names the conflict (primary key) columns; every other column in
+    ``rows`` is a counter, inserted as-is or added to the stored value. The
+    increment is done by the database, so concurrent writers never lose
+    updates.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    stmt = dialect_insert(db, table)
+    counters = [name for name in rows[0] if name not in key]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={name: table.c[name] + stmt.excluded[name] for name in counters},
+    )
+    await db.execute(stmt, rows)
@@ -6,14 +6,26 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.logging import setup_logging, logger
-from app.api.routers import schools, classes, students, lesson_reports
+from app.api.routers import schools, classes, students, lesson_reports, exports
+from app.db.invalidation import invalidation_bus
+from app.db.session import async_session_factory, engine
+from app.services.file_cleanup import file_cleaner
+from app.services.attention_stats_service import stats_cache
+from app.services.lesson_report_service import latest_report_cache, report_cache
+from app.services.ingestion_queue import ingestion_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging("DEBUG" if settings.DEBUG else "INFO")
     logger.info("Starting %s v%s", settings.PROJECT_NAME, settings.PROJECT_VERSION)
+    await invalidation_bus.start(engine)
+    if settings.INGEST_QUEUE_ENABLED:
+        await ingestion_queue.start(async_session_factory)
     yield
+    await ingestion_queue.stop()
+    await file_cleaner.drain()
+    await invalidation_bus.stop()
     logger.info("Shutting down %s", settings.PROJECT_NAME)
 
 
@@ -41,6 +53,7 @@ app.include_router(schools.router)
 app.include_router(classes.router)
 app.include_router(students.router)
 app.include_router(lesson_reports.router)
+app.include_router(exports.router)
 
 
 # ── Global exception handler ────────────────────────────────────────────────
@@ -57,3 +70,12 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.get("/health", tags=["Health"])
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    """Per-worker response cache counters (hits, misses, evictions, size)."""
+    return {
+        cache.name: cache.stats()
+        for cache in (report_cache, latest_report_cache, stats_cache)
+    }
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Integer, String, ForeignKey, DateTime
+from sqlalchemy import Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,10 @@ from app.db.base_class import Base
 
 class AttentionEntry(Base):
     __tablename__ = "attention_entries"
+    __table_args__ = (
+        # Per-student history; also serves the student_id foreign key
+        Index("ix_attention_entries_student_id_report_id", "student_id", "report_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -18,6 +22,7 @@ class AttentionEntry(Base):
         PG_UUID(as_uuid=True),
         ForeignKey("lesson_reports.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     student_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False
@@ -25,6 +30,9 @@ class AttentionEntry(Base):
     attention: Mapped[int] = mapped_column(Integer, nullable=False)
     inattention: Mapped[int] = mapped_column(Integer, nullable=False)
     image_path: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Set when the image lives in the content-addressed store (image_path is then
+    # the blob name "<sha256><ext>"); entries sharing bytes share the blob
+    image_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
     )
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class ClassLatestReport(Base):
+    """Pointer to each class's most recent report (by ``created_at``, then id).
+
+    Maintained by the report service so the "latest report" endpoint is a
+    primary-key read instead of an ORDER BY over ``lesson_reports``.
+    """
+
+    __tablename__ = "class_latest_report"
+
+    class_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("classrooms.id", ondelete="CASCADE"), primary_key=True
+    )
+    report_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("lesson_reports.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # Copy of the report's created_at, to compare against newer reports
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ClassLatestReport class_id={self.class_id} report_id={self.report_id}>"
@@ -11,7 +11,7 @@ class ClassRoom(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
     school_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True
     )
     class_index: Mapped[str] = mapped_column(String(50), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
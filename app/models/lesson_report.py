@@ -9,6 +9,7 @@ from sqlalchemy import (
     Time,
     DateTime,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -18,6 +19,14 @@ from app.db.base_class import Base
 
 class LessonReport(Base):
     __tablename__ = "lesson_reports"
+    __table_args__ = (
+        # Latest report per class: WHERE class_id = ? ORDER BY created_at DESC
+        Index("ix_lesson_reports_class_id_created_at", "class_id", "created_at"),
+        # Listings filtered by school and date range
+        Index("ix_lesson_reports_school_id_lesson_date", "school_id", "lesson_date"),
+        # Unfiltered keyset pagination on (created_at, id)
+        Index("ix_lesson_reports_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -29,11 +38,15 @@ class LessonReport(Base):
         Integer, ForeignKey("classrooms.id", ondelete="CASCADE"), nullable=False
     )
     class_index: Mapped[str] = mapped_column(String(50), nullable=False)
-    lesson_date: Mapped[date] = mapped_column(Date, nullable=False)
+    lesson_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     lesson_time: Mapped[time] = mapped_column(Time, nullable=False)
     students_count: Mapped[int] = mapped_column(Integer, nullable=False)
     avg_attention: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     avg_inattention: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # Client-supplied Idempotency-Key header; retries with the same key return this report
+    idempotency_key: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, unique=True, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
     )
@@ -0,0 +1,28 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class SchoolDailyAttention(Base):
+    """Attention totals per school and lesson day, kept current by the report service.
+
+    Mean and standard deviation follow from count, sum and sum of squares, so
+    rows for any date range can be combined by adding them up.
+    """
+
+    __tablename__ = "school_daily_attention"
+
+    school_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("schools.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    reports_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    entries_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attention_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    attention_sq_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<SchoolDailyAttention school_id={self.school_id} day={self.day} n={self.entries_count}>"
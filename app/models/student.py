@@ -11,7 +11,7 @@ class Student(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
     class_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("classrooms.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("classrooms.id", ondelete="CASCADE"), nullable=False, index=True
     )
     full_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
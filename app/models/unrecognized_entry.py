@@ -18,10 +18,14 @@ class UnrecognizedEntry(Base):
         PG_UUID(as_uuid=True),
         ForeignKey("lesson_reports.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     attention: Mapped[int] = mapped_column(Integer, nullable=False)
     inattention: Mapped[int] = mapped_column(Integer, nullable=False)
     image_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # Set when the image lives in the content-addressed store (image_path is then
+    # the blob name "<sha256><ext>"); entries sharing bytes share the blob
+    image_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
     )
@@ -0,0 +1,81 @@
+import math
+from datetime import date
+from typing import Literal
+
+from pydantic import BaseModel
+
+Bucket = Literal["day", "week", "month"]
+
+
+# ── Daily rollups ───────────────────────────────────────────────────────────
+class DailyAttentionPoint(BaseModel):
+    day: date
+    reports_count: int
+    entries_count: int
+    avg_attention: float | None
+    # Population standard deviation of entry attention on that day
+    stddev_attention: float | None
+
+    @classmethod
+    def from_rollup(cls, row) -> "DailyAttentionPoint":
+        """Derive mean and standard deviation from a rollup row's totals."""
+        n = row.entries_count
+        avg = std = None
+        if n:
+            mean = row.attention_sum / n
+            variance = max(row.attention_sq_sum / n - mean * mean, 0.0)
+            avg, std = round(mean, 2), round(math.sqrt(variance), 2)
+        return cls(
+            day=row.day,
+            reports_count=row.reports_count,
+            entries_count=n,
+            avg_attention=avg,
+            stddev_attention=std,
+        )
+
+
+# ── Time series ─────────────────────────────────────────────────────────────
+class AttentionSeriesResponse(BaseModel):
+    """Bucketed attention as parallel arrays: index ``i`` of each list is one point.
+
+    ``timestamps`` holds the first day of each bucket (Monday for weeks).
+    """
+    student_id: int
+    bucket: Bucket
+    timestamps: list[date]
+    mean: list[float]
+    min: list[int]
+    max: list[int]
+    n: list[int]
+
+
+# ── Distributions ───────────────────────────────────────────────────────────
+class AttentionHistogram(BaseModel):
+    """``counts[i]`` entries fall in ``[edges[i], edges[i + 1])`` (the last bin is closed)."""
+    edges: list[float]
+    counts: list[int]
+
+
+class AttentionStatsResponse(BaseModel):
+    """Distribution of entry attention for a class or school over a date range.
+
+    Percentiles, mean, std and the entry share cover all entries. Only
+    recognized students count towards ``students_count`` and the share of
+    students whose mean attention is under ``threshold``.
+    """
+    scope: Literal["class", "school"]
+    id: int
+    date_from: date | None
+    date_to: date | None
+    entries_count: int
+    students_count: int
+    mean: float | None
+    # Population standard deviation
+    std: float | None
+    p10: float | None
+    p50: float | None
+    p90: float | None
+    histogram: AttentionHistogram
+    threshold: float
+    share_entries_under_threshold: float | None
+    share_students_under_threshold: float | None
@@ -31,3 +31,10 @@ class ClassRoomResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ClassRoomListItem(ClassRoomResponse):
+    # Only filled in with ``with_stats=true``
+    students_count: int | None = None
+    reports_count: int | None = None
+    latest_attention: float | None = None
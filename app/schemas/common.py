@@ -27,9 +27,12 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    # None when the caller opted out of counting (include_total=false)
+    total: int | None = None
     limit: int
-    offset: int
+    offset: int = 0
+    # Pass as ``cursor`` to fetch the next page; None on the last page
+    next_cursor: str | None = None
 
 
 # ── Message response ────────────────────────────────────────────────────────
@@ -1,10 +1,10 @@
 import uuid
 from datetime import date, time, datetime
-from typing import Self
+from typing import Literal, Self
 
 from pydantic import BaseModel, Field, model_validator
 
-from app.schemas.common import EightDigitId
+from app.schemas.common import EightDigitId, ValidationErrorDetail
 
 
 # ── Nested entry schemas ────────────────────────────────────────────────────
@@ -43,6 +43,8 @@ class UnrecognizedEntryResponse(BaseModel):
 
 # ── Lesson Report ───────────────────────────────────────────────────────────
 class LessonReportCreate(BaseModel):
+    # Optional client-generated id; resubmitting the same id returns the stored report
+    id: uuid.UUID | None = None
     class_id: EightDigitId
     school_id: EightDigitId
     class_index: str
@@ -143,3 +145,31 @@ class LessonReportSummaryResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class LessonReportGetManyResponse(BaseModel):
+    """Reports keyed by id, plus the requested ids that do not exist."""
+    items: dict[uuid.UUID, LessonReportResponse]
+    missing: list[uuid.UUID] = []
+
+
+# ── Batch ingestion ─────────────────────────────────────────────────────────
+class LessonReportBatchItemResult(BaseModel):
+    """Outcome of a single payload inside a batch submission."""
+    index: int
+    status: Literal["created", "duplicate", "invalid", "failed"]
+    id: uuid.UUID | None = None
+    errors: list[ValidationErrorDetail] = []
+
+
+class LessonReportBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[LessonReportBatchItemResult]
+
+
+# ── Asynchronous ingestion ──────────────────────────────────────────────────
+class LessonReportStatusResponse(BaseModel):
+    id: uuid.UUID
+    status: Literal["queued", "persisted", "failed"]
+    detail: str | None = None
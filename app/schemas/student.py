@@ -31,3 +31,9 @@ class StudentResponse(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class StudentListItem(StudentResponse):
+    # Only filled in with ``with_stats=true``
+    reports_count: int | None = None
+    latest_attention: int | None = None
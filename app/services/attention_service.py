@@ -0,0 +1,72 @@
+"""Attention analytics computed in SQL over entries joined to their reports."""
+
+from datetime import date
+
+from sqlalchemy import Date, DateTime, cast, func, literal_column, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.attention_entry import AttentionEntry
+from app.models.lesson_report import LessonReport
+from app.schemas.attention import AttentionSeriesResponse, Bucket
+from app.services.student_service import get_student
+
+
+def _bucket_start(dialect: str, bucket: Bucket, day: ColumnElement) -> ColumnElement:
+    """SQL expression for the first day of the bucket containing ``day``."""
+    if dialect == "postgresql":
+        # Inline the unit: a bound parameter would make the SELECT and GROUP BY
+        # expressions differ ($1 vs $2) and Postgres would reject the query
+        unit = literal_column(f"'{bucket}'")
+        return cast(func.date_trunc(unit, cast(day, DateTime)), Date)
+    # SQLite: dates are ISO strings, so use its date modifiers
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        # Forward to Sunday, then back to that week's Monday (as date_trunc does)
+        return type_coerce(func.date(day, "weekday 0", "-6 days"), Date)
+    return type_coerce(func.date(day, "start of month"), Date)
+
+
+async def get_student_attention_series(
+    db: AsyncSession,
+    student_id: int,
+    bucket: Bucket = "day",
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> AttentionSeriesResponse:
+    """Aggregate a student's attention per bucket of lesson dates.
+
+    Raises:
+        HTTPException 404 if the student does not exist.
+    """
+    await get_student(db, student_id)
+
+    start = _bucket_start(db.get_bind().dialect.name, bucket, LessonReport.lesson_date)
+    stmt = (
+        select(
+            start.label("bucket_start"),
+            func.avg(AttentionEntry.attention),
+            func.min(AttentionEntry.attention),
+            func.max(AttentionEntry.attention),
+            func.count(),
+        )
+        .join(LessonReport, LessonReport.id == AttentionEntry.report_id)
+        .where(AttentionEntry.student_id == student_id)
+    )
+    if date_from is not None:
+        stmt = stmt.where(LessonReport.lesson_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(LessonReport.lesson_date <= date_to)
+    stmt = stmt.group_by(start).order_by(start)
+
+    rows = (await db.execute(stmt)).all()
+    return AttentionSeriesResponse(
+        student_id=student_id,
+        bucket=bucket,
+        timestamps=[row[0] for row in rows],
+        mean=[round(float(row[1]), 2) for row in rows],
+        min=[row[2] for row in rows],
+        max=[row[3] for row in rows],
+        n=[row[4] for row in rows],
+    )
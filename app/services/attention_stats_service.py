@@ -0,0 +1,200 @@
+"""Attention distributions per class and school, computed with NumPy.
+
+Entry attention is fetched in bulk as plain tuples (two Core queries) and
+reduced with vectorized NumPy calls: percentiles, histogram, standard
+deviation, and per-student means for the share of students under a threshold.
+
+Results are cached as serialized responses per (class|school, id, query).
+Report writes publish ``class`` and ``school`` invalidations, which bump that
+entity's generation. Entries under older generations are never read again
+and age out of the LRU. When the invalidation listener reconnects, bumps may
+have been missed, so a global epoch (also part of the key) moves on and the
+cache is cleared; computations still in flight then store under a dead key.
+
+``numpy`` is imported lazily; without it the stats endpoints answer 501.
+"""
+
+from datetime import date
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CachedResponse, ResponseCache
+from app.core.config import settings
+from app.db.invalidation import invalidation_bus
+from app.models.attention_entry import AttentionEntry
+from app.models.lesson_report import LessonReport
+from app.models.unrecognized_entry import UnrecognizedEntry
+from app.schemas.attention import AttentionHistogram, AttentionStatsResponse
+
+Scope = Literal["class", "school"]
+
+MAX_BINS = 100
+
+stats_cache = ResponseCache(
+    "attention_stats",
+    max_bytes=settings.ATTENTION_STATS_CACHE_MAX_BYTES,
+    ttl_seconds=settings.ATTENTION_STATS_CACHE_TTL_SECONDS,
+)
+_generations: dict[tuple[Scope, int], int] = {}
+_epoch = 0
+
+
+def _bump(scope: Scope, key: str) -> None:
+    owner = (scope, int(key))
+    _generations[owner] = _generations.get(owner, 0) + 1
+
+
+def _flush() -> None:
+    global _epoch
+    _epoch += 1
+    stats_cache.clear()
+
+
+invalidation_bus.subscribe("class", lambda key: _bump("class", key), _flush)
+invalidation_bus.subscribe("school", lambda key: _bump("school", key))
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise HTTPException(
+            status_code=501, detail="Attention statistics require numpy to be installed"
+        )
+    return numpy
+
+
+def parse_bins(value: str) -> tuple[float, ...]:
+    """Histogram edges from ``bins``: a bin count over 0–100, or explicit edges.
+
+    ``"10"`` gives ten equal bins; ``"0,40,60,80,100"`` gives four custom ones.
+
+    Raises:
+        HTTPException 400 if the value is not a valid count or increasing edges.
+    """
+    try:
+        parts = [float(p) for p in value.split(",") if p.strip()]
+    except ValueError:
+        parts = []
+    if len(parts) == 1 and parts[0].is_integer() and 1 <= parts[0] <= MAX_BINS:
+        count = int(parts[0])
+        return tuple(100 * i / count for i in range(count + 1))
+    if 2 <= len(parts) <= MAX_BINS + 1 and all(a < b for a, b in zip(parts, parts[1:])):
+        return tuple(parts)
+    raise HTTPException(
+        status_code=400,
+        detail=f"bins must be a count from 1 to {MAX_BINS} or increasing comma-separated edges",
+    )
+
+
+async def _fetch_attention(
+    db: AsyncSession,
+    scope: Scope,
+    owner_id: int,
+    date_from: date | None,
+    date_to: date | None,
+) -> tuple[list[tuple[int, int]], list[int]]:
+    """``(student_id, attention)`` of recognized entries and attention of unrecognized ones."""
+    owner = LessonReport.class_id if scope == "class" else LessonReport.school_id
+    conditions = [owner == owner_id]
+    if date_from is not None:
+        conditions.append(LessonReport.lesson_date >= date_from)
+    if date_to is not None:
+        conditions.append(LessonReport.lesson_date <= date_to)
+
+    recognized = await db.execute(
+        select(AttentionEntry.student_id, AttentionEntry.attention)
+        .join(LessonReport, LessonReport.id == AttentionEntry.report_id)
+        .where(*conditions)
+    )
+    unrecognized = await db.execute(
+        select(UnrecognizedEntry.attention)
+        .join(LessonReport, LessonReport.id == UnrecognizedEntry.report_id)
+        .where(*conditions)
+    )
+    return recognized.tuples().all(), unrecognized.scalars().all()
+
+
+def _compute(
+    np: Any,
+    recognized: list[tuple[int, int]],
+    unrecognized: list[int],
+    edges: tuple[float, ...],
+    threshold: float,
+) -> dict[str, Any]:
+    pairs = np.array(recognized, dtype=np.int64).reshape(-1, 2)
+    attention = np.concatenate([pairs[:, 1], np.array(unrecognized, dtype=np.int64)])
+    counts, _ = np.histogram(attention, bins=np.array(edges))
+    stats: dict[str, Any] = {
+        "entries_count": int(attention.size),
+        "students_count": 0,
+        "mean": None,
+        "std": None,
+        "p10": None,
+        "p50": None,
+        "p90": None,
+        "histogram": AttentionHistogram(edges=list(edges), counts=counts.tolist()),
+        "share_entries_under_threshold": None,
+        "share_students_under_threshold": None,
+    }
+    if attention.size:
+        p10, p50, p90 = np.percentile(attention, [10, 50, 90])
+        stats.update(
+            mean=round(float(attention.mean()), 2),
+            std=round(float(attention.std()), 2),
+            p10=round(float(p10), 2),
+            p50=round(float(p50), 2),
+            p90=round(float(p90), 2),
+            share_entries_under_threshold=round(float((attention < threshold).mean()), 4),
+        )
+    if len(pairs):
+        # Mean attention per recognized student over the range
+        _, student_index = np.unique(pairs[:, 0], return_inverse=True)
+        per_student = np.bincount(student_index, weights=pairs[:, 1]) / np.bincount(student_index)
+        stats.update(
+            students_count=int(per_student.size),
+            share_students_under_threshold=round(float((per_student < threshold).mean()), 4),
+        )
+    return stats
+
+
+async def get_attention_stats(
+    db: AsyncSession,
+    scope: Scope,
+    owner_id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    bins: str = "10",
+    threshold: float = 50,
+) -> CachedResponse:
+    """Serialized ``AttentionStatsResponse`` for a class or school, cached.
+
+    The caller checks that the class or school exists.
+
+    Raises:
+        HTTPException 400 for invalid ``bins``, 501 if numpy is not installed.
+    """
+    np = _numpy()
+    edges = parse_bins(bins)
+    generation = _generations.get((scope, owner_id), 0)
+    key = (_epoch, scope, owner_id, generation, date_from, date_to, edges, threshold)
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    version = stats_cache.version(key)
+    recognized, unrecognized = await _fetch_attention(db, scope, owner_id, date_from, date_to)
+    response = AttentionStatsResponse(
+        scope=scope,
+        id=owner_id,
+        date_from=date_from,
+        date_to=date_to,
+        threshold=threshold,
+        **_compute(np, recognized, unrecognized, edges, threshold),
+    )
+    cached = CachedResponse.from_body(response.model_dump_json().encode())
+    stats_cache.set(key, cached, version)
+    return cached
@@ -1,9 +1,19 @@
+from collections.abc import AsyncIterator, Mapping
+
 from fastapi import HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.db.listing import count_rows, fetch_page, stream_ndjson
+from app.db.rows import ClassRoomRow, ClassRoomStatsRow, project
+from app.db.upsert import insert_on_conflict_do_nothing
+from app.models.class_latest_report import ClassLatestReport
 from app.models.class_room import ClassRoom
+from app.models.lesson_report import LessonReport
+from app.models.student import Student
 from app.schemas.class_room import ClassRoomCreate, ClassRoomUpdate
+from app.services.report_cascade import forget_reports
+from app.utils.cursor import parse_int_key
 
 
 async def create_class(db: AsyncSession, data: ClassRoomCreate) -> ClassRoom:
@@ -17,13 +27,75 @@ async def create_class(db: AsyncSession, data: ClassRoomCreate) -> ClassRoom:
     return classroom
 
 
-async def get_classes(db: AsyncSession, school_id: int | None = None) -> list[ClassRoom]:
-    stmt = select(ClassRoom)
+def _classes_query(school_id: int | None, with_stats: bool) -> tuple[Select, type[ClassRoomRow]]:
+    table = ClassRoom.__table__
+    stmt = project(ClassRoomRow, table)
+    row_type = ClassRoomRow
+    if with_stats:
+        students_count = (
+            select(func.count()).where(Student.class_id == table.c.id).scalar_subquery()
+        )
+        reports_count = (
+            select(func.count()).where(LessonReport.class_id == table.c.id).scalar_subquery()
+        )
+        # Average attention of the class's latest report, via its pointer row
+        latest_attention = (
+            select(LessonReport.avg_attention)
+            .join(ClassLatestReport, ClassLatestReport.report_id == LessonReport.id)
+            .where(ClassLatestReport.class_id == table.c.id)
+            .scalar_subquery()
+        )
+        stmt = stmt.add_columns(students_count, reports_count, latest_attention)
+        row_type = ClassRoomStatsRow
     if school_id is not None:
-        stmt = stmt.where(ClassRoom.school_id == school_id)
-    stmt = stmt.order_by(ClassRoom.created_at.desc())
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+        stmt = stmt.where(table.c.school_id == school_id)
+    return stmt, row_type
+
+
+async def get_classes(
+    db: AsyncSession,
+    school_id: int | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool = True,
+    with_stats: bool = False,
+) -> tuple[list[ClassRoomRow], int | None, str | None]:
+    """Return a page of classes, newest first (see ``get_lesson_reports``).
+
+    ``with_stats`` adds each class's ``students_count``, ``reports_count`` and
+    the average attention of its latest report, computed in the same query.
+
+    Returns ``(classes, total, next_cursor)``.
+    """
+    stmt, row_type = _classes_query(school_id, with_stats)
+    total = await count_rows(db, stmt) if include_total else None
+    table = ClassRoom.__table__
+    classes, next_cursor = await fetch_page(
+        db,
+        stmt,
+        row_type,
+        created_at=table.c.created_at,
+        key=table.c.id,
+        parse_key=parse_int_key,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    return classes, total, next_cursor
+
+
+def stream_classes(
+    session_factory: async_sessionmaker[AsyncSession],
+    school_id: int | None = None,
+    with_stats: bool = False,
+    batch_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Every matching class as NDJSON, newest first."""
+    stmt, row_type = _classes_query(school_id, with_stats)
+    table = ClassRoom.__table__
+    stmt = stmt.order_by(table.c.created_at.desc(), table.c.id.desc())
+    return stream_ndjson(session_factory, stmt, row_type, batch_size)
 
 
 async def get_class(db: AsyncSession, class_id: int) -> ClassRoom:
@@ -45,17 +117,23 @@ async def update_class(db: AsyncSession, class_id: int, data: ClassRoomUpdate) -
 
 async def delete_class(db: AsyncSession, class_id: int) -> None:
     classroom = await get_class(db, class_id)
+    # Its reports go with it
+    await forget_reports(db, LessonReport.class_id == class_id)
     await db.delete(classroom)
     await db.flush()
 
 
-async def get_or_create_class(
-    db: AsyncSession, class_id: int, school_id: int, class_index: str
-) -> ClassRoom:
-    """Get classroom or create a stub."""
-    classroom = await db.get(ClassRoom, class_id)
-    if not classroom:
-        classroom = ClassRoom(id=class_id, school_id=school_id, class_index=class_index)
-        db.add(classroom)
-        await db.flush()
-    return classroom
+async def ensure_classes(db: AsyncSession, classes: Mapping[int, tuple[int, str]]) -> None:
+    """Create stub classrooms for ids that don't exist yet.
+
+    ``classes`` maps ``class_id`` to ``(school_id, class_index)``.
+    """
+    if not classes:
+        return
+    result = await db.execute(select(ClassRoom.id).where(ClassRoom.id.in_(classes.keys())))
+    missing = set(classes) - set(result.scalars().all())
+    rows = [
+        {"id": class_id, "school_id": classes[class_id][0], "class_index": classes[class_id][1]}
+        for class_id in sorted(missing)
+    ]
+    await insert_on_conflict_do_nothing(db, ClassRoom, rows)
@@ -0,0 +1,270 @@
+"""Columnar (Arrow IPC / Parquet) exports of attention entries.
+
+Uses the same rows and server-side cursor as the CSV/NDJSON exports. Each
+cursor batch becomes one Arrow record batch, which is a Parquet row group when
+writing Parquet, so memory stays bounded by ``batch_size``. Building and
+encoding a batch (including compression) runs in a worker thread, so the event
+loop keeps serving other requests meanwhile.
+
+``pyarrow`` is imported lazily. The rest of the API works without it, and
+these exports answer 501 when it is missing.
+"""
+
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Literal, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.logging import logger
+from app.services.export_service import EXPORT_COLUMNS, ExportFilters, stream_attention_batches
+
+ColumnarFormat = Literal["arrow", "parquet"]
+T = TypeVar("T")
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=501, detail="Columnar exports require pyarrow to be installed"
+        )
+    return pyarrow
+
+
+def _schema(pa: Any) -> Any:
+    types = {
+        "report_id": pa.string(),
+        "school_id": pa.int32(),
+        "class_id": pa.int32(),
+        "class_index": pa.string(),
+        "lesson_date": pa.date32(),
+        "lesson_time": pa.time64("us"),
+        "student_id": pa.int32(),
+        "student_name": pa.string(),
+        "attention": pa.int16(),
+        "inattention": pa.int16(),
+    }
+    return pa.schema([(name, types[name]) for name in EXPORT_COLUMNS])
+
+
+def _record_batch(pa: Any, schema: Any, rows: Sequence[Row]) -> Any:
+    columns = [list(column) for column in zip(*rows)] or [[] for _ in EXPORT_COLUMNS]
+    # UUIDs as their canonical string, which pandas and SQL engines read as-is
+    columns[0] = [str(value) for value in columns[0]]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+class _ChunkSink:
+    """Write-only file object that collects what the writer emits until drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _open_writer(pa: Any, sink: Any, schema: Any, fmt: ColumnarFormat) -> Any:
+    if fmt == "parquet":
+        return pa.parquet.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+    return pa.ipc.new_stream(sink, schema)
+
+
+def _encode_batch(
+    pa: Any, schema: Any, writer: Any, sink: _ChunkSink, rows: Sequence[Row]
+) -> bytes:
+    """Write ``rows`` as one record batch and return the bytes emitted so far. Blocking."""
+    writer.write_batch(_record_batch(pa, schema, rows))
+    return sink.drain()
+
+
+async def _in_thread(func: Callable[..., T], *args: Any) -> T:
+    """Run blocking writer work in a thread.
+
+    If the caller is cancelled (e.g. the client disconnects), wait for the
+    thread to finish before re-raising, so cleanup never closes a writer that
+    is still in use.
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+
+# ── Streaming download ──────────────────────────────────────────────────────
+def export_attention_columnar(
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    batch_size: int,
+    fmt: ColumnarFormat,
+) -> AsyncIterator[bytes]:
+    """Stream the attention export as an Arrow IPC stream or a Parquet file.
+
+    Raises:
+        HTTPException 501 if pyarrow is not installed (before anything is sent).
+    """
+    pa = _pyarrow()
+    return _stream_columnar(pa, session_factory, filters, batch_size, fmt)
+
+
+async def _stream_columnar(
+    pa: Any,
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    batch_size: int,
+    fmt: ColumnarFormat,
+) -> AsyncIterator[bytes]:
+    schema = _schema(pa)
+    sink = _ChunkSink()
+    writer = _open_writer(pa, sink, schema, fmt)
+    try:
+        async for rows in stream_attention_batches(session_factory, filters, batch_size):
+            chunk = await _in_thread(_encode_batch, pa, schema, writer, sink, rows)
+            if chunk:
+                yield chunk
+        await _in_thread(writer.close)
+    except BaseException:
+        writer.close()
+        raise
+    yield sink.drain()
+
+
+# ── Partitioned files ───────────────────────────────────────────────────────
+def partition_dir(root: Path, school_id: int, lesson_date: date) -> Path:
+    """Hive-style partition directory: ``school_id=<id>/month=<YYYY-MM>``."""
+    return root / f"school_id={school_id}" / f"month={lesson_date:%Y-%m}"
+
+
+async def write_attention_partitions(
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    root: Path,
+    batch_size: int,
+    fmt: ColumnarFormat = "parquet",
+) -> list[Path]:
+    """Write the export under ``root``, one file per school and month.
+
+    ``school_id`` and ``month`` are only in the directory names, so reading
+    ``root`` as a Hive-partitioned dataset restores them as columns.
+
+    Rows arrive ordered by school and lesson date, so only one partition file
+    is open at a time. Each cursor batch is split, encoded and written in a
+    worker thread. Each file is written next to its final name and renamed
+    into place when complete. Re-running an export replaces the partitions it
+    covers and leaves the others alone. A file must therefore hold every row of
+    its partition: only ``school_id`` and whole-month date bounds are accepted.
+
+    Returns the written files.
+
+    Raises:
+        HTTPException 400 for a class filter or dates that cut a month,
+        501 if pyarrow is not installed.
+    """
+    _check_whole_partitions(filters)
+    pa = _pyarrow()
+    schema = _schema(pa)
+    # Stored in the directory name, as Hive partitioning expects
+    file_schema = schema.remove(schema.get_field_index("school_id"))
+    suffix = ".parquet" if fmt == "parquet" else ".arrow"
+    written: list[Path] = []
+    current: tuple[Path, Path] | None = None
+    writer = None
+
+    def finish() -> None:
+        nonlocal writer
+        if writer is None:
+            return
+        writer.close()
+        writer = None
+        tmp_path, final_path = current
+        os.replace(tmp_path, final_path)
+        written.append(final_path)
+        logger.info("Wrote %s", final_path)
+
+    def write_rows(rows: Sequence[Row]) -> None:
+        nonlocal current, writer
+        # Split the batch wherever the (school, month) partition changes
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i < len(rows) and _partition_key(rows[i]) == _partition_key(rows[start]):
+                continue
+            directory = partition_dir(root, rows[start].school_id, rows[start].lesson_date)
+            final_path = directory / f"part-0{suffix}"
+            if current is None or current[1] != final_path:
+                finish()
+                directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = directory / f".part-0{suffix}.{uuid.uuid4().hex}.tmp"
+                current = (tmp_path, final_path)
+                writer = _open_writer(pa, str(tmp_path), file_schema, fmt)
+            batch = _record_batch(pa, schema, rows[start:i])
+            writer.write_batch(batch.drop_columns(["school_id"]))
+            start = i
+
+    try:
+        async for rows in stream_attention_batches(
+            session_factory, filters, batch_size, by_school=True
+        ):
+            await _in_thread(write_rows, rows)
+        await _in_thread(finish)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            Path(current[0]).unlink(missing_ok=True)
+        raise
+    return written
+
+
+def _check_whole_partitions(filters: ExportFilters) -> None:
+    if filters.class_id is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="Partitioned exports cover whole schools; class_id is not supported",
+        )
+    if filters.date_from is not None and filters.date_from.day != 1:
+        raise HTTPException(
+            status_code=400, detail="date_from must be the first day of a month"
+        )
+    if filters.date_to is not None and (filters.date_to + timedelta(days=1)).day != 1:
+        raise HTTPException(status_code=400, detail="date_to must be the last day of a month")
+
+
+def _partition_key(row: Row) -> tuple[int, int, int]:
+    return row.school_id, row.lesson_date.year, row.lesson_date.month
@@ -0,0 +1,133 @@
+"""Streaming exports of attention entries.
+
+Rows come from a server-side cursor (``AsyncSession.stream`` with
+``yield_per``). Each batch is encoded and handed to the response before the
+next one is fetched, so memory use depends on ``batch_size`` and not on how
+many rows the export holds.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from pydantic_core import to_json
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.attention_entry import AttentionEntry
+from app.models.lesson_report import LessonReport
+from app.models.student import Student
+
+EXPORT_COLUMNS = (
+    "report_id",
+    "school_id",
+    "class_id",
+    "class_index",
+    "lesson_date",
+    "lesson_time",
+    "student_id",
+    "student_name",
+    "attention",
+    "inattention",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ExportFilters:
+    school_id: int | None = None
+    class_id: int | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+
+
+def _attention_query(filters: ExportFilters, by_school: bool = False) -> Select:
+    stmt = (
+        select(
+            LessonReport.id,
+            LessonReport.school_id,
+            LessonReport.class_id,
+            LessonReport.class_index,
+            LessonReport.lesson_date,
+            LessonReport.lesson_time,
+            AttentionEntry.student_id,
+            Student.full_name,
+            AttentionEntry.attention,
+            AttentionEntry.inattention,
+        )
+        .join(LessonReport, LessonReport.id == AttentionEntry.report_id)
+        .join(Student, Student.id == AttentionEntry.student_id)
+    )
+    if filters.school_id is not None:
+        stmt = stmt.where(LessonReport.school_id == filters.school_id)
+    if filters.class_id is not None:
+        stmt = stmt.where(LessonReport.class_id == filters.class_id)
+    if filters.date_from is not None:
+        stmt = stmt.where(LessonReport.lesson_date >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(LessonReport.lesson_date <= filters.date_to)
+    order = [LessonReport.lesson_date, LessonReport.lesson_time, LessonReport.id]
+    if by_school:
+        order.insert(0, LessonReport.school_id)
+    return stmt.order_by(*order)
+
+
+async def stream_attention_batches(
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    batch_size: int,
+    by_school: bool = False,
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield export rows (``EXPORT_COLUMNS``) in batches of up to ``batch_size``.
+
+    ``by_school`` orders by school first, so each school's rows are contiguous.
+    """
+    async with session_factory() as db:
+        stmt = _attention_query(filters, by_school).execution_options(yield_per=batch_size)
+        result = await db.stream(stmt)
+        async for batch in result.partitions():
+            yield batch
+
+
+def _encode_csv(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _encode_ndjson(rows: Sequence[Row]) -> bytes:
+    return b"".join(to_json(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in rows)
+
+
+async def _export(
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    batch_size: int,
+    encode: Callable[[Sequence[Row]], bytes],
+    header: bytes = b"",
+) -> AsyncIterator[bytes]:
+    if header:
+        yield header
+    async for batch in stream_attention_batches(session_factory, filters, batch_size):
+        yield encode(batch)
+
+
+def export_attention_csv(
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """CSV with a header row and one line per recognized attention entry."""
+    header = _encode_csv([EXPORT_COLUMNS])
+    return _export(session_factory, filters, batch_size, _encode_csv, header)
+
+
+def export_attention_ndjson(
+    session_factory: async_sessionmaker[AsyncSession],
+    filters: ExportFilters,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """One JSON object per recognized attention entry."""
+    return _export(session_factory, filters, batch_size, _encode_ndjson)
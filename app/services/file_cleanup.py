@@ -0,0 +1,93 @@
+"""Background removal of image files and report directories.
+
+Deletes and updates only decide *what* to remove; the removal itself is
+scheduled after commit (see ``app.db.hooks``) and runs here, off the request
+path, with bounded concurrency and retries. This matters on network-mounted
+volumes, where a single ``rmtree`` can take seconds.
+"""
+
+import asyncio
+import shutil
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.utils.images import run_io, unlink_if_unused
+
+
+class FileCleaner:
+    def __init__(self, concurrency: int, retries: int, retry_delay: float) -> None:
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(
+        self, files: Iterable[Path] = (), dirs: Iterable[Path] = (), blobs: Iterable[Path] = ()
+    ) -> None:
+        """Remove files, directory trees and unused blobs in the background.
+
+        Must be called from the event loop thread (after-commit callbacks are).
+        """
+        files, dirs, blobs = list(files), list(dirs), list(blobs)
+        if not files and not dirs and not blobs:
+            return
+        task = asyncio.get_running_loop().create_task(self.remove(files, dirs, blobs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def remove(
+        self, files: Iterable[Path] = (), dirs: Iterable[Path] = (), blobs: Iterable[Path] = ()
+    ) -> int:
+        """Remove files and directory trees now; return how many could not be removed.
+
+        ``blobs`` are skipped if they were used within ``IMAGE_GC_GRACE_SECONDS``
+        by the time they are removed (an upload may have reused them meanwhile).
+        """
+        results = await asyncio.gather(
+            *(self._remove_one(_unlink, path) for path in files),
+            *(self._remove_one(_rmtree, path) for path in dirs),
+            *(self._remove_one(_unlink_blob, path) for path in blobs),
+        )
+        return results.count(False)
+
+    async def drain(self) -> None:
+        """Wait for all scheduled removals (used on shutdown and in tests)."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _remove_one(self, func: Callable[[Path], None], path: Path) -> bool:
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    await run_io(func, path)
+                return True
+            except OSError as exc:
+                if attempt == self.retries:
+                    logger.warning("Giving up removing %s: %s", path, exc)
+                    return False
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+        return False
+
+
+def _unlink(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+def _unlink_blob(path: Path) -> None:
+    unlink_if_unused(path, settings.IMAGE_GC_GRACE_SECONDS)
+
+
+def _rmtree(path: Path) -> None:
+    try:
+        shutil.rmtree(path)
+    except FileNotFoundError:
+        pass
+
+
+file_cleaner = FileCleaner(
+    concurrency=settings.FILE_CLEANUP_CONCURRENCY,
+    retries=settings.FILE_CLEANUP_RETRIES,
+    retry_delay=settings.FILE_CLEANUP_RETRY_DELAY_SECONDS,
+)
@@ -0,0 +1,205 @@
+"""Image store maintenance: blob reference lookups and garbage collection.
+
+Blobs live under ``IMAGES_DIR/blobs/ab/cd/<sha256><ext>`` and may be shared by
+any number of entries, so a blob can only be removed once no row in
+``attention_entries`` / ``unrecognized_entries`` references its hash.
+Per-report images live in ``IMAGES_DIR/<report_id>/`` and are orphaned when a
+report's transaction rolls back after its images were written.
+"""
+
+import asyncio
+import os
+import re
+import time
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+
+from sqlalchemy import select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.attention_entry import AttentionEntry
+from app.models.lesson_report import LessonReport
+from app.models.unrecognized_entry import UnrecognizedEntry
+from app.services.file_cleanup import file_cleaner
+from app.utils.images import BLOBS_DIR, run_io, unlink_if_unused
+
+# Keep ``IN (...)`` lists well below driver parameter limits
+_LOOKUP_CHUNK_SIZE = 1000
+
+BLOB_NAME_RE = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+$")
+# Per-report images are named "<uuid4 hex><ext>"
+REPORT_IMAGE_NAME_RE = re.compile(r"^([0-9a-f]{32})\.[a-z0-9]+$")
+# Staging area of in-flight multipart uploads
+INCOMING_DIR = ".incoming"
+
+
+async def referenced_blobs(db: AsyncSession, sha256s: Iterable[str]) -> set[str]:
+    """Return the subset of ``sha256s`` still referenced by any entry."""
+    pending = list(dict.fromkeys(sha256s))
+    found: set[str] = set()
+    for start in range(0, len(pending), _LOOKUP_CHUNK_SIZE):
+        chunk = pending[start : start + _LOOKUP_CHUNK_SIZE]
+        stmt = union(
+            select(AttentionEntry.image_sha256).where(AttentionEntry.image_sha256.in_(chunk)),
+            select(UnrecognizedEntry.image_sha256).where(
+                UnrecognizedEntry.image_sha256.in_(chunk)
+            ),
+        )
+        found.update((await db.execute(stmt)).scalars())
+    return found
+
+
+def skip_recently_used(paths: list[Path], grace_seconds: int | None = None) -> list[Path]:
+    """Keep only files not modified within the GC grace period.
+
+    A blob that was just written (or re-used, which refreshes its mtime) may
+    belong to an upload whose rows are not committed yet. Blocking; run it
+    through ``run_io``.
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.IMAGE_GC_GRACE_SECONDS
+    cutoff = time.time() - grace_seconds
+    old: list[Path] = []
+    for path in paths:
+        try:
+            if path.stat().st_mtime <= cutoff:
+                old.append(path)
+        except FileNotFoundError:
+            pass
+    return old
+
+
+async def collect_garbage(
+    db: AsyncSession, grace_seconds: int | None = None, dry_run: bool = False
+) -> tuple[int, int]:
+    """Remove blobs that no entry references.
+
+    The store is walked one top-level shard at a time so memory stays bounded
+    on large stores. Leftover temp files from interrupted writes are removed
+    as well. Returns ``(scanned, removed)``.
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.IMAGE_GC_GRACE_SECONDS
+    root = settings.IMAGES_DIR / BLOBS_DIR
+    scanned = removed = 0
+    for shard in await run_io(_list_shards, root):
+        blobs, stale = await run_io(_scan_shard, shard, grace_seconds)
+        scanned += len(blobs)
+        still_used = await referenced_blobs(db, blobs.keys())
+        orphans = [path for sha, path in blobs.items() if sha not in still_used]
+        if dry_run:
+            removed += len(orphans)
+        else:
+            removed += sum(await _remove_unused(orphans, grace_seconds))
+            await _remove_unused(stale, grace_seconds)
+    stale_tmp = await run_io(_stale_temp_files, root, grace_seconds)
+    if not dry_run:
+        await _remove_unused(stale_tmp, grace_seconds)
+    logger.info(
+        "Image GC%s: scanned %d blobs, %s %d",
+        " (dry run)" if dry_run else "",
+        scanned,
+        "would remove" if dry_run else "removed",
+        removed,
+    )
+    return scanned, removed
+
+
+async def sweep_report_dirs(
+    db: AsyncSession, grace_seconds: int | None = None, dry_run: bool = False
+) -> tuple[int, int]:
+    """Remove per-report image directories whose report no longer exists.
+
+    Directories are checked against ``lesson_reports`` in batches. Ones
+    modified within the grace period are skipped, since their report may not
+    be committed yet; abandoned multipart staging directories are removed
+    too. Returns ``(scanned, removed)``.
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.IMAGE_GC_GRACE_SECONDS
+    candidates = await run_io(_report_dir_candidates, settings.IMAGES_DIR, grace_seconds)
+    orphans: list[Path] = []
+    for start in range(0, len(candidates), _LOOKUP_CHUNK_SIZE):
+        chunk = dict(candidates[start : start + _LOOKUP_CHUNK_SIZE])
+        result = await db.execute(select(LessonReport.id).where(LessonReport.id.in_(chunk)))
+        existing = set(result.scalars())
+        orphans.extend(path for report_id, path in chunk.items() if report_id not in existing)
+    staging = await run_io(
+        _old_subdirs, settings.IMAGES_DIR / INCOMING_DIR, grace_seconds
+    )
+    if not dry_run:
+        await file_cleaner.remove(dirs=orphans + staging)
+    logger.info(
+        "Image sweep%s: scanned %d report dirs, %s %d",
+        " (dry run)" if dry_run else "",
+        len(candidates),
+        "would remove" if dry_run else "removed",
+        len(orphans),
+    )
+    return len(candidates), len(orphans)
+
+
+# ── Filesystem walking (blocking, run in the image I/O pool) ────────────────
+def _list_shards(root: Path) -> list[Path]:
+    if not root.is_dir():
+        return []
+    return sorted(p for p in root.iterdir() if p.is_dir())
+
+
+async def _remove_unused(paths: list[Path], grace_seconds: int) -> list[bool]:
+    """Unlink files that are still outside the grace period at removal time."""
+    return await asyncio.gather(*(run_io(unlink_if_unused, p, grace_seconds) for p in paths))
+
+
+def _scan_shard(shard: Path, grace_seconds: int) -> tuple[dict[str, Path], list[Path]]:
+    """Return ``({sha256: path}, stale_temp_files)`` for GC candidates in a shard."""
+    cutoff = time.time() - grace_seconds
+    blobs: dict[str, Path] = {}
+    stale: list[Path] = []
+    for dirpath, _, filenames in os.walk(shard):
+        for name in filenames:
+            path = Path(dirpath) / name
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if match := BLOB_NAME_RE.match(name):
+                blobs[match.group(1)] = path
+            elif name.endswith(".tmp"):
+                stale.append(path)
+    return blobs, stale
+
+
+def _stale_temp_files(root: Path, grace_seconds: int) -> list[Path]:
+    if not root.is_dir():
+        return []
+    return skip_recently_used(list(root.glob(".*.tmp")), grace_seconds)
+
+
+def _report_dir_candidates(root: Path, grace_seconds: int) -> list[tuple[uuid.UUID, Path]]:
+    candidates = []
+    for path in _old_subdirs(root, grace_seconds):
+        try:
+            candidates.append((uuid.UUID(path.name), path))
+        except ValueError:
+            continue  # blobs/, .incoming/ and anything else not named by report id
+    return candidates
+
+
+def _old_subdirs(root: Path, grace_seconds: int) -> list[Path]:
+    if not root.is_dir():
+        return []
+    cutoff = time.time() - grace_seconds
+    found = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime <= cutoff:
+                    found.append(Path(entry.path))
+            except FileNotFoundError:
+                continue
+    return found
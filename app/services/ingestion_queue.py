@@ -0,0 +1,152 @@
+"""Write-behind ingestion: queue validated reports and persist them in batches.
+
+Requests on ``POST /lesson-reports/async`` only validate the payload and put it
+on a bounded in-process queue, so they never hold a pool connection. A single
+background worker (started from the app ``lifespan``) drains the queue and
+writes coalesced batches through ``lesson_report_service.create_lesson_reports``.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.schemas.lesson_report import LessonReportCreate
+from app.services import lesson_report_service
+
+# How many failed report ids to remember for the status endpoint
+_FAILED_HISTORY_SIZE = 10_000
+
+
+class IngestionQueue:
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[tuple[uuid.UUID, LessonReportCreate]] | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._worker: asyncio.Task | None = None
+        self._pending: set[uuid.UUID] = set()
+        self._failed: OrderedDict[uuid.UUID, str] = OrderedDict()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start the background worker; the queue is created on the running loop."""
+        if self.running:
+            return
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._worker = asyncio.create_task(self._run(), name="ingestion-queue-worker")
+        logger.info(
+            "Ingestion queue started (maxsize=%d, batch_size=%d, flush_interval=%.2fs)",
+            self.maxsize,
+            self.batch_size,
+            self.flush_interval,
+        )
+
+    async def stop(self) -> None:
+        """Persist everything still queued, then stop the worker."""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info("Ingestion queue stopped")
+
+    async def join(self) -> None:
+        """Wait until every queued report has been written (or has failed)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def submit(self, data: LessonReportCreate) -> uuid.UUID:
+        """Queue a validated report and return its pre-assigned id.
+
+        Raises:
+            RuntimeError if the worker is not running.
+            asyncio.QueueFull if the queue is at capacity.
+        """
+        if not self.running:
+            raise RuntimeError("Ingestion queue is not running")
+        report_id = data.id or uuid.uuid4()
+        self._queue.put_nowait((report_id, data))
+        self._pending.add(report_id)
+        return report_id
+
+    def is_pending(self, report_id: uuid.UUID) -> bool:
+        return report_id in self._pending
+
+    def failure(self, report_id: uuid.UUID) -> str | None:
+        """Return the error message if the report could not be persisted."""
+        return self._failed.get(report_id)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            except Exception:
+                logger.exception("Ingestion queue flush crashed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[tuple[uuid.UUID, LessonReportCreate]]) -> None:
+        try:
+            await self._write(batch)
+        except Exception:
+            if len(batch) == 1:
+                self._mark_failed(batch)
+                return
+            # Isolate the offending report(s) so the rest of the batch still lands
+            logger.warning("Batch of %d reports failed, retrying one by one", len(batch))
+            for item in batch:
+                try:
+                    await self._write([item])
+                except Exception:
+                    self._mark_failed([item])
+        logger.debug("Ingestion queue flushed %d reports", len(batch))
+
+    async def _write(self, batch: list[tuple[uuid.UUID, LessonReportCreate]]) -> None:
+        async with self._session_factory() as db:
+            try:
+                await lesson_report_service.create_lesson_reports(db, batch)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        self._pending.difference_update(report_id for report_id, _ in batch)
+
+    def _mark_failed(self, batch: list[tuple[uuid.UUID, LessonReportCreate]]) -> None:
+        for report_id, _ in batch:
+            logger.exception("Failed to persist queued lesson report %s", report_id)
+            self._pending.discard(report_id)
+            self._failed[report_id] = "Report could not be persisted"
+            if len(self._failed) > _FAILED_HISTORY_SIZE:
+                self._failed.popitem(last=False)
+
+
+ingestion_queue = IngestionQueue(
+    maxsize=settings.INGEST_QUEUE_MAX_SIZE,
+    batch_size=settings.INGEST_BATCH_SIZE,
+    flush_interval=settings.INGEST_FLUSH_INTERVAL_SECONDS,
+)
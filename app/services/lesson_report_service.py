@@ -1,88 +1,414 @@
-import shutil
+import asyncio
 import uuid
-from datetime import date
+from collections.abc import Awaitable, Iterable, Mapping
+from dataclasses import fields as dataclass_fields
+from datetime import date, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, delete as sa_delete
+from sqlalchemy import select, insert, tuple_, update, delete as sa_delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import ResponseCache
+from app.db.hooks import after_commit
+from app.db.invalidation import invalidation_bus
+from app.db.listing import count_rows, fetch_page
+from app.db.rows import (
+    AttentionEntryRow,
+    LessonReportRow,
+    LessonReportSummaryRow,
+    UnrecognizedEntryRow,
+    project,
+    to_rows,
+)
+from app.db.upsert import dialect_insert
+from app.models.class_latest_report import ClassLatestReport
 from app.models.lesson_report import LessonReport
 from app.models.attention_entry import AttentionEntry
 from app.models.unrecognized_entry import UnrecognizedEntry
-from app.schemas.lesson_report import LessonReportCreate, LessonReportUpdate
-from app.services.school_service import get_or_create_school
-from app.services.class_service import get_or_create_class
-from app.services.student_service import get_or_create_student
-from app.utils.images import save_image, get_report_image_dir
+from app.schemas.lesson_report import (
+    LessonReportCreate,
+    LessonReportUpdate,
+    StudentEntryCreate,
+    UnrecognizedEntryCreate,
+)
+from app.services.school_service import ensure_schools
+from app.services.class_service import ensure_classes
+from app.services.student_service import ensure_students
+from app.services import image_service, rollup_service
+from app.services.file_cleanup import file_cleaner
+from app.utils.images import (
+    ImageWrite,
+    blob_path,
+    discard_images,
+    image_extension,
+    run_io,
+    write_images,
+)
+from app.utils.multipart import StagedImage
 from app.core.config import settings
 from app.core.logging import logger
 
+# Serialized GET /classes/{id}/lesson-reports/latest responses, keyed by class id
+latest_report_cache = ResponseCache(
+    "latest_report",
+    max_bytes=settings.LATEST_REPORT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.LATEST_REPORT_CACHE_TTL_SECONDS,
+)
+# Serialized GET /lesson-reports/{id} responses, keyed by report id. Any write
+# that changes a report or its entries must publish a "report" invalidation,
+# including deletes that cascade from schools, classes and students
+# (``report_cascade``); otherwise the old body is served until the TTL expires.
+report_cache = ResponseCache(
+    "report",
+    max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS,
+)
+invalidation_bus.subscribe(
+    "class", lambda key: latest_report_cache.invalidate(int(key)), latest_report_cache.clear
+)
+invalidation_bus.subscribe(
+    "report", lambda key: report_cache.invalidate(uuid.UUID(key)), report_cache.clear
+)
+
+
+def _plan_image(
+    row: dict,
+    image: str | None,
+    image_writes: list[ImageWrite],
+    staged_images: Mapping[str, StagedImage] | None,
+) -> None:
+    """Queue the write of an entry image and fill in what is known of its path.
+
+    ``image`` is base64 data, or the name of an uploaded part when
+    ``staged_images`` is given. Content-addressed paths are filled in by the
+    write itself once the bytes have been hashed.
+    """
+    row["image_path"] = row["image_sha256"] = None
+    if not image:
+        return
+    staged = staged_images[image] if staged_images is not None else None
+    extension = staged.extension if staged else image_extension(image)
+    write = ImageWrite(
+        row=row,
+        extension=extension,
+        image_b64=None if staged else image,
+        source=staged.path if staged else None,
+    )
+    if settings.IMAGE_STORAGE == "report_dir":
+        row["image_path"] = f"{uuid.uuid4().hex}{extension}"
+        write.path = settings.IMAGES_DIR / str(row["report_id"]) / row["image_path"]
+    image_writes.append(write)
+
+
+def _build_entry_rows(
+    report_id: uuid.UUID,
+    students: list[StudentEntryCreate],
+    unrecognized: list[UnrecognizedEntryCreate],
+    image_writes: list[ImageWrite],
+    staged_images: Mapping[str, StagedImage] | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Turn entry payloads into plain row dicts for multi-row INSERTs.
+
+    Images are not decoded here; their writes are appended to ``image_writes``.
+    """
+    attention_rows: list[dict] = []
+    for entry in students:
+        row = {
+            "id": uuid.uuid4(),
+            "report_id": report_id,
+            "student_id": entry.student_id,
+            "attention": entry.attention,
+            "inattention": 100 - entry.attention,
+        }
+        _plan_image(row, entry.image, image_writes, staged_images)
+        attention_rows.append(row)
+    unrecognized_rows: list[dict] = []
+    for entry in unrecognized:
+        row = {
+            "id": uuid.uuid4(),
+            "report_id": report_id,
+            "attention": entry.attention,
+            "inattention": 100 - entry.attention,
+        }
+        _plan_image(row, entry.image, image_writes, staged_images)
+        unrecognized_rows.append(row)
+    return attention_rows, unrecognized_rows
+
+
+async def _with_images(image_writes: list[ImageWrite], db_work: Awaitable[None]) -> None:
+    """Write images in the I/O pool while ``db_work`` runs other inserts.
+
+    If either side fails the other side's files are cleaned up, and the error
+    propagates so the caller's transaction is rolled back.
+    """
+    image_result, db_result = await asyncio.gather(
+        write_images(image_writes), db_work, return_exceptions=True
+    )
+    if isinstance(db_result, BaseException):
+        if not isinstance(image_result, BaseException):
+            await discard_images(image_writes)
+        raise db_result
+    if isinstance(image_result, BaseException):
+        raise image_result
 
-async def create_lesson_report(
-    db: AsyncSession, data: LessonReportCreate
-) -> LessonReport:
-    """Process a full lesson report from CV, save images, compute metrics."""
-    # Use server date if not provided
-    report_date = data.lesson_date or date.today()
-
-    # Auto-create school / classroom if they don't exist
-    await get_or_create_school(db, data.school_id)
-    await get_or_create_class(db, data.class_id, data.school_id, data.class_index)
-
-    # Create report
-    report_id = uuid.uuid4()
-    report = LessonReport(
-        id=report_id,
-        school_id=data.school_id,
-        class_id=data.class_id,
-        class_index=data.class_index,
-        lesson_date=report_date,
-        lesson_time=data.lesson_time,
-        students_count=data.students_count,
-        avg_attention=0.0,
-        avg_inattention=0.0,
+
+async def _insert_entries(
+    db: AsyncSession,
+    image_writes: list[ImageWrite],
+    attention_rows: list[dict],
+    unrecognized_rows: list[dict],
+) -> None:
+    """Insert entry rows once their images are written (and hashed)."""
+    try:
+        if attention_rows:
+            await db.execute(insert(AttentionEntry), attention_rows)
+        if unrecognized_rows:
+            await db.execute(insert(UnrecognizedEntry), unrecognized_rows)
+    except BaseException:
+        await discard_images(image_writes)
+        raise
+
+
+def _entry_images(report: LessonReport) -> list[tuple[str, str | None]]:
+    """``(image_path, image_sha256)`` of every entry image of a loaded report."""
+    return [
+        (e.image_path, e.image_sha256)
+        for e in [*report.attention_entries, *report.unrecognized_entries]
+        if e.image_path
+    ]
+
+
+async def _discard_entry_images(
+    db: AsyncSession,
+    report_id: uuid.UUID,
+    images: list[tuple[str, str | None]],
+    remove_report_dir: bool = False,
+) -> None:
+    """Schedule removal of image files of entries deleted in this transaction.
+
+    Files are only removed after the transaction commits, by the background
+    ``file_cleaner``. Content-addressed blobs are only removed when no other
+    entry references them and they were not touched within
+    ``IMAGE_GC_GRACE_SECONDS`` (a concurrent upload of the same bytes may be
+    about to reference them).
+    """
+    report_dir = settings.IMAGES_DIR / str(report_id)
+    files = [] if remove_report_dir else [report_dir / p for p, sha256 in images if not sha256]
+    blobs = {sha256: path for path, sha256 in images if sha256}
+    orphans: list[Path] = []
+    if blobs:
+        still_used = await image_service.referenced_blobs(db, blobs.keys())
+        orphans = [
+            blob_path(filename) for sha, filename in blobs.items() if sha not in still_used
+        ]
+        orphans = await run_io(image_service.skip_recently_used, orphans)
+    dirs = [report_dir] if remove_report_dir else []
+    # The cleaner checks the blobs' mtime again right before unlinking them
+    after_commit(db, partial(file_cleaner.submit, files, dirs, orphans))
+
+
+def _report_contribution(report: LessonReport, sign: int = 1) -> rollup_service.Contribution:
+    """Rollup contribution of a loaded report and its entries."""
+    return rollup_service.contribution(
+        report.school_id,
+        report.class_id,
+        report.lesson_date,
+        (e.attention for e in [*report.attention_entries, *report.unrecognized_entries]),
+        sign=sign,
     )
-    db.add(report)
-    await db.flush()
 
-    all_attentions: list[int] = []
-    for entry in data.students:
-        await get_or_create_student(db, entry.student_id, data.class_id, entry.name)
-        inattention = 100 - entry.attention
-        db.add(
-            AttentionEntry(
-                report_id=report_id,
-                student_id=entry.student_id,
-                attention=entry.attention,
-                inattention=inattention,
-                image_path=None,  # ✅ ignore
-            )
-        )
-        all_attentions.append(entry.attention)
-
-    for entry in data.unrecognized_students:
-        inattention = 100 - entry.attention
-        db.add(
-            UnrecognizedEntry(
-                report_id=report_id,
-                attention=entry.attention,
-                inattention=inattention,
-                image_path=None,  # ✅ ignore
+
+async def _apply_rollups(
+    db: AsyncSession, contributions: list[rollup_service.Contribution]
+) -> None:
+    """Apply rollup deltas and invalidate stats derived from these schools' entries.
+
+    Class-level caches are already invalidated by the latest-report bookkeeping.
+    """
+    await rollup_service.apply_contributions(db, contributions)
+    await invalidation_bus.publish(db, "school", *sorted({c.school_id for c in contributions}))
+
+
+def _compute_averages(*entry_rows: list[dict]) -> tuple[float, float]:
+    """Return ``(avg_attention, avg_inattention)`` over all given entry rows."""
+    all_attentions = [row["attention"] for rows in entry_rows for row in rows]
+    if not all_attentions:
+        return 0.0, 0.0
+    avg_attn = sum(all_attentions) / len(all_attentions)
+    return round(avg_attn, 2), round(100 - avg_attn, 2)
+
+
+def _build_report_rows(
+    report_id: uuid.UUID,
+    data: LessonReportCreate,
+    image_writes: list[ImageWrite],
+    staged_images: Mapping[str, StagedImage] | None = None,
+) -> tuple[dict, list[dict], list[dict]]:
+    """Turn a validated payload into plain row dicts for multi-row INSERTs."""
+    attention_rows, unrecognized_rows = _build_entry_rows(
+        report_id, data.students, data.unrecognized_students, image_writes, staged_images
+    )
+    avg_attention, avg_inattention = _compute_averages(attention_rows, unrecognized_rows)
+    report_row = {
+        "id": report_id,
+        "school_id": data.school_id,
+        "class_id": data.class_id,
+        "class_index": data.class_index,
+        # Use server date if not provided
+        "lesson_date": data.lesson_date or date.today(),
+        "lesson_time": data.lesson_time,
+        "students_count": data.students_count,
+        "avg_attention": avg_attention,
+        "avg_inattention": avg_inattention,
+        # Set here rather than by the column default: the latest-report
+        # pointers need it before the rows are read back
+        "created_at": datetime.utcnow(),
+    }
+    return report_row, attention_rows, unrecognized_rows
+
+
+async def _ensure_references(
+    db: AsyncSession, reports: list[LessonReportCreate]
+) -> None:
+    """Auto-create school / classroom / student stubs in one bulk step per table."""
+    schools: set[int] = set()
+    classes: dict[int, tuple[int, str]] = {}
+    students: dict[int, tuple[int, str | None]] = {}
+    for data in reports:
+        schools.add(data.school_id)
+        classes.setdefault(data.class_id, (data.school_id, data.class_index))
+        for entry in data.students:
+            students.setdefault(entry.student_id, (data.class_id, entry.name))
+
+    # Parents first so the FK targets exist when the children are inserted
+    await ensure_schools(db, schools)
+    await ensure_classes(db, classes)
+    await ensure_students(db, students)
+
+
+async def create_lesson_reports(
+    db: AsyncSession,
+    items: list[tuple[uuid.UUID, LessonReportCreate]],
+    idempotency_keys: Mapping[uuid.UUID, str] | None = None,
+    staged_images: Mapping[str, StagedImage] | None = None,
+) -> list[uuid.UUID]:
+    """Insert many reports in the current transaction using multi-row INSERTs.
+
+    Each item is ``(report_id, payload)``; ids are assigned by the caller so they
+    can be handed back to clients before the transaction commits. With
+    ``staged_images``, entry ``image`` fields name uploaded parts instead of
+    holding base64 data.
+    """
+    if not items:
+        return []
+    idempotency_keys = idempotency_keys or {}
+
+    report_rows: list[dict] = []
+    attention_rows: list[dict] = []
+    unrecognized_rows: list[dict] = []
+    image_writes: list[ImageWrite] = []
+    contributions: list[rollup_service.Contribution] = []
+    for report_id, data in items:
+        report_row, attn, unrec = _build_report_rows(report_id, data, image_writes, staged_images)
+        report_row["idempotency_key"] = idempotency_keys.get(report_id)
+        report_rows.append(report_row)
+        attention_rows.extend(attn)
+        unrecognized_rows.extend(unrec)
+        contributions.append(
+            rollup_service.contribution(
+                data.school_id,
+                data.class_id,
+                report_row["lesson_date"],
+                (row["attention"] for row in [*attn, *unrec]),
             )
         )
-        all_attentions.append(entry.attention)
 
-    # Compute averages
-    if all_attentions:
-        avg_attn = sum(all_attentions) / len(all_attentions)
-        report.avg_attention = round(avg_attn, 2)
-        report.avg_inattention = round(100 - avg_attn, 2)
+    async def insert_reports() -> None:
+        await _ensure_references(db, [data for _, data in items])
+        await db.execute(insert(LessonReport), report_rows)
+
+    # Content-addressed image paths are only known once the bytes are hashed,
+    # so the entries go in after the image writes finish
+    await _with_images(image_writes, insert_reports())
+    await _insert_entries(db, image_writes, attention_rows, unrecognized_rows)
+    await _apply_rollups(db, contributions)
+    await _advance_latest_pointers(db, report_rows)
+
+    logger.debug(
+        "Inserted %d lesson reports (%d entries)",
+        len(report_rows),
+        len(attention_rows) + len(unrecognized_rows),
+    )
+    return [report_id for report_id, _ in items]
 
-    await db.flush()
+
+async def find_existing_report_id(
+    db: AsyncSession, report_id: uuid.UUID | None, idempotency_key: str | None
+) -> uuid.UUID | None:
+    """Return the id of an already stored submission, using one indexed read.
+
+    The ``Idempotency-Key`` takes precedence over a client-generated report id.
+    """
+    if idempotency_key is not None:
+        cond = LessonReport.idempotency_key == idempotency_key
+    elif report_id is not None:
+        cond = LessonReport.id == report_id
+    else:
+        return None
+    result = await db.execute(select(LessonReport.id).where(cond))
+    return result.scalar()
+
+
+async def existing_report_ids(
+    db: AsyncSession, report_ids: Iterable[uuid.UUID]
+) -> set[uuid.UUID]:
+    """Return which of the given report ids are already stored."""
+    ids = set(report_ids)
+    if not ids:
+        return set()
+    result = await db.execute(select(LessonReport.id).where(LessonReport.id.in_(ids)))
+    return set(result.scalars().all())
+
+
+async def create_lesson_report(
+    db: AsyncSession,
+    data: LessonReportCreate,
+    idempotency_key: str | None = None,
+    staged_images: Mapping[str, StagedImage] | None = None,
+) -> tuple[LessonReport, bool]:
+    """Process a full lesson report from CV, save images, compute metrics.
+
+    Returns ``(report, created)``. A retry of an earlier submission (same
+    ``Idempotency-Key`` or client-generated id) returns the stored report with
+    ``created=False`` and writes nothing.
+    """
+    existing_id = await find_existing_report_id(db, data.id, idempotency_key)
+    if existing_id is not None:
+        logger.info("Idempotent replay of lesson report %s", existing_id)
+        return await _load_full_report(db, existing_id), False
+
+    report_id = data.id or uuid.uuid4()
+    keys = {report_id: idempotency_key} if idempotency_key is not None else None
+    try:
+        await create_lesson_reports(
+            db, [(report_id, data)], idempotency_keys=keys, staged_images=staged_images
+        )
+    except IntegrityError:
+        if data.id is None and idempotency_key is None:
+            raise
+        # A concurrent request with the same key/id won the race
+        raise HTTPException(
+            status_code=409,
+            detail="A report with this Idempotency-Key or id is already being created",
+        )
     logger.info("Created lesson report %s for class %s", report_id, data.class_index)
 
-    return await _load_full_report(db, report_id)
+    return await _load_full_report(db, report_id), True
 
 
 async def get_lesson_reports(
@@ -93,38 +419,114 @@ async def get_lesson_reports(
     date_to: date | None = None,
     limit: int = 50,
     offset: int = 0,
-) -> tuple[list[LessonReport], int]:
-    """Return filtered list of reports with total count."""
-    stmt = select(LessonReport)
-    count_stmt = select(func.count(LessonReport.id))
-
+    cursor: str | None = None,
+    include_total: bool = True,
+) -> tuple[list[LessonReportSummaryRow], int | None, str | None]:
+    """Return a page of filtered reports, newest first.
+
+    With ``cursor`` (the ``next_cursor`` of the previous page) rows are found by
+    keyset on ``(created_at, id)`` and ``offset`` is ignored. The count query
+    only runs when ``include_total`` is set.
+
+    Returns ``(reports, total, next_cursor)``.
+    """
+    table = LessonReport.__table__
     conditions = []
     if school_id is not None:
-        conditions.append(LessonReport.school_id == school_id)
+        conditions.append(table.c.school_id == school_id)
     if class_id is not None:
-        conditions.append(LessonReport.class_id == class_id)
+        conditions.append(table.c.class_id == class_id)
     if date_from is not None:
-        conditions.append(LessonReport.lesson_date >= date_from)
+        conditions.append(table.c.lesson_date >= date_from)
     if date_to is not None:
-        conditions.append(LessonReport.lesson_date <= date_to)
+        conditions.append(table.c.lesson_date <= date_to)
+
+    stmt = project(LessonReportSummaryRow, table).where(*conditions)
+    total = await count_rows(db, stmt) if include_total else None
+    reports, next_cursor = await fetch_page(
+        db,
+        stmt,
+        LessonReportSummaryRow,
+        created_at=table.c.created_at,
+        key=table.c.id,
+        parse_key=_parse_uuid,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    return reports, total, next_cursor
 
-    for cond in conditions:
-        stmt = stmt.where(cond)
-        count_stmt = count_stmt.where(cond)
 
-    total = (await db.execute(count_stmt)).scalar() or 0
-    stmt = stmt.order_by(LessonReport.created_at.desc()).limit(limit).offset(offset)
-    result = await db.execute(stmt)
-    return list(result.scalars().all()), total
+def _parse_uuid(value: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
-async def get_lesson_report(db: AsyncSession, report_id: uuid.UUID) -> LessonReport:
-    report = await _load_full_report(db, report_id)
+async def get_lesson_report(db: AsyncSession, report_id: uuid.UUID) -> LessonReportRow:
+    """Return a report with its entries as read-only rows (no ORM objects)."""
+    report = await _fetch_report_row(db, report_id)
     if not report:
         raise HTTPException(status_code=404, detail=f"LessonReport {report_id} not found")
     return report
 
 
+async def get_lesson_reports_by_ids(
+    db: AsyncSession, report_ids: Iterable[uuid.UUID]
+) -> tuple[list[LessonReportRow], list[uuid.UUID]]:
+    """Load many reports with their entries in three ``IN`` queries.
+
+    Returns ``(reports, missing_ids)``. Both are in request order, and
+    duplicate ids are only returned once.
+    """
+    ids = list(dict.fromkeys(report_ids))
+    if not ids:
+        return [], []
+    report_table = LessonReport.__table__
+    reports = {
+        row.id: row
+        for row in to_rows(
+            LessonReportSummaryRow,
+            await db.execute(
+                project(LessonReportSummaryRow, report_table).where(report_table.c.id.in_(ids))
+            ),
+        )
+    }
+    found = list(reports)
+    attention: dict[uuid.UUID, list[AttentionEntryRow]] = {report_id: [] for report_id in found}
+    unrecognized: dict[uuid.UUID, list[UnrecognizedEntryRow]] = {
+        report_id: [] for report_id in found
+    }
+    if found:
+        for row_type, model, by_report in (
+            (AttentionEntryRow, AttentionEntry, attention),
+            (UnrecognizedEntryRow, UnrecognizedEntry, unrecognized),
+        ):
+            table = model.__table__
+            result = await db.execute(
+                project(row_type, table).where(table.c.report_id.in_(found))
+            )
+            for entry in to_rows(row_type, result):
+                by_report[entry.report_id].append(entry)
+
+    rows = [
+        LessonReportRow(
+            *(getattr(reports[i], f) for f in REPORT_FIELDS),
+            attention_entries=attention[i],
+            unrecognized_entries=unrecognized[i],
+        )
+        for i in ids
+        if i in reports
+    ]
+    return rows, [i for i in ids if i not in reports]
+
+
+async def lesson_report_exists(db: AsyncSession, report_id: uuid.UUID) -> bool:
+    result = await db.execute(select(LessonReport.id).where(LessonReport.id == report_id))
+    return result.first() is not None
+
+
 async def update_lesson_report(
     db: AsyncSession, report_id: uuid.UUID, data: LessonReportUpdate
 ) -> LessonReport:
@@ -133,6 +535,10 @@ async def update_lesson_report(
     if not report:
         raise HTTPException(status_code=404, detail=f"LessonReport {report_id} not found")
 
+    # Take the old state out of the rollups; the new state is added back below
+    old_contribution = _report_contribution(report, sign=-1)
+    attentions = [e.attention for e in [*report.attention_entries, *report.unrecognized_entries]]
+
     # Update scalar fields
     for field in ("class_id", "school_id", "class_index", "lesson_time", "lesson_date", "students_count"):
         val = getattr(data, field, None)
@@ -141,6 +547,7 @@ async def update_lesson_report(
 
     # If students list is provided, replace entries
     if data.students is not None:
+        old_images = _entry_images(report)
         # Delete old entries + images
         await db.execute(
             sa_delete(AttentionEntry).where(AttentionEntry.report_id == report_id)
@@ -149,39 +556,32 @@ async def update_lesson_report(
             sa_delete(UnrecognizedEntry).where(UnrecognizedEntry.report_id == report_id)
         )
 
-        all_attentions: list[int] = []
-        for entry in data.students:
-            await get_or_create_student(db, entry.student_id, data.class_id, entry.name)
-            inattention = 100 - entry.attention
-            db.add(
-                AttentionEntry(
-                    report_id=report_id,
-                    student_id=entry.student_id,
-                    attention=entry.attention,
-                    inattention=inattention,
-                    image_path=None,  # ✅ ignore
-                )
-            )
-            all_attentions.append(entry.attention)
-
-        for entry in data.unrecognized_students:
-            inattention = 100 - entry.attention
-            db.add(
-                UnrecognizedEntry(
-                    report_id=report_id,
-                    attention=entry.attention,
-                    inattention=inattention,
-                    image_path=None,  # ✅ ignore
-                )
-            )
-            all_attentions.append(entry.attention)
+        image_writes: list[ImageWrite] = []
+        attention_rows, unrecognized_rows = _build_entry_rows(
+            report_id, data.students, data.unrecognized_students or [], image_writes
+        )
 
-        if all_attentions:
-            avg_attn = sum(all_attentions) / len(all_attentions)
-            report.avg_attention = round(avg_attn, 2)
-            report.avg_inattention = round(100 - avg_attn, 2)
+        students = {e.student_id: (report.class_id, e.name) for e in data.students}
+        await _with_images(image_writes, ensure_students(db, students))
+        await _insert_entries(db, image_writes, attention_rows, unrecognized_rows)
+        await _discard_entry_images(db, report_id, old_images)
+        report.avg_attention, report.avg_inattention = _compute_averages(
+            attention_rows, unrecognized_rows
+        )
+        attentions = [row["attention"] for row in [*attention_rows, *unrecognized_rows]]
+        # Collections were loaded before the bulk statements; reload them below
+        db.expire(report, ["attention_entries", "unrecognized_entries"])
 
+    new_contribution = rollup_service.contribution(
+        report.school_id, report.class_id, report.lesson_date, attentions
+    )
+    await _apply_rollups(db, [old_contribution, new_contribution])
     await db.flush()
+    classes = {old_contribution.class_id, report.class_id}
+    if report.class_id != old_contribution.class_id:
+        await _refresh_latest_pointers(db, classes)
+    await invalidation_bus.publish(db, "class", *classes)
+    await invalidation_bus.publish(db, "report", report_id)
     return await _load_full_report(db, report_id)
 
 
@@ -190,38 +590,174 @@ async def delete_lesson_report(db: AsyncSession, report_id: uuid.UUID) -> None:
     if not report:
         raise HTTPException(status_code=404, detail=f"LessonReport {report_id} not found")
 
-    # Remove images from disk
-    report_dir = settings.IMAGES_DIR / str(report_id)
-    shutil.rmtree(report_dir, ignore_errors=True)
-
+    images = _entry_images(report)
+    await _apply_rollups(db, [_report_contribution(report, sign=-1)])
     await db.delete(report)
     await db.flush()
+    await _refresh_latest_pointers(db, [report.class_id])
+    await invalidation_bus.publish(db, "class", report.class_id)
+    await invalidation_bus.publish(db, "report", report_id)
 
+    # Remove images from disk once the delete has committed
+    await _discard_entry_images(db, report_id, images, remove_report_dir=True)
 
-async def get_latest_report_for_class(
-    db: AsyncSession, class_id: int
-) -> LessonReport | None:
-    """Return the most recent report for a given class, with entries loaded."""
-    stmt = (
-        select(LessonReport)
-        .where(LessonReport.class_id == class_id)
-        .order_by(LessonReport.created_at.desc())
-        .limit(1)
-        .options(
-            selectinload(LessonReport.attention_entries),
-            selectinload(LessonReport.unrecognized_entries),
-        )
-    )
-    result = await db.execute(stmt)
-    report = result.scalars().first()
-    if not report:
+
+async def get_latest_report_id_for_class(db: AsyncSession, class_id: int) -> uuid.UUID:
+    """Return the id of the class's most recent report (a primary-key read).
+
+    Raises:
+        HTTPException 404 if the class has no reports.
+    """
+    pointer = await db.get(ClassLatestReport, class_id)
+    if pointer is None:
         raise HTTPException(
             status_code=404,
             detail=f"No lesson reports found for class {class_id}",
         )
+    return pointer.report_id
+
+
+async def get_latest_report_for_class(db: AsyncSession, class_id: int) -> LessonReportRow:
+    """Return the most recent report for a given class, with entries loaded."""
+    report_id = await get_latest_report_id_for_class(db, class_id)
+    return await get_lesson_report(db, report_id)
+
+
+# ── Sparse report views ─────────────────────────────────────────────────────
+# Scalar fields selectable with ``fields=`` and collections with ``include=``
+REPORT_FIELDS = tuple(f.name for f in dataclass_fields(LessonReportSummaryRow))
+REPORT_INCLUDES = ("students", "unrecognized")
+
+
+def _parse_list_param(name: str, value: str | None, allowed: tuple[str, ...]) -> tuple[str, ...]:
+    if value is None:
+        return allowed
+    requested = {item.strip() for item in value.split(",") if item.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {name}: {', '.join(unknown)} (allowed: {', '.join(allowed)})",
+        )
+    # Canonical order, so equal requests compare equal
+    return tuple(item for item in allowed if item in requested)
+
+
+def parse_report_fields(value: str | None) -> tuple[str, ...]:
+    """Parse ``fields=a,b``; ``id`` is always included. Raises HTTPException 400."""
+    return _parse_list_param("fields", value if value is None else f"id,{value}", REPORT_FIELDS)
+
+
+def parse_report_include(value: str | None) -> tuple[str, ...]:
+    """Parse ``include=students,unrecognized`` (empty for none). Raises HTTPException 400."""
+    return _parse_list_param("include", value, REPORT_INCLUDES)
+
+
+async def get_lesson_report_view(
+    db: AsyncSession,
+    report_id: uuid.UUID,
+    fields: tuple[str, ...],
+    include: tuple[str, ...],
+) -> dict[str, Any]:
+    """Return only the requested columns and entry collections of a report.
+
+    Unrequested columns are not selected and unrequested collections are not
+    queried. ``students`` and ``unrecognized_students`` hold entry rows.
+
+    Raises:
+        HTTPException 404 if the report does not exist.
+    """
+    table = LessonReport.__table__
+    row = (
+        await db.execute(select(*(table.c[f] for f in fields)).where(table.c.id == report_id))
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"LessonReport {report_id} not found")
+    report = dict(zip(fields, row))
+    if "students" in include:
+        report["students"] = await _fetch_entries(
+            db, AttentionEntryRow, AttentionEntry, report_id
+        )
+    if "unrecognized" in include:
+        report["unrecognized_students"] = await _fetch_entries(
+            db, UnrecognizedEntryRow, UnrecognizedEntry, report_id
+        )
     return report
 
 
+# ── Latest report per class ─────────────────────────────────────────────────
+async def _advance_latest_pointers(db: AsyncSession, report_rows: list[dict]) -> None:
+    """Point each class at its newest new report, unless it already has a newer one."""
+    newest: dict[int, dict] = {}
+    for row in report_rows:
+        current = newest.get(row["class_id"])
+        if current is None or _order_key(row) > _order_key(current):
+            newest[row["class_id"]] = row
+    if not newest:
+        return
+    await _upsert_newer_pointers(
+        db,
+        [
+            {"class_id": class_id, "report_id": row["id"], "created_at": row["created_at"]}
+            for class_id, row in sorted(newest.items())
+        ],
+    )
+    await invalidation_bus.publish(db, "class", *newest)
+
+
+async def _upsert_newer_pointers(db: AsyncSession, pointers: list[dict]) -> None:
+    """Insert pointers, or move existing ones only forward to a newer report."""
+    table = ClassLatestReport.__table__
+    stmt = dialect_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["class_id"],
+        set_={"report_id": stmt.excluded.report_id, "created_at": stmt.excluded.created_at},
+        where=tuple_(stmt.excluded.created_at, stmt.excluded.report_id)
+        > tuple_(table.c.created_at, table.c.report_id),
+    )
+    await db.execute(stmt, pointers)
+
+
+def _order_key(row: dict) -> tuple[datetime, uuid.UUID]:
+    return row["created_at"], row["id"]
+
+
+async def _refresh_latest_pointers(db: AsyncSession, class_ids: Iterable[int]) -> None:
+    """Recompute the pointers of classes whose latest report may have gone away.
+
+    The pointer row is locked before the latest report is read. A concurrent
+    create that advanced it must commit first, and under READ COMMITTED the
+    read below then sees its report. A concurrent create that comes later
+    waits for this transaction and still only moves the pointer forward.
+    """
+    table = ClassLatestReport.__table__
+    for class_id in sorted(set(class_ids)):
+        locked = (
+            await db.execute(
+                select(table.c.class_id).where(table.c.class_id == class_id).with_for_update()
+            )
+        ).first()
+        latest = (
+            await db.execute(
+                select(LessonReport.id, LessonReport.created_at)
+                .where(LessonReport.class_id == class_id)
+                .order_by(LessonReport.created_at.desc(), LessonReport.id.desc())
+                .limit(1)
+            )
+        ).first()
+        if latest is None:
+            if locked is not None:
+                await db.execute(sa_delete(table).where(table.c.class_id == class_id))
+            continue
+        pointer = {"report_id": latest.id, "created_at": latest.created_at}
+        if locked is not None:
+            await db.execute(update(table).where(table.c.class_id == class_id).values(pointer))
+        else:
+            # No row to lock (e.g. removed by the report's FK cascade): a
+            # concurrent insert may win, so only ever move it forward
+            await _upsert_newer_pointers(db, [{"class_id": class_id, **pointer}])
+
+
 async def _load_full_report(
     db: AsyncSession, report_id: uuid.UUID
 ) -> LessonReport | None:
@@ -236,3 +772,28 @@ async def _load_full_report(
     )
     result = await db.execute(stmt)
     return result.scalars().first()
+
+
+async def _fetch_entries(
+    db: AsyncSession, row_type: type, model: type, report_id: uuid.UUID
+) -> list:
+    table = model.__table__
+    result = await db.execute(project(row_type, table).where(table.c.report_id == report_id))
+    return to_rows(row_type, result)
+
+
+async def _fetch_report_row(db: AsyncSession, report_id: uuid.UUID) -> LessonReportRow | None:
+    """Read-only counterpart of ``_load_full_report`` built from Core rows."""
+    table = LessonReport.__table__
+    report = (
+        await db.execute(project(LessonReportSummaryRow, table).where(table.c.id == report_id))
+    ).first()
+    if report is None:
+        return None
+    return LessonReportRow(
+        *report,
+        attention_entries=await _fetch_entries(db, AttentionEntryRow, AttentionEntry, report_id),
+        unrecognized_entries=await _fetch_entries(
+            db, UnrecognizedEntryRow, UnrecognizedEntry, report_id
+        ),
+    )
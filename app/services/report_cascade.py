@@ -0,0 +1,51 @@
+"""Bookkeeping for deletes that cascade to lesson reports and their entries.
+
+Deleting a school, class or student removes reports or entries through
+ORM and foreign-key cascades, bypassing the report service. These helpers run
+in the same transaction, before the delete: they take the doomed rows out of
+the daily rollups and publish invalidations for everything cached from them
+(report bodies, latest-report responses, attention stats).
+"""
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.invalidation import invalidation_bus
+from app.models.attention_entry import AttentionEntry
+from app.models.lesson_report import LessonReport
+from app.services import rollup_service
+
+
+async def forget_reports(db: AsyncSession, condition: ColumnElement[bool]) -> None:
+    """Prepare for the cascading delete of every report matching ``condition``."""
+    affected = await db.execute(
+        select(LessonReport.id, LessonReport.class_id, LessonReport.school_id).where(condition)
+    )
+    await rollup_service.apply_contributions(
+        db, await rollup_service.report_contributions(db, condition)
+    )
+    await _publish(db, affected.all())
+
+
+async def forget_student_entries(db: AsyncSession, student_id: int) -> None:
+    """Prepare for the cascading delete of a student's attention entries.
+
+    The reports stay, but their bodies, their classes' latest reports and the
+    rollups and stats all included the student's entries.
+    """
+    affected = await db.execute(
+        select(LessonReport.id, LessonReport.class_id, LessonReport.school_id)
+        .join(AttentionEntry, AttentionEntry.report_id == LessonReport.id)
+        .where(AttentionEntry.student_id == student_id)
+        .distinct()
+    )
+    await rollup_service.apply_contributions(
+        db, await rollup_service.student_contributions(db, student_id)
+    )
+    await _publish(db, affected.all())
+
+
+async def _publish(db: AsyncSession, reports: list) -> None:
+    await invalidation_bus.publish(db, "report", *(r.id for r in reports))
+    await invalidation_bus.publish(db, "class", *sorted({r.class_id for r in reports}))
+    await invalidation_bus.publish(db, "school", *sorted({r.school_id for r in reports}))
@@ -0,0 +1,233 @@
+"""Daily attention rollups per class and per school.
+
+Every report contributes its entry count, attention sum and sum of squares to
+one ``class_daily_attention`` and one ``school_daily_attention`` row (keyed by
+lesson date). The report service applies contributions in the same
+transaction as the report change (negative ones for deletes and for the old
+state of updates), so dashboards read a few hundred rollup rows instead of
+re-aggregating ``attention_entries``. Deletes of schools, classes and students
+cascade to reports and entries; they subtract what those rows contributed
+before deleting (see ``report_contributions`` / ``student_contributions``).
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import (
+    ColumnElement,
+    Subquery,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import insert_on_conflict_increment
+from app.models.attention_entry import AttentionEntry
+from app.models.class_daily_attention import ClassDailyAttention
+from app.models.lesson_report import LessonReport
+from app.models.school_daily_attention import SchoolDailyAttention
+from app.models.unrecognized_entry import UnrecognizedEntry
+from app.core.logging import logger
+
+_COUNTERS = ("reports_count", "entries_count", "attention_sum", "attention_sq_sum")
+
+
+@dataclass(slots=True)
+class Contribution:
+    """What one report adds to (or, negated, removes from) the rollups."""
+    school_id: int
+    class_id: int
+    day: date
+    reports_count: int
+    entries_count: int
+    attention_sum: int
+    attention_sq_sum: int
+
+
+def contribution(
+    school_id: int, class_id: int, day: date, attentions: Iterable[int], sign: int = 1
+) -> Contribution:
+    """Build a report's contribution from the attention of all its entries."""
+    values = list(attentions)
+    return Contribution(
+        school_id=school_id,
+        class_id=class_id,
+        day=day,
+        reports_count=sign,
+        entries_count=sign * len(values),
+        attention_sum=sign * sum(values),
+        attention_sq_sum=sign * sum(v * v for v in values),
+    )
+
+
+async def apply_contributions(db: AsyncSession, contributions: Iterable[Contribution]) -> None:
+    """Add contributions to the rollups, one multi-row upsert per table.
+
+    Contributions for the same class/school and day are merged first; rows
+    are written in key order so concurrent transactions lock them in the
+    same order.
+    """
+    class_totals: dict[tuple[int, date], list[int]] = {}
+    school_totals: dict[tuple[int, date], list[int]] = {}
+    for c in contributions:
+        deltas = (c.reports_count, c.entries_count, c.attention_sum, c.attention_sq_sum)
+        for totals, key in (
+            (class_totals, (c.class_id, c.day)),
+            (school_totals, (c.school_id, c.day)),
+        ):
+            current = totals.setdefault(key, [0, 0, 0, 0])
+            for i, delta in enumerate(deltas):
+                current[i] += delta
+
+    await insert_on_conflict_increment(
+        db, ClassDailyAttention, _rows("class_id", class_totals), key=("class_id", "day")
+    )
+    await insert_on_conflict_increment(
+        db, SchoolDailyAttention, _rows("school_id", school_totals), key=("school_id", "day")
+    )
+
+
+def _rows(key_column: str, totals: dict[tuple[int, date], list[int]]) -> list[dict]:
+    return [
+        {key_column: owner_id, "day": day, **dict(zip(_COUNTERS, values))}
+        for (owner_id, day), values in sorted(totals.items())
+        if any(values)
+    ]
+
+
+async def report_contributions(
+    db: AsyncSession, condition: ColumnElement[bool], sign: int = -1
+) -> list[Contribution]:
+    """Contributions of the reports matching ``condition``, aggregated in SQL.
+
+    One contribution per school, class and day; negated by default, for
+    removing reports that are about to be deleted.
+    """
+    per_report = _per_report_totals(condition)
+    result = await db.execute(
+        select(
+            LessonReport.school_id,
+            LessonReport.class_id,
+            LessonReport.lesson_date,
+            func.count(LessonReport.id),
+            func.coalesce(func.sum(per_report.c.n), literal_column("0")),
+            func.coalesce(func.sum(per_report.c.s), literal_column("0")),
+            func.coalesce(func.sum(per_report.c.ss), literal_column("0")),
+        )
+        .outerjoin(per_report, per_report.c.report_id == LessonReport.id)
+        .where(condition)
+        .group_by(LessonReport.school_id, LessonReport.class_id, LessonReport.lesson_date)
+    )
+    return [_contribution(row, sign) for row in result]
+
+
+async def student_contributions(
+    db: AsyncSession, student_id: int, sign: int = -1
+) -> list[Contribution]:
+    """Contributions of one student's entries (their reports stay), aggregated in SQL."""
+    result = await db.execute(
+        select(
+            LessonReport.school_id,
+            LessonReport.class_id,
+            LessonReport.lesson_date,
+            literal_column("0"),
+            func.count(),
+            func.sum(AttentionEntry.attention),
+            func.sum(AttentionEntry.attention * AttentionEntry.attention),
+        )
+        .join(LessonReport, LessonReport.id == AttentionEntry.report_id)
+        .where(AttentionEntry.student_id == student_id)
+        .group_by(LessonReport.school_id, LessonReport.class_id, LessonReport.lesson_date)
+    )
+    return [_contribution(row, sign) for row in result]
+
+
+def _contribution(row, sign: int) -> Contribution:
+    school_id, class_id, day, *counters = row
+    # Sums of sums come back as Decimal on PostgreSQL
+    return Contribution(school_id, class_id, day, *(sign * int(v) for v in counters))
+
+
+def _per_report_totals(condition: ColumnElement[bool] | None = None) -> Subquery:
+    """Entry count, attention sum and sum of squares per report (``n``, ``s``, ``ss``)."""
+    condition = true() if condition is None else condition
+    entries = union_all(
+        select(AttentionEntry.report_id, AttentionEntry.attention)
+        .join(LessonReport, LessonReport.id == AttentionEntry.report_id)
+        .where(condition),
+        select(UnrecognizedEntry.report_id, UnrecognizedEntry.attention)
+        .join(LessonReport, LessonReport.id == UnrecognizedEntry.report_id)
+        .where(condition),
+    ).subquery()
+    return (
+        select(
+            entries.c.report_id,
+            func.count().label("n"),
+            func.sum(entries.c.attention).label("s"),
+            func.sum(entries.c.attention * entries.c.attention).label("ss"),
+        )
+        .group_by(entries.c.report_id)
+        .subquery()
+    )
+
+
+async def get_class_daily(
+    db: AsyncSession, class_id: int, date_from: date | None = None, date_to: date | None = None
+) -> list[ClassDailyAttention]:
+    return await _get_daily(
+        db, ClassDailyAttention, ClassDailyAttention.class_id, class_id, date_from, date_to
+    )
+
+
+async def get_school_daily(
+    db: AsyncSession, school_id: int, date_from: date | None = None, date_to: date | None = None
+) -> list[SchoolDailyAttention]:
+    return await _get_daily(
+        db, SchoolDailyAttention, SchoolDailyAttention.school_id, school_id, date_from, date_to
+    )
+
+
+async def _get_daily(db, model, owner_column, owner_id, date_from, date_to) -> list:
+    stmt = select(model).where(owner_column == owner_id, model.reports_count > 0)
+    if date_from is not None:
+        stmt = stmt.where(model.day >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(model.day <= date_to)
+    result = await db.execute(stmt.order_by(model.day))
+    return list(result.scalars().all())
+
+
+async def rebuild_rollups(db: AsyncSession) -> None:
+    """Recompute both rollup tables from the raw reports and entries.
+
+    Runs in the caller's transaction, so readers keep seeing the old totals
+    until it commits.
+    """
+    per_report = _per_report_totals()
+    for model, owner in (
+        (ClassDailyAttention, LessonReport.class_id),
+        (SchoolDailyAttention, LessonReport.school_id),
+    ):
+        totals = (
+            select(
+                owner,
+                LessonReport.lesson_date,
+                func.count(LessonReport.id),
+                func.coalesce(func.sum(per_report.c.n), literal_column("0")),
+                func.coalesce(func.sum(per_report.c.s), literal_column("0")),
+                func.coalesce(func.sum(per_report.c.ss), literal_column("0")),
+            )
+            .outerjoin(per_report, per_report.c.report_id == LessonReport.id)
+            .group_by(owner, LessonReport.lesson_date)
+        )
+        await db.execute(delete(model))
+        await db.execute(
+            insert(model).from_select([owner.key, "day", *_COUNTERS], totals)
+        )
+    logger.info("Rebuilt daily attention rollups")
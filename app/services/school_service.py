@@ -1,9 +1,15 @@
+from collections.abc import Iterable
+
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.upsert import insert_on_conflict_do_nothing
+from app.models.class_room import ClassRoom
+from app.models.lesson_report import LessonReport
 from app.models.school import School
 from app.schemas.school import SchoolCreate, SchoolUpdate
+from app.services.report_cascade import forget_reports
 
 
 async def create_school(db: AsyncSession, data: SchoolCreate) -> School:
@@ -41,15 +47,26 @@ async def update_school(db: AsyncSession, school_id: int, data: SchoolUpdate) ->
 
 async def delete_school(db: AsyncSession, school_id: int) -> None:
     school = await get_school(db, school_id)
+    # Its reports, and its classes with their reports, go with it
+    classes = select(ClassRoom.id).where(ClassRoom.school_id == school_id)
+    await forget_reports(
+        db, or_(LessonReport.school_id == school_id, LessonReport.class_id.in_(classes))
+    )
     await db.delete(school)
     await db.flush()
 
 
-async def get_or_create_school(db: AsyncSession, school_id: int) -> School:
-    """Get school or create a stub if it doesn't exist (used by lesson report intake)."""
-    school = await db.get(School, school_id)
-    if not school:
-        school = School(id=school_id)
-        db.add(school)
-        await db.flush()
-    return school
+async def ensure_schools(db: AsyncSession, school_ids: Iterable[int]) -> None:
+    """Create stub schools for any ids that don't exist yet (used by lesson report intake).
+
+    One ``SELECT ... WHERE id IN (...)`` followed by at most one
+    ``INSERT ... ON CONFLICT DO NOTHING``, so concurrent reports for the same
+    school don't race each other into an IntegrityError.
+    """
+    ids = set(school_ids)
+    if not ids:
+        return
+    result = await db.execute(select(School.id).where(School.id.in_(ids)))
+    missing = ids - set(result.scalars().all())
+    # Sorted so concurrent transactions take row locks in the same order
+    await insert_on_conflict_do_nothing(db, School, [{"id": i} for i in sorted(missing)])
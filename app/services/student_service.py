@@ -1,9 +1,19 @@
+from collections.abc import AsyncIterator, Mapping
+
 from fastapi import HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.db.listing import count_rows, fetch_page, stream_ndjson
+from app.db.rows import StudentRow, StudentStatsRow, project
+from app.db.upsert import insert_on_conflict_do_nothing
+from app.models.attention_entry import AttentionEntry
+from app.models.class_room import ClassRoom
+from app.models.lesson_report import LessonReport
 from app.models.student import Student
 from app.schemas.student import StudentCreate, StudentUpdate
+from app.services.report_cascade import forget_student_entries
+from app.utils.cursor import parse_int_key
 
 
 async def create_student(db: AsyncSession, data: StudentCreate) -> Student:
@@ -17,13 +27,84 @@ async def create_student(db: AsyncSession, data: StudentCreate) -> Student:
     return student
 
 
-async def get_students(db: AsyncSession, class_id: int | None = None) -> list[Student]:
-    stmt = select(Student)
+def _students_query(
+    class_id: int | None, school_id: int | None, with_stats: bool
+) -> tuple[Select, type[StudentRow]]:
+    table = Student.__table__
+    stmt = project(StudentRow, table)
+    row_type = StudentRow
+    if with_stats:
+        # Correlated subqueries, served by ix_attention_entries_student_id_report_id
+        reports_count = (
+            select(func.count())
+            .where(AttentionEntry.student_id == table.c.id)
+            .scalar_subquery()
+        )
+        latest_attention = (
+            select(AttentionEntry.attention)
+            .join(LessonReport, LessonReport.id == AttentionEntry.report_id)
+            .where(AttentionEntry.student_id == table.c.id)
+            .order_by(LessonReport.created_at.desc(), LessonReport.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = stmt.add_columns(reports_count, latest_attention)
+        row_type = StudentStatsRow
     if class_id is not None:
-        stmt = stmt.where(Student.class_id == class_id)
-    stmt = stmt.order_by(Student.created_at.desc())
-    result = await db.execute(stmt)
-    return list(result.scalars().all())
+        stmt = stmt.where(table.c.class_id == class_id)
+    if school_id is not None:
+        stmt = stmt.join(ClassRoom, ClassRoom.id == table.c.class_id).where(
+            ClassRoom.school_id == school_id
+        )
+    return stmt, row_type
+
+
+async def get_students(
+    db: AsyncSession,
+    class_id: int | None = None,
+    school_id: int | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool = True,
+    with_stats: bool = False,
+) -> tuple[list[StudentRow], int | None, str | None]:
+    """Return a page of students, newest first (see ``get_lesson_reports``).
+
+    ``with_stats`` adds each student's ``reports_count`` and the attention of
+    their most recent report, computed in the same query.
+
+    Returns ``(students, total, next_cursor)``.
+    """
+    stmt, row_type = _students_query(class_id, school_id, with_stats)
+    total = await count_rows(db, stmt) if include_total else None
+    table = Student.__table__
+    students, next_cursor = await fetch_page(
+        db,
+        stmt,
+        row_type,
+        created_at=table.c.created_at,
+        key=table.c.id,
+        parse_key=parse_int_key,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    return students, total, next_cursor
+
+
+def stream_students(
+    session_factory: async_sessionmaker[AsyncSession],
+    class_id: int | None = None,
+    school_id: int | None = None,
+    with_stats: bool = False,
+    batch_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Every matching student as NDJSON, newest first."""
+    stmt, row_type = _students_query(class_id, school_id, with_stats)
+    table = Student.__table__
+    stmt = stmt.order_by(table.c.created_at.desc(), table.c.id.desc())
+    return stream_ndjson(session_factory, stmt, row_type, batch_size)
 
 
 async def get_student(db: AsyncSession, student_id: int) -> Student:
@@ -45,17 +126,25 @@ async def update_student(db: AsyncSession, student_id: int, data: StudentUpdate)
 
 async def delete_student(db: AsyncSession, student_id: int) -> None:
     student = await get_student(db, student_id)
+    # Its attention entries go with it
+    await forget_student_entries(db, student_id)
     await db.delete(student)
     await db.flush()
 
 
-async def get_or_create_student(
-    db: AsyncSession, student_id: int, class_id: int, full_name: str | None = None
-) -> Student:
-    """Get student or create a stub."""
-    student = await db.get(Student, student_id)
-    if not student:
-        student = Student(id=student_id, class_id=class_id, full_name=full_name)
-        db.add(student)
-        await db.flush()
-    return student
+async def ensure_students(
+    db: AsyncSession, students: Mapping[int, tuple[int, str | None]]
+) -> None:
+    """Create stub students for ids that don't exist yet.
+
+    ``students`` maps ``student_id`` to ``(class_id, full_name)``.
+    """
+    if not students:
+        return
+    result = await db.execute(select(Student.id).where(Student.id.in_(students.keys())))
+    missing = set(students) - set(result.scalars().all())
+    rows = [
+        {"id": student_id, "class_id": students[student_id][0], "full_name": students[student_id][1]}
+        for student_id in sorted(missing)
+    ]
+    await insert_on_conflict_do_nothing(db, Student, rows)
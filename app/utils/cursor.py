@@ -0,0 +1,54 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row of a page, e.g.
+``(created_at, id)``. The next page is fetched with ``WHERE key < cursor``
+instead of ``OFFSET``, so every page costs the same as the first.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode a row's sort key; datetimes are stored as ISO strings."""
+    plain = [v.isoformat() if isinstance(v, datetime) else str(v) for v in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Decode a cursor into its ``size`` values as strings.
+
+    Raises:
+        HTTPException 400 if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return [str(v) for v in values]
+
+
+def decode_created_at_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a ``(created_at, id)`` cursor."""
+    created_at, key = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), key
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_int_key(value: str) -> int:
+    """Parse an integer id taken from a cursor."""
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
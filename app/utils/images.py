@@ -1,11 +1,56 @@
+import asyncio
 import base64
+import binascii
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+import time
 import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, TypeVar
 
 from fastapi import HTTPException
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
+# Sub-directory of IMAGES_DIR holding content-addressed blobs
+BLOBS_DIR = "blobs"
+_FILE_CHUNK_BYTES = 1024 * 1024
+
+# Base64 is decoded in slices of this many characters (a multiple of 4), so a
+# decoded image never has to sit in memory as one ``bytes`` object.
+_B64_CHUNK_CHARS = 64 * 1024
+_B64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+# Bounded pool for image decoding and disk I/O, kept off the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_IO_WORKERS, thread_name_prefix="image-io"
+)
+
+
+@dataclass(slots=True)
+class ImageWrite:
+    """A pending image write for one entry row.
+
+    The image comes either from a base64 string or from an already staged
+    file (multipart uploads) that is moved into place. With the
+    ``report_dir`` backend ``path`` is known up front; with the
+    ``content_addressed`` backend the blob location depends on the content,
+    so the write fills ``row["image_path"]`` / ``row["image_sha256"]`` itself.
+    """
+    row: dict
+    extension: str
+    path: Path | None = None
+    image_b64: str | None = None
+    source: Path | None = None
+
 
 def validate_and_decode_base64(data: str) -> bytes:
     """Validate a base64 string and return decoded bytes.
@@ -14,16 +59,177 @@ def validate_and_decode_base64(data: str) -> bytes:
         HTTPException 422 if the string is not valid base64.
         HTTPException 413 if decoded size exceeds MAX_IMAGE_SIZE_BYTES.
     """
+    data = _strip_data_uri(data)
+    _check_encoded_size(data)
+    return b"".join(_decode_chunks(data))
+
+
+def check_base64_image(image_b64: str) -> None:
+    """Check an image's size and base64 alphabet without decoding it.
+
+    Lets callers reject a bad image up front, before any write is queued.
+
+    Raises:
+        HTTPException 422 if the string is not valid base64.
+        HTTPException 413 if decoded size exceeds MAX_IMAGE_SIZE_BYTES.
+    """
+    data = _strip_data_uri(image_b64)
+    _check_encoded_size(data)
+    if len(data) % 4 or not _B64_RE.fullmatch(data):
+        raise _invalid_base64()
+
+
+def save_image(image_b64: str, report_dir: Path) -> str:
+    """Decode base64, save to disk, return relative filename."""
+    filename = image_filename(image_b64)
+    write_image(image_b64, report_dir / filename)
+    return filename
+
+
+def image_filename(image_b64: str) -> str:
+    """Return a fresh filename with an extension sniffed from the first bytes."""
+    return f"{uuid.uuid4().hex}{image_extension(image_b64)}"
+
+
+def image_extension(image_b64: str) -> str:
+    return detect_extension(_peek(image_b64))
+
+
+def blob_path(filename: str) -> Path:
+    """Location of a content-addressed blob named ``<sha256><ext>``.
+
+    Blobs are sharded two levels deep (``ab/cd/abcd....jpg``) to keep
+    directories small.
+    """
+    return settings.IMAGES_DIR / BLOBS_DIR / filename[:2] / filename[2:4] / filename
+
+
+def write_blob(extension: str, image_b64: str | None = None, source: Path | None = None) -> str:
+    """Store an image in the content-addressed store and return its SHA-256.
+
+    Identical bytes are stored once: if the blob already exists, the new copy
+    is dropped and the existing blob's mtime is refreshed so garbage
+    collection treats it as recently used.
+    """
+    blobs_dir = settings.IMAGES_DIR / BLOBS_DIR
+    blobs_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    if source is not None:
+        with open(source, "rb") as fh:
+            while chunk := fh.read(_FILE_CHUNK_BYTES):
+                digest.update(chunk)
+        tmp_path = source
+    else:
+        data = _strip_data_uri(image_b64)
+        _check_encoded_size(data)
+        fd, tmp_path = tempfile.mkstemp(dir=blobs_dir, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in _decode_chunks(data):
+                    digest.update(chunk)
+                    fh.write(chunk)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+
+    sha256 = digest.hexdigest()
+    dest = blob_path(f"{sha256}{extension}")
+    try:
+        # Doubles as the existence check: GC may remove the blob at any point
+        os.utime(dest)
+    except FileNotFoundError:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, dest)
+    else:
+        os.unlink(tmp_path)
+    return sha256
+
+
+def write_image(image_b64: str, dest: Path) -> int:
+    """Stream-decode ``image_b64`` into ``dest`` atomically and return its size.
+
+    Data goes to a temp file in the destination directory that is renamed over
+    ``dest`` once complete, so readers never see a partial image.
+
+    Raises:
+        HTTPException 422 if the string is not valid base64.
+        HTTPException 413 if decoded size exceeds MAX_IMAGE_SIZE_BYTES.
+    """
+    data = _strip_data_uri(image_b64)
+    _check_encoded_size(data)
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=".", suffix=".tmp")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in _decode_chunks(data):
+                size += len(chunk)
+                fh.write(chunk)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+    return size
+
+
+async def write_images(writes: list[ImageWrite]) -> None:
+    """Write images concurrently in the bounded image I/O pool.
+
+    If any write fails, every file of this call is removed and the first
+    error is re-raised.
+    """
+    if not writes:
+        return
+    results = await asyncio.gather(
+        *(run_io(_perform_write, w) for w in writes), return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        await discard_images(writes)
+        raise errors[0]
+
+
+async def discard_images(writes: list[ImageWrite]) -> None:
+    """Undo ``write_images`` after a failure.
+
+    Per-report files are removed. Content-addressed blobs may already be shared
+    with other entries, so they are left for ``gc-images`` to collect.
+    """
+    await remove_files([w.path for w in writes if w.path is not None])
+
+
+async def remove_files(paths: list[Path]) -> None:
+    """Delete files in the image I/O pool, ignoring ones that are already gone."""
+    if not paths:
+        return
+    await asyncio.gather(*(run_io(_unlink, path) for path in paths))
+
+
+async def run_io(func: Callable[..., T], *args: Any) -> T:
+    """Run blocking image/file work in the bounded image I/O pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+def get_report_image_dir(report_id: str | uuid.UUID) -> Path:
+    """Return (and create) the image directory for a given report."""
+    report_dir = settings.IMAGES_DIR / str(report_id)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    return report_dir
+
+
+def _strip_data_uri(data: str) -> str:
     # Strip optional data-URI prefix  (e.g. "data:image/jpeg;base64,...")
     if "," in data[:80]:
         data = data.split(",", 1)[1]
+    return data
 
-    try:
-        decoded = base64.b64decode(data, validate=True)
-    except Exception:
-        raise HTTPException(status_code=422, detail="Invalid base64 image data")
 
-    if len(decoded) > settings.MAX_IMAGE_SIZE_BYTES:
+def _check_encoded_size(data: str) -> None:
+    # Every 4 base64 chars decode to 3 bytes; reject oversized images before decoding
+    if len(data) // 4 * 3 - data[-2:].count("=") > settings.MAX_IMAGE_SIZE_BYTES:
         raise HTTPException(
             status_code=413,
             detail=(
@@ -31,29 +237,61 @@ def validate_and_decode_base64(data: str) -> bytes:
                 f"{settings.MAX_IMAGE_SIZE_BYTES // 1024}KB"
             ),
         )
-    return decoded
 
 
-def save_image(image_b64: str, report_dir: Path) -> str:
-    """Decode base64, save to disk, return relative filename."""
-    decoded = validate_and_decode_base64(image_b64)
+def _decode_chunks(data: str) -> Iterator[bytes]:
+    for start in range(0, len(data), _B64_CHUNK_CHARS):
+        try:
+            yield base64.b64decode(data[start : start + _B64_CHUNK_CHARS], validate=True)
+        except (binascii.Error, ValueError):
+            raise _invalid_base64()
 
-    # Detect simple format from magic bytes
-    ext = _detect_extension(decoded)
-    filename = f"{uuid.uuid4().hex}{ext}"
-    filepath = report_dir / filename
-    filepath.write_bytes(decoded)
-    return filename
 
+def _invalid_base64() -> HTTPException:
+    return HTTPException(status_code=422, detail="Invalid base64 image data")
 
-def get_report_image_dir(report_id: str | uuid.UUID) -> Path:
-    """Return (and create) the image directory for a given report."""
-    report_dir = settings.IMAGES_DIR / str(report_id)
-    report_dir.mkdir(parents=True, exist_ok=True)
-    return report_dir
+
+def _peek(image_b64: str) -> bytes:
+    """Decode just enough leading bytes for magic-byte detection."""
+    try:
+        return base64.b64decode(_strip_data_uri(image_b64)[:16], validate=True)
+    except (binascii.Error, ValueError):
+        return b""  # the full decode reports the error
+
+
+def _perform_write(write: ImageWrite) -> None:
+    if write.path is None:
+        sha256 = write_blob(write.extension, write.image_b64, write.source)
+        write.row["image_path"] = f"{sha256}{write.extension}"
+        write.row["image_sha256"] = sha256
+    elif write.source is not None:
+        write.path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(write.source, write.path)
+    else:
+        write_image(write.image_b64, write.path)
+
+
+def unlink_if_unused(path: Path, grace_seconds: int) -> bool:
+    """Unlink ``path`` unless it was modified within the last ``grace_seconds``.
+
+    Reusing a blob refreshes its mtime, so checking again right before the
+    unlink spares a blob that an upload picked up after it was found orphaned.
+    Returns whether the file was removed. Blocking; run it via ``run_io``.
+    """
+    try:
+        if path.stat().st_mtime > time.time() - grace_seconds:
+            return False
+        path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _unlink(path: Path) -> None:
+    path.unlink(missing_ok=True)
 
 
-def _detect_extension(data: bytes) -> str:
+def detect_extension(data: bytes) -> str:
     """Best-effort image format detection via magic bytes."""
     if data[:8] == b"\x89PNG\r\n\x1a\n":
         return ".png"
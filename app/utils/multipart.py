@@ -0,0 +1,189 @@
+"""Streaming ``multipart/form-data`` parsing for report uploads with binary images.
+
+Unlike ``Request.form()``, file parts are never spooled in memory: each chunk
+is appended to a file in a staging directory as it arrives, and the
+``MAX_IMAGE_SIZE_BYTES`` limit is enforced while streaming.
+"""
+
+import os
+import shutil
+import tempfile
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import HTTPException
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+
+from app.core.config import settings
+from app.utils.images import detect_extension, run_io
+
+# Max size of the JSON ``metadata`` part (images travel as separate parts)
+MAX_METADATA_BYTES = 1024 * 1024
+MAX_IMAGE_PARTS = 1000
+METADATA_FIELD = "metadata"
+
+
+@dataclass(slots=True)
+class StagedImage:
+    """An uploaded image part written to the staging directory."""
+    path: Path
+    extension: str
+    size: int
+
+
+@dataclass(slots=True)
+class _Part:
+    name: str = ""
+    disposition: bytes = b""
+    is_file: bool = False
+    data: bytearray = field(default_factory=bytearray)
+    file: BinaryIO | None = None
+    path: Path | None = None
+    size: int = 0
+
+
+class ReportUploadParser:
+    """Parse a multipart report upload into its metadata JSON and staged image files."""
+
+    def __init__(self, content_type: str, staging_dir: Path) -> None:
+        _, params = parse_options_header(content_type)
+        try:
+            self._boundary = params[b"boundary"]
+        except KeyError:
+            raise HTTPException(status_code=400, detail="Missing boundary in multipart body")
+        self.staging_dir = staging_dir
+        self.metadata: bytes | None = None
+        self.images: dict[str, StagedImage] = {}
+        self._part = _Part()
+        self._header_name = b""
+        self._header_value = b""
+        self._file_parts: list[_Part] = []
+        # File work collected by the (sync) parser callbacks, run in the I/O pool
+        self._to_open: list[_Part] = []
+        self._to_write: list[tuple[_Part, bytes]] = []
+        self._to_close: list[_Part] = []
+
+    async def parse(self, stream: AsyncIterator[bytes]) -> None:
+        await run_io(lambda: self.staging_dir.mkdir(parents=True, exist_ok=True))
+        parser = MultipartParser(
+            self._boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+        try:
+            async for chunk in stream:
+                parser.write(chunk)
+                await run_io(self._flush_files)
+            parser.finalize()
+            await run_io(self._flush_files)
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        finally:
+            # Close anything left open by a failed upload; the caller removes the dir
+            await run_io(self._close_files)
+
+        if self.metadata is None:
+            raise HTTPException(
+                status_code=422, detail=f"Missing {METADATA_FIELD!r} part with report JSON"
+            )
+
+    async def cleanup(self) -> None:
+        """Remove the staging directory and whatever is still in it."""
+        await run_io(shutil.rmtree, self.staging_dir, True)
+
+    # ── Parser callbacks ───────────────────────────────────────────────────
+    def _on_part_begin(self) -> None:
+        self._part = _Part()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._part.disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._part.disposition)
+        if b"name" not in options:
+            raise HTTPException(
+                status_code=400, detail='Content-Disposition "name" must be provided'
+            )
+        self._part.name = options[b"name"].decode("utf-8", errors="replace")
+        if b"filename" in options:
+            if any(p.name == self._part.name for p in self._file_parts):
+                raise HTTPException(
+                    status_code=422, detail=f"Duplicate image part {self._part.name!r}"
+                )
+            if len(self._file_parts) >= MAX_IMAGE_PARTS:
+                raise HTTPException(status_code=413, detail="Too many image parts")
+            self._part.is_file = True
+            self._file_parts.append(self._part)
+            self._to_open.append(self._part)
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        part = self._part
+        if part.is_file:
+            # Keep the first bytes around for magic-byte detection
+            if len(part.data) < 16:
+                part.data += data[start : min(end, start + 16 - len(part.data))]
+            part.size += end - start
+            if part.size > settings.MAX_IMAGE_SIZE_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=(
+                        f"Image {part.name!r} exceeds maximum allowed size of "
+                        f"{settings.MAX_IMAGE_SIZE_BYTES // 1024}KB"
+                    ),
+                )
+            self._to_write.append((part, data[start:end]))
+        else:
+            if len(part.data) + end - start > MAX_METADATA_BYTES:
+                raise HTTPException(status_code=413, detail=f"Part {part.name!r} is too large")
+            part.data += data[start:end]
+
+    def _on_part_end(self) -> None:
+        part = self._part
+        if part.is_file:
+            self._to_close.append(part)
+        elif part.name == METADATA_FIELD:
+            self.metadata = bytes(part.data)
+
+    # ── File I/O (runs in the image I/O pool) ───────────────────────────────
+    def _flush_files(self) -> None:
+        for part in self._to_open:
+            fd, path = tempfile.mkstemp(dir=self.staging_dir, suffix=".part")
+            part.file = os.fdopen(fd, "wb")
+            part.path = Path(path)
+        for part, chunk in self._to_write:
+            part.file.write(chunk)
+        for part in self._to_close:
+            part.file.close()
+            part.file = None
+            self.images[part.name] = StagedImage(
+                path=part.path, extension=detect_extension(bytes(part.data)), size=part.size
+            )
+        self._to_open.clear()
+        self._to_write.clear()
+        self._to_close.clear()
+
+    def _close_files(self) -> None:
+        for part in self._file_parts:
+            if part.file is not None:
+                part.file.close()
+                part.file = None
@@ -0,0 +1,164 @@
+"""Benchmark report serialization: per-entry models vs. the one-pass JSON path.
+
+Runs the app in-process against a throwaway SQLite file with a 40-entry
+report. The response caches are turned off so every request serializes.
+
+    python -m benchmarks.report_serialization [--requests 2000] [--entries 40]
+
+"before" swaps the router back to the old path. That path builds a response
+model per entry, validates the result against ``response_model`` the way
+FastAPI does for returned models, and then dumps it.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, time as dtime
+
+_DB_DIR = tempfile.mkdtemp(prefix="behalysis-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_DB_DIR}/bench.db")
+os.environ.setdefault("IMAGES_DIR", os.path.join(_DB_DIR, "images"))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.api.routers import lesson_reports  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import async_session_factory, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas.lesson_report import (  # noqa: E402
+    LessonReportResponse,
+    StudentEntryResponse,
+    UnrecognizedEntryResponse,
+)
+from app.services import lesson_report_service  # noqa: E402
+
+
+def _legacy_report_json(report) -> bytes:
+    students = [
+        StudentEntryResponse(
+            id=e.id,
+            student_id=e.student_id,
+            attention=e.attention,
+            inattention=e.inattention,
+            image_url=lesson_reports._build_image_url(report.id, e.image_path, e.image_sha256),
+            created_at=e.created_at,
+        )
+        for e in report.attention_entries
+    ]
+    unrecognized = [
+        UnrecognizedEntryResponse(
+            id=e.id,
+            attention=e.attention,
+            inattention=e.inattention,
+            image_url=lesson_reports._build_image_url(report.id, e.image_path, e.image_sha256),
+            created_at=e.created_at,
+        )
+        for e in report.unrecognized_entries
+    ]
+    model = LessonReportResponse(
+        id=report.id,
+        school_id=report.school_id,
+        class_id=report.class_id,
+        class_index=report.class_index,
+        lesson_date=report.lesson_date,
+        lesson_time=report.lesson_time,
+        students_count=report.students_count,
+        avg_attention=report.avg_attention,
+        avg_inattention=report.avg_inattention,
+        created_at=report.created_at,
+        students=students,
+        unrecognized_students=unrecognized,
+    )
+    # FastAPI re-validates a returned model against response_model
+    model = LessonReportResponse.model_validate(model.model_dump())
+    return model.model_dump_json().encode()
+
+
+@contextmanager
+def _serializer(fn):
+    original = lesson_reports._report_json
+    lesson_reports._report_json = fn
+    try:
+        yield
+    finally:
+        lesson_reports._report_json = original
+
+
+async def _seed(client: AsyncClient, entries: int) -> tuple[str, int]:
+    payload = {
+        "id": str(uuid.uuid4()),
+        "class_id": 12345678,
+        "school_id": 87654321,
+        "class_index": "8-E",
+        "lesson_time": dtime(9, 30).isoformat(),
+        "lesson_date": date.today().isoformat(),
+        "students_count": entries,
+        "students": [
+            {"student_id": 10_000_000 + i, "attention": (i * 7) % 101}
+            for i in range(entries - entries // 4)
+        ],
+        "unrecognized_students": [
+            {"attention": (i * 13) % 101} for i in range(entries // 4)
+        ],
+    }
+    resp = await client.post("/lesson-reports", json=payload)
+    resp.raise_for_status()
+    return payload["id"], payload["class_id"]
+
+
+async def _rps(client: AsyncClient, url: str, requests: int) -> float:
+    for _ in range(min(50, requests)):
+        (await client.get(url)).raise_for_status()
+    started = time.perf_counter()
+    for _ in range(requests):
+        (await client.get(url)).raise_for_status()
+    return requests / (time.perf_counter() - started)
+
+
+def _per_call_us(fn, report, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn(report)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def main(requests: int, entries: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    lesson_report_service.report_cache.max_bytes = 0
+    lesson_report_service.latest_report_cache.max_bytes = 0
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        report_id, class_id = await _seed(client, entries)
+        urls = {
+            "GET /lesson-reports/{id}": f"/lesson-reports/{report_id}",
+            "GET /classes/{id}/lesson-reports/latest": f"/classes/{class_id}/lesson-reports/latest",
+        }
+        print(f"{entries} entries, {requests} requests per run\n")
+        print(f"{'endpoint':<42}{'before req/s':>14}{'after req/s':>14}{'speedup':>10}")
+        for name, url in urls.items():
+            with _serializer(_legacy_report_json):
+                before = await _rps(client, url, requests)
+            after = await _rps(client, url, requests)
+            print(f"{name:<42}{before:>14.0f}{after:>14.0f}{after / before:>9.2f}x")
+
+    async with async_session_factory() as db:
+        report = await lesson_report_service.get_lesson_report(db, uuid.UUID(report_id))
+    calls = requests * 5
+    before = _per_call_us(_legacy_report_json, report, calls)
+    after = _per_call_us(lesson_reports._report_json, report, calls)
+    print(f"\n{'serialization only':<42}{before:>12.1f}us{after:>12.1f}us{before / after:>9.2f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--entries", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.entries))
@@ -0,0 +1,50 @@
+"""Add daily attention rollup tables
+
+Revision ID: 3b75d50e2f38
+Revises: 44301b5cf580
+Create Date: 2026-10-17 15:02:44.187390
+
+Existing data is not backfilled here; run ``python -m app.cli rebuild-rollups``
+once after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b75d50e2f38'
+down_revision: Union[str, None] = '44301b5cf580'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'class_daily_attention',
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('reports_count', sa.Integer(), nullable=False),
+        sa.Column('entries_count', sa.Integer(), nullable=False),
+        sa.Column('attention_sum', sa.BigInteger(), nullable=False),
+        sa.Column('attention_sq_sum', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['class_id'], ['classrooms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('class_id', 'day'),
+    )
+    op.create_table(
+        'school_daily_attention',
+        sa.Column('school_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('reports_count', sa.Integer(), nullable=False),
+        sa.Column('entries_count', sa.Integer(), nullable=False),
+        sa.Column('attention_sum', sa.BigInteger(), nullable=False),
+        sa.Column('attention_sq_sum', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('school_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('school_daily_attention')
+    op.drop_table('class_daily_attention')
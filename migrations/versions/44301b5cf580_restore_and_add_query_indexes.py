@@ -0,0 +1,44 @@
+"""Restore dropped indexes and add composites for query shapes
+
+Revision ID: 44301b5cf580
+Revises: 4bc1f64cbf8d
+Create Date: 2026-10-17 14:21:05.604117
+
+0ef6efaf1d4a dropped every index from 0001_initial because the models did not
+declare them. They are now declared on the models (so autogenerate keeps
+them) and recreated here together with composites for the hot queries.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44301b5cf580'
+down_revision: Union[str, None] = '4bc1f64cbf8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_classrooms_school_id', 'classrooms', ['school_id'], unique=False)
+    op.create_index('ix_students_class_id', 'students', ['class_id'], unique=False)
+    op.create_index('ix_lesson_reports_lesson_date', 'lesson_reports', ['lesson_date'], unique=False)
+    op.create_index('ix_lesson_reports_class_id_created_at', 'lesson_reports', ['class_id', 'created_at'], unique=False)
+    op.create_index('ix_lesson_reports_school_id_lesson_date', 'lesson_reports', ['school_id', 'lesson_date'], unique=False)
+    op.create_index('ix_lesson_reports_created_at_id', 'lesson_reports', ['created_at', 'id'], unique=False)
+    op.create_index('ix_attention_entries_report_id', 'attention_entries', ['report_id'], unique=False)
+    op.create_index('ix_attention_entries_student_id_report_id', 'attention_entries', ['student_id', 'report_id'], unique=False)
+    op.create_index('ix_unrecognized_entries_report_id', 'unrecognized_entries', ['report_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_unrecognized_entries_report_id', table_name='unrecognized_entries')
+    op.drop_index('ix_attention_entries_student_id_report_id', table_name='attention_entries')
+    op.drop_index('ix_attention_entries_report_id', table_name='attention_entries')
+    op.drop_index('ix_lesson_reports_created_at_id', table_name='lesson_reports')
+    op.drop_index('ix_lesson_reports_school_id_lesson_date', table_name='lesson_reports')
+    op.drop_index('ix_lesson_reports_class_id_created_at', table_name='lesson_reports')
+    op.drop_index('ix_lesson_reports_lesson_date', table_name='lesson_reports')
+    op.drop_index('ix_students_class_id', table_name='students')
+    op.drop_index('ix_classrooms_school_id', table_name='classrooms')
@@ -0,0 +1,31 @@
+"""Add entry image sha256 for content-addressed images
+
+Revision ID: 4bc1f64cbf8d
+Revises: 5370d8f0428f
+Create Date: 2026-10-17 12:03:17.529104
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4bc1f64cbf8d'
+down_revision: Union[str, None] = '5370d8f0428f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('attention_entries', sa.Column('image_sha256', sa.String(length=64), nullable=True))
+    op.create_index('ix_attention_entries_image_sha256', 'attention_entries', ['image_sha256'], unique=False)
+    op.add_column('unrecognized_entries', sa.Column('image_sha256', sa.String(length=64), nullable=True))
+    op.create_index('ix_unrecognized_entries_image_sha256', 'unrecognized_entries', ['image_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_unrecognized_entries_image_sha256', table_name='unrecognized_entries')
+    op.drop_column('unrecognized_entries', 'image_sha256')
+    op.drop_index('ix_attention_entries_image_sha256', table_name='attention_entries')
+    op.drop_column('attention_entries', 'image_sha256')
@@ -0,0 +1,27 @@
+"""Add lesson report idempotency key
+
+Revision ID: 5370d8f0428f
+Revises: 0ef6efaf1d4a
+Create Date: 2026-10-17 10:12:41.331907
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5370d8f0428f'
+down_revision: Union[str, None] = '0ef6efaf1d4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('lesson_reports', sa.Column('idempotency_key', sa.String(length=255), nullable=True))
+    op.create_index('ix_lesson_reports_idempotency_key', 'lesson_reports', ['idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lesson_reports_idempotency_key', table_name='lesson_reports')
+    op.drop_column('lesson_reports', 'idempotency_key')
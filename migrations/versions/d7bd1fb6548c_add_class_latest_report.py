@@ -0,0 +1,48 @@
+"""Add class_latest_report pointer table
+
+Revision ID: d7bd1fb6548c
+Revises: 3b75d50e2f38
+Create Date: 2026-10-17 16:10:52.918344
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7bd1fb6548c'
+down_revision: Union[str, None] = '3b75d50e2f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'class_latest_report',
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.Column('report_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['class_id'], ['classrooms.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['report_id'], ['lesson_reports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('class_id'),
+    )
+    # Backfill: each class's newest report, ties broken by id
+    op.execute(
+        """
+        INSERT INTO class_latest_report (class_id, report_id, created_at)
+        SELECT r.class_id, r.id, r.created_at
+        FROM lesson_reports r
+        WHERE NOT EXISTS (
+            SELECT 1 FROM lesson_reports n
+            WHERE n.class_id = r.class_id
+              AND (n.created_at > r.created_at
+                   OR (n.created_at = r.created_at AND n.id > r.id))
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('class_latest_report')
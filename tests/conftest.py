@@ -3,6 +3,7 @@
 import asyncio
 import base64
 import os
+import tempfile
 
 import pytest
 import pytest_asyncio
@@ -15,10 +16,14 @@ from sqlalchemy.ext.asyncio import (
 
 # Force SQLite for tests (before importing app code)
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
+# Keep stored images out of the working tree
+os.environ["IMAGES_DIR"] = tempfile.mkdtemp(prefix="behalysis-images-")
 
 from app.db.base import Base  # noqa: E402
-from app.api.deps import get_db  # noqa: E402
+from app.api.deps import get_db, get_session_factory  # noqa: E402
 from app.main import app  # noqa: E402
+from app.services.attention_stats_service import stats_cache  # noqa: E402
+from app.services.lesson_report_service import latest_report_cache, report_cache  # noqa: E402
 
 
 @pytest.fixture(scope="session")
@@ -45,7 +50,13 @@ async def db_session():
 
 
 @pytest_asyncio.fixture(scope="function")
-async def client(db_session: AsyncSession):
+async def session_factory(db_session: AsyncSession):
+    """Session factory bound to the test DB, for code that opens its own sessions."""
+    return async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def client(db_session: AsyncSession, session_factory):
     """HTTP client that uses the test DB session."""
 
     async def _override_get_db():
@@ -57,10 +68,15 @@ async def client(db_session: AsyncSession):
             raise
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+    # Each test starts with a fresh DB, so drop responses cached from the last one
+    latest_report_cache.clear()
+    report_cache.clear()
+    stats_cache.clear()
 
 
 # ── Helpers ─────────────────────────────────────────────────────────────────
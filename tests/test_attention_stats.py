@@ -0,0 +1,104 @@
+"""Tests for the attention distribution endpoints."""
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.db.invalidation import invalidation_bus
+from app.services import attention_stats_service
+from app.services.attention_stats_service import parse_bins, stats_cache
+from tests.test_lesson_reports import _make_report_payload
+
+
+def test_parse_bins():
+    assert parse_bins("4") == (0, 25, 50, 75, 100)
+    assert parse_bins("0,40,60,100") == (0, 40, 60, 100)
+    for bad in ("0", "101", "2.5", "50,40", "x", ""):
+        with pytest.raises(HTTPException):
+            parse_bins(bad)
+
+
+@pytest.mark.asyncio
+async def test_stats_without_numpy(client: AsyncClient):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        pytest.skip("numpy is installed")
+    await client.post("/lesson-reports", json=_make_report_payload())
+    resp = await client.get("/classes/12345678/attention/stats")
+    assert resp.status_code == 501
+
+
+@pytest.mark.asyncio
+async def test_class_attention_stats(client: AsyncClient):
+    pytest.importorskip("numpy")
+    # Alice: 80 then 30 (mean 55); unrecognized: 60 then 10
+    await client.post("/lesson-reports", json=_make_report_payload())
+    second = _make_report_payload(lesson_date="2026-02-16")
+    second["students"][0]["attention"] = 30
+    second["unrecognized_students"][0]["attention"] = 10
+    await client.post("/lesson-reports", json=second)
+
+    resp = await client.get(
+        "/classes/12345678/attention/stats", params={"bins": "0,50,100", "threshold": 60}
+    )
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert stats["entries_count"] == 4
+    assert stats["students_count"] == 1
+    assert stats["mean"] == 45.0
+    assert stats["p50"] == 45.0
+    assert stats["std"] == 26.93
+    assert stats["histogram"] == {"edges": [0.0, 50.0, 100.0], "counts": [2, 2]}
+    assert stats["share_entries_under_threshold"] == 0.5
+    assert stats["share_students_under_threshold"] == 1.0
+
+    # Served from the cache with an ETag, until a new report arrives
+    etag = resp.headers["ETag"]
+    again = await client.get(
+        "/classes/12345678/attention/stats",
+        params={"bins": "0,50,100", "threshold": 60},
+        headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+    assert stats_cache.stats()["hits"] >= 1
+
+    await client.post("/lesson-reports", json=_make_report_payload(lesson_date="2026-02-17"))
+    fresh = await client.get(
+        "/classes/12345678/attention/stats", params={"bins": "0,50,100", "threshold": 60}
+    )
+    assert fresh.json()["entries_count"] == 6
+    school = (await client.get("/schools/87654321/attention/stats")).json()
+    assert school["entries_count"] == 6
+
+    ranged = await client.get(
+        "/classes/12345678/attention/stats", params={"date_from": "2026-03-01"}
+    )
+    assert ranged.json()["entries_count"] == 0
+    assert ranged.json()["mean"] is None
+
+
+@pytest.mark.asyncio
+async def test_stats_computed_across_reconnect_are_not_cached(client: AsyncClient, monkeypatch):
+    pytest.importorskip("numpy")
+    await client.post("/lesson-reports", json=_make_report_payload())
+    fetch = attention_stats_service._fetch_attention
+
+    async def reconnect_during_fetch(*args):
+        rows = await fetch(*args)
+        # Bumps published while the listener was down are lost
+        invalidation_bus._flush_all()
+        return rows
+
+    monkeypatch.setattr(attention_stats_service, "_fetch_attention", reconnect_during_fetch)
+    resp = await client.get("/classes/12345678/attention/stats")
+    assert resp.status_code == 200
+    assert stats_cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_unknown_class(client: AsyncClient):
+    resp = await client.get("/classes/99999999/attention/stats")
+    assert resp.status_code == 404
@@ -0,0 +1,100 @@
+"""Tests for the in-process response cache."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.cache import CachedResponse, ResponseCache
+from tests.test_lesson_reports import _make_report_payload
+
+
+def _value(size: int) -> CachedResponse:
+    return CachedResponse.from_body(b"x" * size)
+
+
+def test_evicts_least_recently_used_by_size():
+    one = _value(100)
+    cache = ResponseCache("test", max_bytes=2 * one.size, ttl_seconds=60)
+    cache.set("a", one, cache.version("a"))
+    cache.set("b", one, cache.version("b"))
+    assert cache.get("a") is one  # "b" is now least recently used
+    cache.set("c", one, cache.version("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is one
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 2 * one.size
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache("test", max_bytes=10_000, ttl_seconds=5)
+    cache.set("a", _value(10), cache.version("a"))
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidation_during_read_is_not_overwritten():
+    cache = ResponseCache("test", max_bytes=10_000, ttl_seconds=60)
+    version = cache.version("a")
+    cache.invalidate("a")  # a write commits while the reader is querying
+    cache.set("a", _value(10), version)
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_report_read_is_cached_and_invalidated(client: AsyncClient):
+    report = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    url = f"/lesson-reports/{report['id']}"
+    first = await client.get(url)
+    second = await client.get(url)
+    assert first.content == second.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+    await client.put(url, json={"class_index": "9-A"})
+    updated = await client.get(url)
+    assert updated.json()["class_index"] == "9-A"
+
+    stats = (await client.get("/health/cache")).json()["report"]
+    assert stats["hits"] >= 1
+    assert stats["invalidations"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_cascading_deletes_invalidate_cached_reports(client: AsyncClient):
+    report = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    url = f"/lesson-reports/{report['id']}"
+    latest_url = "/classes/12345678/lesson-reports/latest"
+    await client.get(url)
+    await client.get(latest_url)
+
+    # Deleting the student removes its entry from the cached bodies
+    assert (await client.delete("/students/11112222")).status_code == 200
+    assert (await client.get(url)).json()["students"] == []
+    assert (await client.get(latest_url)).json()["students"] == []
+
+    # Deleting the class removes the report itself
+    assert (await client.delete("/classes/12345678")).status_code == 200
+    assert (await client.get(url)).status_code == 404
+    assert (await client.get(latest_url)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_school_delete_invalidates_cached_reports(client: AsyncClient):
+    report = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    url = f"/lesson-reports/{report['id']}"
+    await client.get(url)
+
+    assert (await client.delete("/schools/87654321")).status_code == 200
+    assert (await client.get(url)).status_code == 404
+
+
+def test_clear_discards_in_flight_fills():
+    cache = ResponseCache("test", max_bytes=10_000, ttl_seconds=60)
+    version = cache.version("a")  # a miss for a key that is not cached
+    cache.clear()  # e.g. the invalidation listener reconnected
+    cache.set("a", _value(10), version)
+    assert cache.get("a") is None
@@ -0,0 +1,165 @@
+"""Tests for the streaming attention exports."""
+
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services import columnar_export, export_service
+from app.services.export_service import ExportFilters
+from tests.test_lesson_reports import _make_report_payload
+
+
+@pytest.mark.asyncio
+async def test_export_attention_csv(client: AsyncClient, monkeypatch):
+    # Several cursor batches for a handful of rows
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 1)
+    await client.post("/lesson-reports", json=_make_report_payload())
+    await client.post(
+        "/lesson-reports",
+        json=_make_report_payload(
+            lesson_date="2026-02-16",
+            students_count=3,
+            students=[
+                {"student_id": 11112222, "attention": 50},
+                {"student_id": 33334444, "name": "Bob", "attention": 70},
+            ],
+        ),
+    )
+
+    resp = await client.get("/exports/attention.csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert "attachment" in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [(r["lesson_date"], r["student_id"], r["attention"]) for r in rows] == [
+        ("2026-02-15", "11112222", "80"),
+        ("2026-02-16", "11112222", "50"),
+        ("2026-02-16", "33334444", "70"),
+    ]
+    assert rows[0]["student_name"] == "Alice"
+    assert rows[0]["school_id"] == "87654321"
+
+    filtered = await client.get("/exports/attention.csv", params={"date_from": "2026-02-16"})
+    assert len(filtered.text.splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_attention_ndjson(client: AsyncClient):
+    report = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+
+    resp = await client.get("/exports/attention.ndjson", params={"class_id": 12345678})
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [
+        {
+            "report_id": report["id"],
+            "school_id": 87654321,
+            "class_id": 12345678,
+            "class_index": "8-E",
+            "lesson_date": "2026-02-15",
+            "lesson_time": "09:30:00",
+            "student_id": 11112222,
+            "student_name": "Alice",
+            "attention": 80,
+            "inattention": 20,
+        }
+    ]
+
+    other = await client.get("/exports/attention.ndjson", params={"school_id": 11111111})
+    assert other.text == ""
+
+
+@pytest.mark.asyncio
+async def test_export_bad_date_range(client: AsyncClient):
+    resp = await client.get(
+        "/exports/attention.csv", params={"date_from": "2026-03-01", "date_to": "2026-02-01"}
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_columnar_export_without_pyarrow(client: AsyncClient):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        pytest.skip("pyarrow is installed")
+    resp = await client.get("/exports/attention.parquet")
+    assert resp.status_code == 501
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+async def test_columnar_export_download(client: AsyncClient, fmt: str, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 1)
+    await client.post("/lesson-reports", json=_make_report_payload())
+    await client.post("/lesson-reports", json=_make_report_payload(lesson_date="2026-03-01"))
+
+    resp = await client.get(f"/exports/attention.{fmt}")
+    assert resp.status_code == 200
+    if fmt == "arrow":
+        table = pyarrow.ipc.open_stream(resp.content).read_all()
+    else:
+        table = pyarrow.parquet.read_table(pa.BufferReader(resp.content))
+    assert table.column_names == list(export_service.EXPORT_COLUMNS)
+    assert table.column("attention").to_pylist() == [80, 80]
+    assert [d.isoformat() for d in table.column("lesson_date").to_pylist()] == [
+        "2026-02-15",
+        "2026-03-01",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_partitioned_export(client: AsyncClient, session_factory, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    await client.post("/lesson-reports", json=_make_report_payload())
+    await client.post("/lesson-reports", json=_make_report_payload(lesson_date="2026-03-01"))
+    await client.post(
+        "/lesson-reports",
+        json=_make_report_payload(school_id=11111111, class_id=22222222),
+    )
+
+    written = await columnar_export.write_attention_partitions(
+        session_factory, ExportFilters(), tmp_path, batch_size=2
+    )
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in written) == [
+        "school_id=11111111/month=2026-02/part-0.parquet",
+        "school_id=87654321/month=2026-02/part-0.parquet",
+        "school_id=87654321/month=2026-03/part-0.parquet",
+    ]
+    dataset = pyarrow.parquet.read_table(tmp_path)
+    assert dataset.num_rows == 3
+    assert sorted(dataset.column("school_id").to_pylist()) == [11111111, 87654321, 87654321]
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters",
+    [
+        ExportFilters(class_id=12345678),
+        ExportFilters(date_from=date(2026, 2, 15)),
+        ExportFilters(date_to=date(2026, 2, 27)),
+    ],
+)
+async def test_partitioned_export_rejects_partial_partitions(session_factory, tmp_path, filters):
+    # A partial run would replace a partition file with only some of its rows
+    with pytest.raises(HTTPException) as exc:
+        await columnar_export.write_attention_partitions(
+            session_factory, filters, tmp_path, batch_size=2
+        )
+    assert exc.value.status_code == 400
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,235 @@
+"""Tests for the content-addressed image store and its garbage collection."""
+
+import base64
+import hashlib
+import os
+import time
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.hooks import after_commit
+from app.services import image_service
+from app.services.file_cleanup import file_cleaner
+from app.utils.images import blob_path, write_blob
+from tests.conftest import TINY_PNG_B64
+from tests.test_lesson_reports import _make_report_payload
+
+PNG = base64.b64decode(TINY_PNG_B64)
+PNG_SHA256 = hashlib.sha256(PNG).hexdigest()
+
+
+@pytest.fixture
+def content_addressed(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_STORAGE", "content_addressed")
+    monkeypatch.setattr(settings, "IMAGE_GC_GRACE_SECONDS", 0)
+
+
+@pytest.mark.asyncio
+async def test_identical_images_share_one_blob(client: AsyncClient, content_addressed):
+    first = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    second = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+
+    blob_url = f"/images/blobs/{PNG_SHA256}.png"
+    urls = {
+        entry["image_url"]
+        for report in (first, second)
+        for entry in report["students"] + report["unrecognized_students"]
+    }
+    assert urls == {blob_url}
+    assert blob_path(f"{PNG_SHA256}.png").is_file()
+
+    image = await client.get(blob_url)
+    assert image.status_code == 200
+    assert image.content == PNG
+
+
+@pytest.mark.asyncio
+async def test_blob_removed_with_last_reference(client: AsyncClient, content_addressed):
+    first = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    second = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    blob = blob_path(f"{PNG_SHA256}.png")
+
+    await client.delete(f"/lesson-reports/{first['id']}")
+    await file_cleaner.drain()
+    assert blob.is_file()
+
+    await client.delete(f"/lesson-reports/{second['id']}")
+    await file_cleaner.drain()
+    assert not blob.exists()
+
+
+@pytest.mark.asyncio
+async def test_blob_route_rejects_bad_names(client: AsyncClient):
+    resp = await client.get("/images/blobs/..%2F..%2Fetc.png")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_collect_garbage_removes_orphans(
+    client: AsyncClient, db_session: AsyncSession, content_addressed
+):
+    await client.post("/lesson-reports", json=_make_report_payload())
+    kept = blob_path(f"{PNG_SHA256}.png")
+
+    orphan_bytes = b"orphaned image"
+    orphan = blob_path(f"{hashlib.sha256(orphan_bytes).hexdigest()}.jpg")
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_bytes(orphan_bytes)
+    old = time.time() - 60
+    os.utime(orphan, (old, old))
+
+    _, removed = await image_service.collect_garbage(db_session, dry_run=True)
+    assert removed == 1
+    assert orphan.exists()
+
+    await image_service.collect_garbage(db_session)
+    assert not orphan.exists()
+    assert kept.is_file()
+
+
+# ── Post-commit cleanup ─────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_skip_rollback(db_session: AsyncSession):
+    calls = []
+    after_commit(db_session, lambda: calls.append("rolled back"))
+    await db_session.rollback()
+    after_commit(db_session, lambda: calls.append("committed"))
+    await db_session.commit()
+    assert calls == ["committed"]
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_report_dir_after_commit(client: AsyncClient):
+    data = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    report_dir = settings.IMAGES_DIR / data["id"]
+    assert report_dir.is_dir()
+
+    resp = await client.delete(f"/lesson-reports/{data['id']}")
+    assert resp.status_code == 200
+    await file_cleaner.drain()
+    assert not report_dir.exists()
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_orphan_report_dirs(client: AsyncClient, db_session: AsyncSession):
+    data = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    kept = settings.IMAGES_DIR / data["id"]
+    orphan = settings.IMAGES_DIR / str(uuid.uuid4())
+    orphan.mkdir()
+    (orphan / f"{uuid.uuid4().hex}.png").write_bytes(PNG)
+
+    _, removed = await image_service.sweep_report_dirs(db_session, grace_seconds=0, dry_run=True)
+    assert removed >= 1
+    assert orphan.exists()
+
+    await image_service.sweep_report_dirs(db_session, grace_seconds=0)
+    assert not orphan.exists()
+    assert kept.is_dir()
+
+
+# ── Serving ─────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_image_validators_and_conditional_get(client: AsyncClient):
+    data = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    url = data["students"][0]["image_url"]
+
+    resp = await client.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+    assert not etag.startswith("W/")
+    assert "immutable" in resp.headers["cache-control"]
+
+    cached = await client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_image_range_request(client: AsyncClient):
+    data = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    resp = await client.get(data["students"][0]["image_url"], headers={"Range": "bytes=0-7"})
+    assert resp.status_code == 206
+    assert resp.content == PNG[:8]
+    assert resp.headers["content-range"] == f"bytes 0-7/{len(PNG)}"
+
+
+@pytest.mark.asyncio
+async def test_blob_etag_is_content_hash(client: AsyncClient, content_addressed):
+    await client.post("/lesson-reports", json=_make_report_payload())
+    resp = await client.get(f"/images/blobs/{PNG_SHA256}.png")
+    assert resp.headers["etag"] == f'"{PNG_SHA256}"'
+
+
+@pytest.mark.asyncio
+async def test_image_sendfile_header(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_SENDFILE_HEADER", "X-Accel-Redirect")
+    data = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    url = data["students"][0]["image_url"]
+
+    resp = await client.get(url)
+    assert resp.status_code == 200
+    assert resp.content == b""
+    assert resp.headers["content-type"] == "image/png"
+    assert resp.headers["x-accel-redirect"] == "/protected-images/" + url.removeprefix("/images/")
+
+
+@pytest.mark.asyncio
+async def test_missing_image_is_404(client: AsyncClient):
+    resp = await client.get(f"/images/{'0' * 32}/{'a' * 32}.png")
+    assert resp.status_code == 404
+
+
+def test_write_blob_survives_concurrent_removal(monkeypatch, content_addressed):
+    dest = blob_path(f"{PNG_SHA256}.png")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(PNG)
+
+    def removed_by_gc(path, *args):
+        # GC unlinks the blob between the existence check and the mtime refresh
+        os.unlink(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr("app.utils.images.os.utime", removed_by_gc)
+    assert write_blob(".png", TINY_PNG_B64) == PNG_SHA256
+    assert dest.read_bytes() == PNG
+    assert not list(dest.parent.parent.parent.glob(".*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_collect_garbage_rechecks_mtime_before_unlink(
+    db_session: AsyncSession, monkeypatch, content_addressed
+):
+    monkeypatch.setattr(settings, "IMAGE_GC_GRACE_SECONDS", 30)
+    orphan = blob_path(f"{PNG_SHA256}.png")
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_bytes(PNG)
+    old = time.time() - 60
+    os.utime(orphan, (old, old))
+
+    lookup = image_service.referenced_blobs
+
+    async def reused_during_lookup(db, sha256s):
+        # A dedup upload refreshes the blob after the scan found it old
+        os.utime(orphan)
+        return await lookup(db, sha256s)
+
+    monkeypatch.setattr(image_service, "referenced_blobs", reused_during_lookup)
+    _, removed = await image_service.collect_garbage(db_session)
+    assert removed == 0
+    assert orphan.is_file()
+
+
+@pytest.mark.asyncio
+async def test_cleaner_keeps_recently_used_blobs(monkeypatch, content_addressed):
+    monkeypatch.setattr(settings, "IMAGE_GC_GRACE_SECONDS", 30)
+    blob = blob_path(f"{PNG_SHA256}.png")
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    blob.write_bytes(PNG)
+
+    assert await file_cleaner.remove(blobs=[blob]) == 0
+    assert blob.is_file()
@@ -0,0 +1,77 @@
+"""Tests for the write-behind ingestion queue and POST /lesson-reports/async."""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.schemas.lesson_report import LessonReportCreate
+from app.services.ingestion_queue import IngestionQueue, ingestion_queue
+from tests.test_lesson_reports import _make_report_payload
+
+
+@pytest_asyncio.fixture
+async def running_queue(session_factory):
+    await ingestion_queue.start(session_factory)
+    yield ingestion_queue
+    await ingestion_queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_and_persist(client: AsyncClient, running_queue):
+    resp = await client.post("/lesson-reports/async", json=_make_report_payload())
+    assert resp.status_code == 202
+    report_id = resp.json()["id"]
+    assert resp.json()["status"] == "queued"
+
+    await running_queue.join()
+
+    status = await client.get(f"/lesson-reports/{report_id}/status")
+    assert status.status_code == 200
+    assert status.json()["status"] == "persisted"
+
+    report = await client.get(f"/lesson-reports/{report_id}")
+    assert report.status_code == 200
+    assert report.json()["avg_attention"] == 70.0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_validates_payload(client: AsyncClient, running_queue):
+    resp = await client.post("/lesson-reports/async", json=_make_report_payload(students_count=99))
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_bad_image(client: AsyncClient, running_queue):
+    payload = _make_report_payload(unrecognized_students=[{"image": "not*base64", "attention": 60}])
+    resp = await client.post("/lesson-reports/async", json=payload)
+    assert resp.status_code == 422
+    error = resp.json()["detail"][0]
+    assert error["loc"] == ["body", "unrecognized_students", 0, "image"]
+    assert error["type"] == "invalid_base64"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_disabled(client: AsyncClient):
+    resp = await client.post("/lesson-reports/async", json=_make_report_payload())
+    assert resp.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_status_unknown_report(client: AsyncClient):
+    resp = await client.get(f"/lesson-reports/{uuid.uuid4()}/status")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_queue_backpressure(session_factory):
+    queue = IngestionQueue(maxsize=1, batch_size=10, flush_interval=0.01)
+    await queue.start(session_factory)
+    data = LessonReportCreate.model_validate(_make_report_payload())
+    # No await in between, so the worker cannot drain the single slot
+    queue.submit(data)
+    with pytest.raises(asyncio.QueueFull):
+        queue.submit(data)
+    await queue.stop()
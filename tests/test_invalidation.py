@@ -0,0 +1,51 @@
+"""Tests for the cache invalidation bus (local path; SQLite has no NOTIFY)."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.invalidation import InvalidationBus, _payloads
+
+
+@pytest.mark.asyncio
+async def test_publish_dispatches_after_commit_only(db_session: AsyncSession):
+    bus = InvalidationBus("test_channel")
+    seen: list[str] = []
+    bus.subscribe("report", seen.append)
+
+    await bus.publish(db_session, "report", "a", "b", "a")
+    assert seen == []
+    await db_session.commit()
+    assert seen == ["a", "b"]
+
+    await bus.publish(db_session, "report", "c")
+    await db_session.rollback()
+    await db_session.commit()
+    assert seen == ["a", "b"]
+
+
+def test_notify_payload_round_trip():
+    bus = InvalidationBus("test_channel")
+    seen: list[str] = []
+    bus.subscribe("class", seen.append)
+    bus.subscribe("report", lambda key: pytest.fail("wrong entity"))
+
+    keys = [str(i) for i in range(2000)]
+    payloads = list(_payloads("class", keys))
+    assert len(payloads) > 1
+    assert all(len(p) < 8000 for p in payloads)
+    for payload in payloads:
+        bus._on_notify(None, 1, "test_channel", payload)
+    assert seen == keys
+
+
+def test_flush_and_failing_handler():
+    bus = InvalidationBus("test_channel")
+    flushed: list[bool] = []
+    seen: list[str] = []
+    bus.subscribe("class", lambda key: 1 / 0, lambda: flushed.append(True))
+    bus.subscribe("class", seen.append)
+
+    bus._on_notify(None, 1, "test_channel", "class:7")
+    assert seen == ["7"]
+    bus._flush_all()
+    assert flushed == [True]
@@ -1,8 +1,17 @@
 """Tests for /lesson-reports and related endpoints."""
 
+import base64
+import json
+import uuid
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
+from app.core.config import settings
+from app.db.rows import LessonReportRow, LessonReportSummaryRow
+from app.schemas.lesson_report import LessonReportResponse
+from app.services import class_service, lesson_report_service, student_service
 from tests.conftest import TINY_PNG_B64
 
 
@@ -161,3 +170,531 @@ async def test_bad_ids_in_payload(client: AsyncClient):
     payload2 = _make_report_payload(school_id=123)
     resp2 = await client.post("/lesson-reports", json=payload2)
     assert resp2.status_code == 422
+
+
+# ── Batch ingestion ─────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_create_lesson_reports_batch(client: AsyncClient):
+    payloads = [
+        _make_report_payload(lesson_date="2026-02-14"),
+        _make_report_payload(lesson_date="2026-02-15"),
+    ]
+    resp = await client.post("/lesson-reports/batch", json=payloads)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 2
+    assert data["failed"] == 0
+    assert [r["status"] for r in data["results"]] == ["created", "created"]
+
+    report = await client.get(f"/lesson-reports/{data['results'][1]['id']}")
+    assert report.status_code == 200
+    assert report.json()["lesson_date"] == "2026-02-15"
+    assert report.json()["avg_attention"] == 70.0
+    assert len(report.json()["students"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_lesson_reports_batch_partial_failure(client: AsyncClient):
+    """An invalid item is reported back without failing the rest of the batch."""
+    payloads = [
+        _make_report_payload(),
+        _make_report_payload(students_count=99),
+        _make_report_payload(class_id=123),
+    ]
+    resp = await client.post("/lesson-reports/batch", json=payloads)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 1
+    assert data["failed"] == 2
+
+    ok, count_mismatch, bad_id = data["results"]
+    assert ok["status"] == "created" and ok["id"]
+    assert count_mismatch["status"] == "invalid"
+    assert count_mismatch["index"] == 1
+    assert count_mismatch["errors"]
+    assert bad_id["errors"][0]["loc"] == ["class_id"]
+
+    listing = await client.get("/lesson-reports")
+    assert listing.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_create_lesson_reports_batch_bad_image(client: AsyncClient, monkeypatch):
+    """A bad image fails only its own item, before any image is written."""
+    monkeypatch.setattr(settings, "MAX_IMAGE_SIZE_BYTES", 1024)
+    payloads = [
+        _make_report_payload(),
+        _make_report_payload(unrecognized_students=[{"image": "not*base64", "attention": 60}]),
+        _make_report_payload(
+            students=[
+                {"student_id": 11112222, "image": "A" * 2048, "attention": 80},
+            ]
+        ),
+    ]
+    resp = await client.post("/lesson-reports/batch", json=payloads)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 1
+    assert data["failed"] == 2
+
+    ok, bad_base64, too_large = data["results"]
+    assert ok["status"] == "created"
+    assert bad_base64["status"] == "invalid"
+    assert bad_base64["errors"][0]["loc"] == ["unrecognized_students", 0, "image"]
+    assert bad_base64["errors"][0]["type"] == "invalid_base64"
+    assert too_large["errors"][0]["loc"] == ["students", 0, "image"]
+    assert too_large["errors"][0]["type"] == "image_too_large"
+
+    listing = await client.get("/lesson-reports")
+    assert listing.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_create_lesson_reports_batch_empty(client: AsyncClient):
+    resp = await client.post("/lesson-reports/batch", json=[])
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_update_lesson_report_replaces_entries(client: AsyncClient):
+    create_resp = await client.post("/lesson-reports", json=_make_report_payload())
+    report_id = create_resp.json()["id"]
+
+    resp = await client.put(
+        f"/lesson-reports/{report_id}",
+        json={
+            "students_count": 2,
+            "students": [
+                {"student_id": 11112222, "attention": 90},
+                {"student_id": 11113333, "name": "Bob", "attention": 50},
+            ],
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert sorted(s["student_id"] for s in data["students"]) == [11112222, 11113333]
+    assert data["unrecognized_students"] == []
+    assert data["avg_attention"] == 70.0
+
+    # The new student was auto-created in the report's class
+    student = await client.get("/students/11113333")
+    assert student.status_code == 200
+    assert student.json()["class_id"] == 12345678
+
+
+@pytest.mark.asyncio
+async def test_auto_create_is_idempotent_across_reports(client: AsyncClient):
+    """Reports sharing school/class/students reuse the existing rows."""
+    await client.post("/lesson-reports", json=_make_report_payload())
+    resp = await client.post("/lesson-reports/batch", json=[_make_report_payload()] * 3)
+    assert resp.json()["created"] == 3
+
+    students = await client.get("/students", params={"class_id": 12345678})
+    assert [s["id"] for s in students.json()["items"]] == [11112222]
+    classes = await client.get("/classes", params={"school_id": 87654321})
+    assert classes.json()["total"] == 1
+
+
+# ── Idempotency ─────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_stored_report(client: AsyncClient):
+    headers = {"Idempotency-Key": "camera-7/2026-02-15T09:30"}
+    first = await client.post("/lesson-reports", json=_make_report_payload(), headers=headers)
+    assert first.status_code == 201
+
+    retry = await client.post("/lesson-reports", json=_make_report_payload(), headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+
+    listing = await client.get("/lesson-reports")
+    assert listing.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_generated_id_is_idempotent(client: AsyncClient):
+    report_id = "0b6f2f3c-54a1-4d8e-9a55-2d1e5b7c9f10"
+    payload = _make_report_payload(id=report_id)
+    first = await client.post("/lesson-reports", json=payload)
+    assert first.status_code == 201
+    assert first.json()["id"] == report_id
+
+    retry = await client.post("/lesson-reports", json=payload)
+    assert retry.status_code == 200
+    assert retry.json()["id"] == report_id
+
+    batch = await client.post("/lesson-reports/batch", json=[payload, _make_report_payload()])
+    assert [r["status"] for r in batch.json()["results"]] == ["duplicate", "created"]
+    assert batch.json()["created"] == 1
+    assert batch.json()["failed"] == 0
+
+
+# ── NDJSON streaming upload ─────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_stream_lesson_reports_ndjson(client: AsyncClient):
+    lines = [
+        json.dumps(_make_report_payload(lesson_date="2026-02-13")),
+        "",
+        json.dumps(_make_report_payload(students_count=99)),
+        "{not json",
+        json.dumps(_make_report_payload(lesson_date="2026-02-14")),
+        json.dumps(_make_report_payload(lesson_date="2026-02-15")),
+        json.dumps(
+            _make_report_payload(unrecognized_students=[{"image": "bad=data", "attention": 60}])
+        ),
+    ]
+    body = "\n".join(lines).encode()  # no trailing newline on the last line
+
+    async def chunks():
+        # Split mid-line to exercise incremental parsing
+        for i in range(0, len(body), 97):
+            yield body[i : i + 97]
+
+    resp = await client.post(
+        "/lesson-reports/stream",
+        params={"chunk_size": 2},
+        content=chunks(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    results = sorted(
+        (json.loads(line) for line in resp.text.splitlines()), key=lambda r: r["index"]
+    )
+    assert [(r["index"], r["status"]) for r in results] == [
+        (0, "created"),
+        (2, "invalid"),
+        (3, "invalid"),
+        (4, "created"),
+        (5, "created"),
+        (6, "invalid"),
+    ]
+    assert results[2]["errors"][0]["type"] == "json_invalid"
+    assert results[5]["errors"][0]["type"] == "invalid_base64"
+
+    listing = await client.get("/lesson-reports")
+    assert listing.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_lesson_reports_requires_ndjson(client: AsyncClient):
+    resp = await client.post("/lesson-reports/stream", json=[_make_report_payload()])
+    assert resp.status_code == 415
+
+
+# ── Image persistence ───────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_images_are_stored_and_served(client: AsyncClient):
+    resp = await client.post("/lesson-reports", json=_make_report_payload())
+    data = resp.json()
+    student_url = data["students"][0]["image_url"]
+    unrecognized_url = data["unrecognized_students"][0]["image_url"]
+    assert student_url.startswith(f"/images/{data['id']}/")
+    assert student_url.endswith(".png")
+    assert student_url != unrecognized_url
+
+    image = await client.get(student_url)
+    assert image.status_code == 200
+    assert image.content == base64.b64decode(TINY_PNG_B64)
+
+
+@pytest.mark.asyncio
+async def test_invalid_image_rolls_back_report(client: AsyncClient):
+    payload = _make_report_payload(
+        unrecognized_students=[{"image": "not base64!", "attention": 60}]
+    )
+    resp = await client.post("/lesson-reports", json=payload)
+    assert resp.status_code == 422
+
+    listing = await client.get("/lesson-reports")
+    assert listing.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_oversized_image_rejected(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_IMAGE_SIZE_BYTES", 16)
+    resp = await client.post("/lesson-reports", json=_make_report_payload())
+    assert resp.status_code == 413
+
+
+# ── Multipart upload ────────────────────────────────────────────────────────
+
+
+def _multipart_metadata(**overrides) -> str:
+    payload = _make_report_payload(**overrides)
+    payload["students"][0]["image"] = "alice"
+    payload["unrecognized_students"][0]["image"] = "unknown-1"
+    return json.dumps(payload)
+
+
+@pytest.mark.asyncio
+async def test_create_lesson_report_multipart(client: AsyncClient):
+    png = base64.b64decode(TINY_PNG_B64)
+    resp = await client.post(
+        "/lesson-reports/multipart",
+        data={"metadata": _multipart_metadata()},
+        files={
+            "alice": ("alice.png", png, "image/png"),
+            "unknown-1": ("u1.png", png, "image/png"),
+        },
+    )
+    assert resp.status_code == 201
+    data = resp.json()
+    assert data["avg_attention"] == 70.0
+    image_url = data["students"][0]["image_url"]
+    assert image_url.endswith(".png")
+
+    image = await client.get(image_url)
+    assert image.content == png
+    # Nothing is left behind in the staging area
+    assert not any((settings.IMAGES_DIR / ".incoming").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_multipart_unknown_image_part(client: AsyncClient):
+    png = base64.b64decode(TINY_PNG_B64)
+    resp = await client.post(
+        "/lesson-reports/multipart",
+        data={"metadata": _multipart_metadata()},
+        files={"alice": ("alice.png", png, "image/png")},
+    )
+    assert resp.status_code == 422
+    assert "unknown-1" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_multipart_image_size_limit(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_IMAGE_SIZE_BYTES", 16)
+    png = base64.b64decode(TINY_PNG_B64)
+    resp = await client.post(
+        "/lesson-reports/multipart",
+        data={"metadata": _multipart_metadata()},
+        files={
+            "alice": ("alice.png", png, "image/png"),
+            "unknown-1": ("u1.png", png, "image/png"),
+        },
+    )
+    assert resp.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_multipart_invalid_metadata(client: AsyncClient):
+    resp = await client.post(
+        "/lesson-reports/multipart",
+        data={"metadata": _multipart_metadata(students_count=99)},
+        files={"alice": ("alice.png", b"x", "image/png")},
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_lesson_reports_cursor_pagination(client: AsyncClient):
+    payloads = [_make_report_payload(lesson_time=f"0{h}:00:00") for h in range(1, 6)]
+    resp = await client.post("/lesson-reports/batch", json=payloads)
+    created_ids = {r["id"] for r in resp.json()["results"]}
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get("/lesson-reports", params=params)).json()
+        assert page["total"] is None
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(created_ids)
+    assert set(seen) == created_ids
+
+
+@pytest.mark.asyncio
+async def test_list_lesson_reports_invalid_cursor(client: AsyncClient):
+    resp = await client.get("/lesson-reports", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_latest_report_pointer_follows_writes(client: AsyncClient):
+    url = "/classes/12345678/lesson-reports/latest"
+    first = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    assert (await client.get(url)).json()["id"] == first["id"]
+
+    second = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    assert (await client.get(url)).json()["id"] == second["id"]
+
+    await client.delete(f"/lesson-reports/{second['id']}")
+    assert (await client.get(url)).json()["id"] == first["id"]
+
+    await client.delete(f"/lesson-reports/{first['id']}")
+    assert (await client.get(url)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_latest_report_pointer_follows_class_move(client: AsyncClient):
+    first = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    second = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+
+    # The old class falls back to its previous report; the new class gets a pointer
+    await client.post(
+        "/classes", json={"id": 22222222, "school_id": 87654321, "class_index": "9-A"}
+    )
+    resp = await client.put(f"/lesson-reports/{second['id']}", json={"class_id": 22222222})
+    assert resp.status_code == 200
+    old = await client.get("/classes/12345678/lesson-reports/latest")
+    new = await client.get("/classes/22222222/lesson-reports/latest")
+    assert old.json()["id"] == first["id"]
+    assert new.json()["id"] == second["id"]
+
+
+@pytest.mark.asyncio
+async def test_latest_report_cached_with_etag(client: AsyncClient, monkeypatch):
+    url = "/classes/12345678/lesson-reports/latest"
+    await client.post("/lesson-reports", json=_make_report_payload())
+    resp = await client.get(url)
+    etag = resp.headers["etag"]
+
+    async def _no_db(*args, **kwargs):
+        raise AssertionError("cache hit should not touch the database")
+
+    with monkeypatch.context() as m:
+        m.setattr(lesson_report_service, "get_latest_report_for_class", _no_db)
+        cached = await client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    # A new report invalidates the cached response
+    await client.post("/lesson-reports", json=_make_report_payload())
+    fresh = await client.get(url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_report_json_matches_schema(client: AsyncClient):
+    created = await client.post("/lesson-reports", json=_make_report_payload())
+    assert created.status_code == 201
+    resp = await client.get(f"/lesson-reports/{created.json()['id']}")
+    # The hand-built body must be exactly what the schema would have produced
+    model = LessonReportResponse.model_validate_json(resp.content)
+    assert model.model_dump_json().encode() == resp.content
+    assert resp.content == created.content
+
+
+
+@pytest.mark.asyncio
+async def test_read_paths_skip_the_orm(client: AsyncClient, db_session):
+    created = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    db_session.expunge_all()
+
+    report = await lesson_report_service.get_lesson_report(db_session, uuid.UUID(created["id"]))
+    assert isinstance(report, LessonReportRow)
+    assert [e.student_id for e in report.attention_entries] == [11112222]
+    assert len(report.unrecognized_entries) == 1
+    reports, _, _ = await lesson_report_service.get_lesson_reports(db_session)
+    assert [type(r) for r in reports] == [LessonReportSummaryRow]
+    assert (await student_service.get_students(db_session))[1] == 1
+    assert (await class_service.get_classes(db_session))[1] == 1
+    # Nothing was loaded into the identity map
+    assert len(db_session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test_sparse_report_fields(client: AsyncClient, db_session):
+    created = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = await client.get(
+            f"/lesson-reports/{created['id']}",
+            params={"fields": "avg_attention,lesson_time,class_index", "include": ""},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "id": created["id"],
+        "class_index": "8-E",
+        "lesson_time": "09:30:00",
+        "avg_attention": created["avg_attention"],
+    }
+    # Only the requested columns, and no entry queries
+    assert len(statements) == 1
+    assert "students_count" not in statements[0]
+    assert resp.headers["ETag"]
+
+    students_only = await client.get(
+        "/classes/12345678/lesson-reports/latest", params={"include": "students"}
+    )
+    body = students_only.json()
+    assert body["students"] == created["students"]
+    assert "unrecognized_students" not in body
+    assert body["students_count"] == 2
+
+    full = await client.get(
+        f"/lesson-reports/{created['id']}",
+        params={"include": "unrecognized,students"},
+    )
+    assert full.json() == created
+
+
+@pytest.mark.asyncio
+async def test_sparse_report_unknown_field(client: AsyncClient):
+    created = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    resp = await client.get(f"/lesson-reports/{created['id']}", params={"fields": "secret"})
+    assert resp.status_code == 400
+    resp = await client.get(f"/lesson-reports/{created['id']}", params={"include": "everything"})
+    assert resp.status_code == 400
+    missing = await client.get(f"/lesson-reports/{uuid.uuid4()}", params={"include": ""})
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_many_lesson_reports(client: AsyncClient, db_session):
+    first = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+    payload = _make_report_payload(unrecognized_students=[], students_count=1)
+    second = (await client.post("/lesson-reports", json=payload)).json()
+    unknown = str(uuid.uuid4())
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = await client.post(
+            "/lesson-reports/get-many", json=[second["id"], unknown, first["id"], second["id"]]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert list(body["items"]) == [second["id"], first["id"]]
+    assert body["items"][first["id"]] == first
+    assert body["items"][second["id"]] == second
+    assert body["missing"] == [unknown]
+    # Reports, attention entries, unrecognized entries
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_many_validation(client: AsyncClient):
+    assert (await client.post("/lesson-reports/get-many", json=[])).status_code == 422
+    assert (await client.post("/lesson-reports/get-many", json=["nope"])).status_code == 422
+    resp = await client.post("/lesson-reports/get-many", json=[str(uuid.uuid4())])
+    assert resp.json()["items"] == {}
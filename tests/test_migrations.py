@@ -0,0 +1,96 @@
+"""Keep the migration chain and the ORM models in agreement about indexes.
+
+Alembic autogenerate drops any index that exists in the database but is not
+declared on the models (0ef6efaf1d4a did exactly that). These tests replay
+every migration's ``upgrade()`` against a recording stand-in for ``op`` and
+compare the resulting indexes with ``Base.metadata``.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from app.db.base import Base
+
+VERSIONS_DIR = Path(__file__).resolve().parents[1] / "migrations" / "versions"
+
+
+class _RecordingOp:
+    """Tracks ``{index_name: (table, columns, unique)}`` through migrations."""
+
+    def __init__(self) -> None:
+        self.indexes: dict[str, tuple[str, tuple[str, ...], bool]] = {}
+
+    def create_table(self, table_name, *elements, **kw) -> None:
+        for element in elements:
+            if isinstance(element, sa.Column) and element.index:
+                name = f"ix_{table_name}_{element.name}"
+                self.indexes[name] = (table_name, (element.name,), bool(element.unique))
+
+    def drop_table(self, table_name, **kw) -> None:
+        self.indexes = {k: v for k, v in self.indexes.items() if v[0] != table_name}
+
+    def create_index(self, index_name, table_name, columns, unique=False, **kw) -> None:
+        self.indexes[index_name] = (table_name, tuple(columns), bool(unique))
+
+    def drop_index(self, index_name, table_name=None, **kw) -> None:
+        assert index_name in self.indexes, f"drop of unknown index {index_name}"
+        del self.indexes[index_name]
+
+    def __getattr__(self, name):
+        # Column/constraint operations do not affect indexes
+        return lambda *args, **kwargs: None
+
+
+def _load_migrations() -> list:
+    modules = {}
+    for path in VERSIONS_DIR.glob("*.py"):
+        spec = importlib.util.spec_from_file_location(f"_migration_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules[module.revision] = module
+
+    # Walk the chain from the root so migrations run in revision order
+    children = {m.down_revision: m for m in modules.values()}
+    assert len(children) == len(modules), "migration history has branches"
+    ordered, current = [], children.get(None)
+    while current is not None:
+        ordered.append(current)
+        current = children.get(current.revision)
+    assert len(ordered) == len(modules), "migration history is not one chain"
+    return ordered
+
+
+def _migrated_indexes() -> dict[str, tuple[str, tuple[str, ...], bool]]:
+    recorder = _RecordingOp()
+    for module in _load_migrations():
+        module.op = recorder
+        module.upgrade()
+    return recorder.indexes
+
+
+def _model_indexes() -> dict[str, tuple[str, tuple[str, ...], bool]]:
+    return {
+        index.name: (table.name, tuple(c.name for c in index.columns), bool(index.unique))
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+
+
+def test_models_declare_every_migrated_index():
+    migrated, declared = _migrated_indexes(), _model_indexes()
+    missing = {name: migrated[name] for name in migrated.keys() - declared.keys()}
+    assert not missing, f"autogenerate would drop these indexes: {missing}"
+
+
+def test_migrations_create_every_declared_index():
+    migrated, declared = _migrated_indexes(), _model_indexes()
+    missing = {name: declared[name] for name in declared.keys() - migrated.keys()}
+    assert not missing, f"no migration creates these indexes: {missing}"
+    mismatched = {
+        name: (migrated[name], declared[name])
+        for name in declared
+        if migrated.get(name, declared[name]) != declared[name]
+    }
+    assert not mismatched, f"index definitions differ: {mismatched}"
@@ -0,0 +1,122 @@
+"""Tests for the daily attention rollups and their endpoints."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.class_daily_attention import ClassDailyAttention
+from app.models.school_daily_attention import SchoolDailyAttention
+from app.services import rollup_service
+from tests.test_lesson_reports import _make_report_payload
+
+
+async def _snapshot(db: AsyncSession) -> tuple[list, list]:
+    def rows(model):
+        table = model.__table__
+        return (
+            select(*table.c)
+            .where(table.c.reports_count > 0)
+            .order_by(*table.primary_key.columns)
+        )
+
+    classes = (await db.execute(rows(ClassDailyAttention))).all()
+    schools = (await db.execute(rows(SchoolDailyAttention))).all()
+    return classes, schools
+
+
+@pytest.mark.asyncio
+async def test_class_daily_attention(client: AsyncClient):
+    # Entries 80 and 60 on the first report, 40 and 20 on the second
+    await client.post("/lesson-reports", json=_make_report_payload())
+    second = _make_report_payload()
+    second["students"][0]["attention"] = 40
+    second["unrecognized_students"][0]["attention"] = 20
+    await client.post("/lesson-reports", json=second)
+
+    resp = await client.get("/classes/12345678/attention/daily")
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {
+            "day": "2026-02-15",
+            "reports_count": 2,
+            "entries_count": 4,
+            "avg_attention": 50.0,
+            "stddev_attention": 22.36,
+        }
+    ]
+
+    school = (await client.get("/schools/87654321/attention/daily")).json()
+    assert school[0]["entries_count"] == 4
+
+    outside = await client.get(
+        "/classes/12345678/attention/daily", params={"date_from": "2026-03-01"}
+    )
+    assert outside.json() == []
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_update_and_delete(client: AsyncClient):
+    report = (await client.post("/lesson-reports", json=_make_report_payload())).json()
+
+    resp = await client.put(
+        f"/lesson-reports/{report['id']}",
+        json={
+            "lesson_date": "2026-02-16",
+            "students": [{"student_id": 11112222, "image": None, "attention": 90}],
+        },
+    )
+    assert resp.status_code == 200
+    days = (await client.get("/classes/12345678/attention/daily")).json()
+    assert [(d["day"], d["entries_count"], d["avg_attention"]) for d in days] == [
+        ("2026-02-16", 1, 90.0)
+    ]
+
+    await client.delete(f"/lesson-reports/{report['id']}")
+    assert (await client.get("/schools/87654321/attention/daily")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_cascading_deletes(client: AsyncClient, db_session: AsyncSession):
+    await client.post("/lesson-reports", json=_make_report_payload())
+    await client.post(
+        "/lesson-reports", json=_make_report_payload(class_id=22222222, class_index="9-A")
+    )
+
+    # The student's entry goes; the report and the unrecognized entry stay
+    assert (await client.delete("/students/11112222")).status_code == 200
+    days = (await client.get("/classes/12345678/attention/daily")).json()
+    assert [(d["reports_count"], d["entries_count"], d["avg_attention"]) for d in days] == [
+        (1, 1, 60.0)
+    ]
+
+    # The class's totals leave the school's rollup too
+    assert (await client.delete("/classes/12345678")).status_code == 200
+    school = (await client.get("/schools/87654321/attention/daily")).json()
+    assert [(d["reports_count"], d["entries_count"]) for d in school] == [(1, 1)]
+
+    incremental = await _snapshot(db_session)
+    await rollup_service.rebuild_rollups(db_session)
+    await db_session.commit()
+    assert await _snapshot(db_session) == incremental
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental(client: AsyncClient, db_session: AsyncSession):
+    payloads = [
+        _make_report_payload(),
+        _make_report_payload(lesson_date="2026-02-16"),
+        _make_report_payload(lesson_date="2026-02-16", unrecognized_students=[], students_count=1),
+    ]
+    await client.post("/lesson-reports/batch", json=payloads)
+    incremental = await _snapshot(db_session)
+
+    await rollup_service.rebuild_rollups(db_session)
+    await db_session.commit()
+    assert await _snapshot(db_session) == incremental
+
+
+@pytest.mark.asyncio
+async def test_daily_attention_unknown_class(client: AsyncClient):
+    resp = await client.get("/classes/99999999/attention/daily")
+    assert resp.status_code == 404
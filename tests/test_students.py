@@ -0,0 +1,128 @@
+"""Tests for /students endpoints and the /classes listing."""
+
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from tests.test_lesson_reports import _make_report_payload
+
+
+def _student_report(lesson_date: str, attention: int) -> dict:
+    payload = _make_report_payload(lesson_date=lesson_date)
+    payload["students"][0]["attention"] = attention
+    return payload
+
+
+@pytest.mark.asyncio
+async def test_student_attention_series(client: AsyncClient):
+    # 2026-02-16 is a Monday; 2026-02-22 (Sunday) is in the same week
+    for lesson_date, attention in [
+        ("2026-02-16", 80),
+        ("2026-02-16", 60),
+        ("2026-02-22", 40),
+        ("2026-03-02", 90),
+    ]:
+        await client.post("/lesson-reports", json=_student_report(lesson_date, attention))
+
+    daily = (await client.get("/students/11112222/attention")).json()
+    assert daily["timestamps"] == ["2026-02-16", "2026-02-22", "2026-03-02"]
+    assert daily["mean"] == [70.0, 40.0, 90.0]
+    assert daily["min"] == [60, 40, 90]
+    assert daily["max"] == [80, 40, 90]
+    assert daily["n"] == [2, 1, 1]
+
+    weekly = (await client.get("/students/11112222/attention", params={"bucket": "week"})).json()
+    assert weekly["timestamps"] == ["2026-02-16", "2026-03-02"]
+    assert weekly["n"] == [3, 1]
+
+    monthly = (
+        await client.get(
+            "/students/11112222/attention",
+            params={"bucket": "month", "date_from": "2026-02-20"},
+        )
+    ).json()
+    assert monthly["timestamps"] == ["2026-02-01", "2026-03-01"]
+    assert monthly["n"] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_student_attention_unknown_student(client: AsyncClient):
+    resp = await client.get("/students/99999999/attention")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_student_attention_bad_bucket(client: AsyncClient):
+    await client.post("/lesson-reports", json=_make_report_payload())
+    resp = await client.get("/students/11112222/attention", params={"bucket": "year"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_students_paginated(client: AsyncClient):
+    for student_id in (11110001, 11110002, 11110003):
+        await client.post(
+            "/students", json={"id": student_id, "class_id": 12345678, "full_name": "S"}
+        )
+    await client.post("/lesson-reports", json=_student_report("2026-02-16", 70))
+
+    seen, cursor = [], None
+    while True:
+        # offset is ignored once a cursor is given, and reported as 0
+        params = {"limit": 2, **({"cursor": cursor, "offset": 5} if cursor else {})}
+        page = (await client.get("/students", params=params)).json()
+        assert page["total"] == 4
+        assert page["offset"] == 0
+        seen += [s["id"] for s in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == [11110001, 11110002, 11110003, 11112222]
+
+    by_school = (await client.get("/students", params={"school_id": 87654321})).json()
+    assert by_school["total"] == 4
+    other = (await client.get("/students", params={"school_id": 11111111})).json()
+    assert other["items"] == []
+
+    stats = (
+        await client.get("/students", params={"with_stats": True, "class_id": 12345678})
+    ).json()
+    by_id = {s["id"]: s for s in stats["items"]}
+    assert by_id[11112222]["reports_count"] == 1
+    assert by_id[11112222]["latest_attention"] == 70
+    assert by_id[11110001]["reports_count"] == 0
+    assert by_id[11110001]["latest_attention"] is None
+
+    plain = (await client.get("/students")).json()
+    assert plain["items"][0]["reports_count"] is None
+
+
+@pytest.mark.asyncio
+async def test_stream_students(client: AsyncClient):
+    await client.post("/lesson-reports", json=_student_report("2026-02-16", 70))
+    resp = await client.get("/students", params={"stream": True, "with_stats": True})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [(s["id"], s["reports_count"], s["latest_attention"]) for s in lines] == [
+        (11112222, 1, 70)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_classes_with_stats(client: AsyncClient):
+    await client.post("/lesson-reports", json=_student_report("2026-02-16", 70))
+    await client.post("/lesson-reports", json=_student_report("2026-02-17", 50))
+
+    page = (await client.get("/classes", params={"with_stats": True})).json()
+    assert page["total"] == 1
+    [item] = page["items"]
+    assert (item["students_count"], item["reports_count"]) == (1, 2)
+    # avg_attention of the latest report: entries 50 and 60
+    assert item["latest_attention"] == 55.0
+
+    lines = (await client.get("/classes", params={"stream": True})).text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [12345678]
+
+    bad = await client.get("/classes", params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400